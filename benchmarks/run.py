@@ -0,0 +1,277 @@
+"""Benchmarks the validator mixins and writes the results as JSON.
+
+    python benchmarks/run.py
+    python benchmarks/run.py --output results.json --compare benchmarks/baseline.json
+    python benchmarks/run.py --save-baseline benchmarks/baseline.json
+
+With --compare, exits with status 1 if any benchmark is slower than
+the baseline by more than --threshold (default 1.5x). Baselines are
+machine dependent; save one on the machine used for release checks.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'edc_form_validators.settings')
+
+import django  # noqa
+
+django.setup()
+
+from datetime import date  # noqa
+from django import forms  # noqa
+from django.db import connection, models  # noqa
+from edc_constants.constants import YES, NO, OTHER, NOT_APPLICABLE  # noqa
+
+from edc_form_validators import FormValidator, FormValidatorMixin  # noqa
+from edc_form_validators.result_cache import ResultCache  # noqa
+from edc_form_validators.rules import RequiredIf, ApplicableIf, OtherSpecify  # noqa
+from edc_form_validators.simple_mixins import SimpleYesNoValidationMixin  # noqa
+from edc_form_validators.simple_mixins import SimpleDateFieldValidatorMixin  # noqa
+from edc_form_validators.simple_mixins import SimpleApplicableByAgeValidatorMixin  # noqa
+from edc_form_validators.tests.models import TestListModel  # noqa
+
+WIDTHS = (50, 200, 500)
+BATCH_SIZES = (1000, 10000)
+
+benchmarks = {}
+
+
+def benchmark(name, number=1000):
+    """Registers a function that returns the callable to time.
+    """
+    def register(func):
+        benchmarks[name] = (func, number)
+        return func
+    return register
+
+
+@benchmark('required_if')
+def required_if():
+    form_validator = FormValidator(cleaned_data=dict(f1=YES, f2='blah'))
+    return lambda: form_validator.required_if(YES, field='f1', field_required='f2')
+
+
+@benchmark('not_required_if')
+def not_required_if():
+    form_validator = FormValidator(cleaned_data=dict(f1=NO, f2='blah'))
+    return lambda: form_validator.not_required_if(YES, field='f1', field_required='f2')
+
+
+@benchmark('required_if_collected_error')
+def required_if_collected_error():
+    def run():
+        form_validator = FormValidator(cleaned_data=dict(f1=YES), collect_errors=True)
+        form_validator.required_if(YES, field='f1', field_required='f2')
+    return run
+
+
+@benchmark('applicable')
+def applicable():
+    form_validator = FormValidator(cleaned_data=dict(f1=YES, f2='blah'))
+    return lambda: form_validator.applicable(YES, field='f1', field_applicable='f2')
+
+
+@benchmark('validate_other_specify')
+def validate_other_specify():
+    form_validator = FormValidator(cleaned_data=dict(f1=OTHER, f1_other='blah'))
+    return lambda: form_validator.validate_other_specify(field='f1')
+
+
+@benchmark('m2m_rules', number=200)
+def m2m_rules():
+    qs = TestListModel.objects.filter(short_name__in=['one', OTHER])
+
+    def run():
+        form_validator = FormValidator(
+            cleaned_data=dict(f1=YES, m2m=qs.all(), m2m_other='blah'))
+        form_validator.m2m_required_if(YES, field='f1', m2m_field='m2m')
+        form_validator.m2m_single_selection_if('none', m2m_field='m2m')
+        form_validator.m2m_other_specify(OTHER, m2m_field='m2m', field_other='m2m_other')
+    return run
+
+
+@benchmark('simple_mixins')
+def simple_mixins():
+
+    class SimpleValidator(SimpleYesNoValidationMixin, SimpleDateFieldValidatorMixin,
+                          SimpleApplicableByAgeValidatorMixin, FormValidator):
+        pass
+
+    form_validator = SimpleValidator(cleaned_data=dict(
+        f1=YES, f2='blah', d1=date(2020, 1, 2), d2=date(2020, 1, 1), f3='blah'))
+
+    def run():
+        form_validator.require_if_yes('f1', 'f2')
+        form_validator.validate_dates(field1='d1', op='gt', field2='d2')
+        form_validator.validate_applicable_by_age(
+            'f3', 'gte', 18, date(1990, 1, 1), date(2020, 1, 1), '123')
+    return run
+
+
+def wide_form_validator_cls(width):
+    rules = []
+    for i in range(0, width - 1, 2):
+        rules.append(RequiredIf(YES, field=f'f{i}', field_required=f'f{i + 1}'))
+        rules.append(ApplicableIf(YES, field=f'f{i}', field_applicable=f'f{i + 1}'))
+    rules.append(OtherSpecify(field='f0'))
+    return type(f'Wide{width}FormValidator', (FormValidator, ), dict(rules=rules))
+
+
+def wide_rows(width, count):
+    random.seed(width)
+    for _ in range(count):
+        row = {}
+        for i in range(0, width - 1, 2):
+            row[f'f{i}'] = random.choice([YES, NO])
+            row[f'f{i + 1}'] = 'blah' if row[f'f{i}'] == YES else NOT_APPLICABLE
+        yield row
+
+
+def wide_model_form_cls(width):
+    attrs = {f'f{i}': models.CharField(max_length=10, null=True, blank=True)
+             for i in range(width)}
+    attrs.update(
+        __module__='edc_form_validators.tests.models',
+        Meta=type('Meta', (), dict(app_label='edc_form_validators')))
+    model = type(f'Wide{width}Model', (models.Model, ), attrs)
+    meta = type('Meta', (), dict(model=model, fields='__all__'))
+    return type(f'Wide{width}ModelForm', (FormValidatorMixin, forms.ModelForm), dict(
+        form_validator_cls=wide_form_validator_cls(width), Meta=meta))
+
+
+for width in WIDTHS:
+
+    def validate(width=width):
+        form_validator_cls = wide_form_validator_cls(width)
+        row = next(wide_rows(width, 1))
+        return lambda: form_validator_cls(cleaned_data=row).validate()
+
+    def model_form_clean(width=width):
+        form_cls = wide_model_form_cls(width)
+        data = next(wide_rows(width, 1))
+        return lambda: form_cls(data=data).is_valid()
+
+    def validate_cached(width=width):
+        form_validator_cls = type(
+            f'Cached{width}FormValidator', (wide_form_validator_cls(width), ),
+            dict(result_cache=ResultCache()))
+        row = next(wide_rows(width, 1))
+        return lambda: form_validator_cls(cleaned_data=row).validate()
+
+    benchmark(f'validate_{width}_fields', number=200)(validate)
+    benchmark(f'validate_{width}_fields_cached', number=200)(validate_cached)
+    benchmark(f'model_form_clean_{width}_fields', number=20)(model_form_clean)
+
+for size in BATCH_SIZES:
+
+    def validate_many(size=size):
+        form_validator_cls = wide_form_validator_cls(50)
+        rows = list(wide_rows(50, size))
+        return lambda: [r for r in form_validator_cls.validate_many(rows) if not r.is_valid]
+
+    def check_batch(size=size):
+        form_validator_cls = wide_form_validator_cls(50)
+        rows = list(wide_rows(50, size))
+        return lambda: form_validator_cls.check_batch(rows)
+
+    benchmark(f'validate_many_{size}_rows', number=1)(validate_many)
+    benchmark(f'check_batch_{size}_rows', number=1)(check_batch)
+
+
+IMPORTS = {
+    'import_package': 'import edc_form_validators',
+    'import_rules': 'import edc_form_validators.rules',
+    'import_form_validator': 'from edc_form_validators import FormValidator',
+    'import_all': 'from edc_form_validators import *',
+}
+
+for name, statement in IMPORTS.items():
+
+    def import_time(statement=statement):
+        """Times a new interpreter running the import, so includes
+        interpreter startup.
+        """
+        args = [sys.executable, '-c', statement]
+        env = dict(DJANGO_SETTINGS_MODULE='edc_form_validators.settings')
+        return lambda: subprocess.run(args, cwd=ROOT, env=env, check=True)
+
+    benchmark(name, number=5)(import_time)
+
+
+def run(names=None, repeat=5):
+    """Returns a dictionary of {name: seconds per call}, the best
+    of `repeat` runs.
+    """
+    results = {}
+    for name, (func, number) in benchmarks.items():
+        if names and name not in names:
+            continue
+        timer = timeit.Timer(func())
+        results[name] = min(timer.repeat(repeat=repeat, number=number)) / number
+        print(f'{name:<35} {results[name] * 1e6:>12.2f} us', file=sys.stderr)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Returns a list of (name, ratio) for benchmarks slower than
+    baseline by more than threshold.
+    """
+    regressions = []
+    for name, seconds in results.items():
+        try:
+            ratio = seconds / baseline['results'][name]
+        except KeyError:
+            continue
+        print(f'{name:<35} {ratio:>6.2f}x baseline', file=sys.stderr)
+        if ratio > threshold:
+            regressions.append((name, ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark edc_form_validators.')
+    parser.add_argument('names', nargs='*', help='Benchmarks to run. Default: all')
+    parser.add_argument('--output', help='Write results as JSON to this path')
+    parser.add_argument('--compare', help='Path to a baseline JSON file')
+    parser.add_argument('--threshold', type=float, default=1.5)
+    parser.add_argument('--save-baseline', help='Write results as the baseline to this path')
+    parser.add_argument('--repeat', type=int, default=5)
+    options = parser.parse_args(argv)
+
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        for short_name in ['one', 'two', 'none', OTHER]:
+            TestListModel.objects.create(short_name=short_name, name=short_name.title())
+        results = run(names=options.names, repeat=options.repeat)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    report = dict(
+        python=platform.python_version(),
+        django=django.get_version(),
+        machine=platform.machine(),
+        results=results)
+    for path in [options.output, options.save_baseline]:
+        if path:
+            with open(path, 'w') as f:
+                json.dump(report, f, indent=2, sort_keys=True)
+    if options.compare:
+        with open(options.compare) as f:
+            regressions = compare(results, json.load(f), options.threshold)
+        if regressions:
+            for name, ratio in regressions:
+                print(f'Regression: {name} is {ratio:.2f}x baseline', file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""Compares the rule methods against the previous implementation,
+which called cleaned_data.get() for every comparison, on wide forms.
+
+    python benchmarks/wide_forms.py
+"""
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'edc_form_validators.settings')
+
+import django  # noqa
+
+django.setup()
+
+from edc_constants.constants import YES, NO, DWTA, NOT_APPLICABLE  # noqa
+from edc_form_validators import FormValidator  # noqa
+from edc_form_validators.base_form_validator import REQUIRED_ERROR, NOT_REQUIRED_ERROR  # noqa
+from edc_form_validators.base_form_validator import APPLICABLE_ERROR, NOT_APPLICABLE_ERROR  # noqa
+
+
+class LegacyFormValidator(FormValidator):
+    """Rule bodies as they were before values were read once per rule.
+    """
+
+    def _required_if(self, responses, field=None, field_required=None,
+                     required_message=None, not_required_message=None,
+                     optional_if_dwta=None, optional_if_na=None, inverse=None):
+        if field in self.cleaned_data:
+            if (DWTA in responses and optional_if_dwta
+                    and self.cleaned_data.get(field) == DWTA):
+                pass
+            elif (NOT_APPLICABLE in responses and optional_if_na
+                    and self.cleaned_data.get(field) == NOT_APPLICABLE):
+                pass
+            elif (self.cleaned_data.get(field) in responses
+                    and (not self.cleaned_data.get(field_required)
+                         or self.cleaned_data.get(field_required) == NOT_APPLICABLE)):
+                return self.raise_validation_error(required_message, REQUIRED_ERROR)
+            elif inverse and (self.cleaned_data.get(field) not in responses
+                              and (self.cleaned_data.get(field_required)
+                                   and self.cleaned_data.get(field_required) != NOT_APPLICABLE)):
+                return self.raise_validation_error(not_required_message, NOT_REQUIRED_ERROR)
+        return False
+
+    def applicable(self, *responses, field=None, field_applicable=None):
+        cleaned_data = self.cleaned_data
+        if field in cleaned_data and field_applicable in cleaned_data:
+            if (cleaned_data.get(field) in responses
+                    and cleaned_data.get(field_applicable) == NOT_APPLICABLE):
+                message = {field_applicable: 'This field is applicable'}
+                return self.raise_validation_error(message, APPLICABLE_ERROR)
+            elif (cleaned_data.get(field) not in responses
+                    and cleaned_data.get(field_applicable) != NOT_APPLICABLE):
+                message = {field_applicable: 'This field is not applicable'}
+                return self.raise_validation_error(message, NOT_APPLICABLE_ERROR)
+        return False
+
+
+def get_rules(width):
+    rules = []
+    for i in range(0, width - 1, 2):
+        field, field_required = f'f{i}', f'f{i + 1}'
+        rules.append((field, field_required, {field_required: 'required'},
+                      {field_required: 'not required'}))
+    return rules
+
+
+def clean(form_validator, rules):
+    for field, field_required, required_message, not_required_message in rules:
+        form_validator._required_if(
+            (YES,), field=field, field_required=field_required,
+            required_message=required_message,
+            not_required_message=not_required_message,
+            optional_if_dwta=True, inverse=True)
+        form_validator.applicable(YES, field=field, field_applicable=field_required)
+
+
+def main(widths=(50, 200, 500), number=500):
+    random.seed(0)
+    print(f'{"fields":>8} {"legacy (ms)":>12} {"current (ms)":>13} {"speedup":>8}')
+    for width in widths:
+        # a valid submission; every rule is evaluated and passes
+        cleaned_data = {}
+        for i in range(0, width - 1, 2):
+            cleaned_data[f'f{i}'] = random.choice([YES, NO])
+            cleaned_data[f'f{i + 1}'] = 'blah' if cleaned_data[f'f{i}'] == YES else NOT_APPLICABLE
+        rules = get_rules(width)
+        timings = []
+        for form_validator_cls in [LegacyFormValidator, FormValidator]:
+            timings.append(min(timeit.repeat(
+                lambda: clean(form_validator_cls(
+                    cleaned_data=cleaned_data, collect_errors=True), rules),
+                number=number, repeat=7)) / number * 1000)
+        print(f'{width:>8} {timings[0]:>12.3f} {timings[1]:>13.3f} '
+              f'{timings[0] / timings[1]:>7.2f}x')
+
+
+if __name__ == '__main__':
+    main()
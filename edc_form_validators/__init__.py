@@ -1,9 +1,42 @@
-from .applicable_field_validator import ApplicableFieldValidator
-from .base_form_validator import APPLICABLE_ERROR, NOT_APPLICABLE_ERROR, REQUIRED_ERROR
-from .base_form_validator import ModelFormFieldValidatorError, InvalidModelFormFieldValidator
-from .base_form_validator import NOT_REQUIRED_ERROR, INVALID_ERROR
-from .form_validator import FormValidator
-from .form_validator_mixin import FormValidatorMixin
-from .many_to_many_field_validator import ManyToManyFieldValidator
-from .other_specify_field_validator import OtherSpecifyFieldValidator
-from .required_field_validator import RequiredFieldValidator
+from importlib import import_module
+
+# the public API is imported on first access so that, for example,
+# `from edc_form_validators.rules import RequiredIf` does not import
+# django.forms.
+_modules = {
+    '.applicable_field_validator': ['ApplicableFieldValidator'],
+    '.base_form_validator': ['BaseFormValidator'],
+    '.context': ['ValidationContext', 'validation_context', 'register_fact'],
+    '.core': [
+        'APPLICABLE_ERROR', 'NOT_APPLICABLE_ERROR', 'REQUIRED_ERROR',
+        'NOT_REQUIRED_ERROR', 'INVALID_ERROR', 'ModelFormFieldValidatorError',
+        'InvalidModelFormFieldValidator', 'ValidationResult', 'Violation',
+        'CoreValidator', 'RuleError', 'BatchErrors', 'ErrorRecord'],
+    '.form_validator': ['FormValidator'],
+    '.form_validator_mixin': ['FormValidatorMixin'],
+    '.many_to_many_field_validator': ['ManyToManyFieldValidator'],
+    '.other_specify_field_validator': ['OtherSpecifyFieldValidator'],
+    '.required_field_validator': ['RequiredFieldValidator'],
+    '.rules': [
+        'Rule', 'RequiredIf', 'NotRequiredIf', 'RequiredIfNotNone', 'RequireTogether',
+        'ApplicableIf', 'NotApplicableIf', 'NotApplicableOnlyIf', 'OtherSpecify',
+        'M2MRequired', 'M2MRequiredIf', 'M2MSingleSelectionIf',
+        'M2MOtherSpecify', 'M2MOtherSpecifyApplicable', 'Gate'],
+}
+_names = {name: module for module, names in _modules.items() for name in names}
+
+__all__ = list(_names)
+
+
+def __getattr__(name):
+    try:
+        module = _names[name]
+    except KeyError:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
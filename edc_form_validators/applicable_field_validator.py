@@ -1,32 +1,32 @@
-from django.forms import ValidationError
 from edc_constants.constants import NOT_APPLICABLE
 
-from .base_form_validator import BaseFormValidator
-from .base_form_validator import APPLICABLE_ERROR, NOT_APPLICABLE_ERROR
+from .core import CoreValidator, rule_method
+from .core import APPLICABLE_ERROR, NOT_APPLICABLE_ERROR
+from .messages import APPLICABLE_MSG, NOT_APPLICABLE_MSG, NOT_REQUIRED_MSG
 
 
-class ApplicableFieldValidator(BaseFormValidator):
+class ApplicableFieldValidator(CoreValidator):
 
+    @rule_method
     def applicable_if(self, *responses, field=None, field_applicable=None):
         return self.applicable(
             *responses, field=field, field_applicable=field_applicable)
 
+    @rule_method
     def not_applicable_if(self, *responses, field=None, field_applicable=None):
         return self.not_applicable(
             *responses, field=field, field_applicable=field_applicable)
 
+    @rule_method
     def not_applicable_only_if(self, *responses, field=None, field_applicable=None, cleaned_data=None):
 
         cleaned_data = self.cleaned_data
-        if (cleaned_data.get(field) in responses
-            and ((cleaned_data.get(field_applicable)
-                  and cleaned_data.get(field_applicable) is not None))):
+        if cleaned_data.get(field) in responses and cleaned_data.get(field_applicable):
             message = {
-                field_applicable: 'This field is not required.'}
-            self._errors.update(message)
-            self._error_codes.append(NOT_APPLICABLE_ERROR)
-            raise ValidationError(message, code=NOT_APPLICABLE_ERROR)
+                field_applicable: NOT_REQUIRED_MSG}
+            return self.raise_validation_error(message, NOT_APPLICABLE_ERROR)
 
+    @rule_method
     def applicable(self, *responses, field=None, field_applicable=None):
         """Returns False or raises a validation error for field
         pattern where response to question 1 makes
@@ -34,20 +34,17 @@ class ApplicableFieldValidator(BaseFormValidator):
         """
         cleaned_data = self.cleaned_data
         if field in cleaned_data and field_applicable in cleaned_data:
-            if (cleaned_data.get(field) in responses
-                    and cleaned_data.get(field_applicable) == NOT_APPLICABLE):
-                message = {field_applicable: 'This field is applicable'}
-                self._errors.update(message)
-                self._error_codes.append(APPLICABLE_ERROR)
-                raise ValidationError(message, code=APPLICABLE_ERROR)
-            elif (cleaned_data.get(field) not in responses
-                    and cleaned_data.get(field_applicable) != NOT_APPLICABLE):
-                message = {field_applicable: 'This field is not applicable'}
-                self._errors.update(message)
-                self._error_codes.append(NOT_APPLICABLE_ERROR)
-                raise ValidationError(message, code=NOT_APPLICABLE_ERROR)
+            in_responses = cleaned_data[field] in responses
+            is_not_applicable = cleaned_data[field_applicable] == NOT_APPLICABLE
+            if in_responses and is_not_applicable:
+                message = {field_applicable: APPLICABLE_MSG}
+                return self.raise_validation_error(message, APPLICABLE_ERROR)
+            elif not in_responses and not is_not_applicable:
+                message = {field_applicable: NOT_APPLICABLE_MSG}
+                return self.raise_validation_error(message, NOT_APPLICABLE_ERROR)
         return False
 
+    @rule_method
     def not_applicable(self, *responses, field=None, field_applicable=None):
         """Returns False or raises a validation error for field
         pattern where response to question 1 makes
@@ -55,31 +52,25 @@ class ApplicableFieldValidator(BaseFormValidator):
         """
         cleaned_data = self.cleaned_data
         if field in cleaned_data and field_applicable in cleaned_data:
-            if (cleaned_data.get(field) in responses
-                    and cleaned_data.get(field_applicable) != NOT_APPLICABLE):
-                message = {field_applicable: 'This field is not applicable'}
-                self._errors.update(message)
-                self._error_codes.append(NOT_APPLICABLE_ERROR)
-                raise ValidationError(message, code=NOT_APPLICABLE_ERROR)
-            elif (cleaned_data.get(field) not in responses
-                    and cleaned_data.get(field_applicable) == NOT_APPLICABLE):
-                message = {field_applicable: 'This field is applicable'}
-                self._errors.update(message)
-                self._error_codes.append(NOT_APPLICABLE_ERROR)
-                raise ValidationError(message, code=NOT_APPLICABLE_ERROR)
+            in_responses = cleaned_data[field] in responses
+            is_not_applicable = cleaned_data[field_applicable] == NOT_APPLICABLE
+            if in_responses and not is_not_applicable:
+                message = {field_applicable: NOT_APPLICABLE_MSG}
+                return self.raise_validation_error(message, NOT_APPLICABLE_ERROR)
+            elif not in_responses and is_not_applicable:
+                message = {field_applicable: APPLICABLE_MSG}
+                return self.raise_validation_error(message, NOT_APPLICABLE_ERROR)
         return False
 
+    @rule_method
     def applicable_if_true(self, condition, field_applicable=None,
                            applicable_msg=None, not_applicable_msg=None, **kwargs):
         cleaned_data = self.cleaned_data
         if field_applicable in cleaned_data:
-            if (condition and self.cleaned_data.get(field_applicable) == NOT_APPLICABLE):
-                message = {field_applicable: 'This field is applicable'}
-                self._errors.update(message)
-                self._error_codes.append(APPLICABLE_ERROR)
-                raise ValidationError(message, code=APPLICABLE_ERROR)
-            elif (not condition and self.cleaned_data.get(field_applicable) != NOT_APPLICABLE):
-                message = {field_applicable: 'This field is not applicable'}
-                self._errors.update(message)
-                self._error_codes.append(NOT_APPLICABLE_ERROR)
-                raise ValidationError(message, code=NOT_APPLICABLE_ERROR)
+            is_not_applicable = cleaned_data[field_applicable] == NOT_APPLICABLE
+            if condition and is_not_applicable:
+                message = {field_applicable: APPLICABLE_MSG}
+                return self.raise_validation_error(message, APPLICABLE_ERROR)
+            elif not condition and not is_not_applicable:
+                message = {field_applicable: NOT_APPLICABLE_MSG}
+                return self.raise_validation_error(message, NOT_APPLICABLE_ERROR)
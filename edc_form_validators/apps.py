@@ -1,5 +1,14 @@
 from django.apps import AppConfig as DjangoAppConfig
+from django.conf import settings
 
 
 class AppConfig(DjangoAppConfig):
     name = 'edc_form_validators'
+
+    def ready(self):
+        from .site import site_form_validators
+        # quiet, management commands write their reports to stdout
+        site_form_validators.autodiscover(verbose=False)
+        # queries the list models, so off by default
+        if getattr(settings, 'EDC_FORM_VALIDATORS_WARM_ON_READY', False):
+            site_form_validators.warm()
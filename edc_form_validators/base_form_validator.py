@@ -1,38 +1,68 @@
-from django.forms import forms
+from asgiref.sync import sync_to_async
+from collections.abc import Mapping
 
+from django.core.exceptions import NON_FIELD_ERRORS, FieldDoesNotExist, ValidationError
 
-APPLICABLE_ERROR = 'applicable'
-INVALID_ERROR = 'invalid'
-NOT_APPLICABLE_ERROR = 'not_applicable'
-NOT_REQUIRED_ERROR = 'not_required'
-REQUIRED_ERROR = 'required'
+from .core import APPLICABLE_ERROR, INVALID_ERROR, NOT_APPLICABLE_ERROR  # noqa
+from .core import NOT_REQUIRED_ERROR, REQUIRED_ERROR, rule_method  # noqa
+from .core import InvalidModelFormFieldValidator, ModelFormFieldValidatorError  # noqa
+from .core import CoreValidator, ValidationResult, Violation
 
 
-class InvalidModelFormFieldValidator(Exception):
+class BaseFormValidator(CoreValidator):
+    """The Django adapter for CoreValidator.
 
-    def __init__(self, message, code=None):
-        message = f'Invalid field validator. Got \'{message}\''
-        super().__init__(message)
-        self.code = code
+    Rules raise django's ValidationError.
+    """
 
+    error_class = ValidationError
 
-class ModelFormFieldValidatorError(Exception):
+    # if True, on a change form only the declared rules that read a
+    # field changed from the instance's value are run. `clean` is
+    # always run.
+    incremental = False
 
-    def __init__(self, message, code=None):
-        super().__init__(message)
-        self.code = code
+    # an object with a `record(timing)` method, e.g. an
+    # InMemoryAggregator. If set, `validate` and each rule call
+    # are timed. See instrumentation.py.
+    instrumentation = None
 
+    # an object with `get(key)` and `set(key, value)`, e.g. a
+    # ResultCache or a django cache. If set, `validate` replays the
+    # outcome stored for the same class, rules and cleaned_data
+    # instead of running rules and `clean`. See result_cache.py.
+    result_cache = None
 
-class BaseFormValidator:
+    # if None, outcomes are not cached for validators that read the
+    # database, i.e. with M2M rules or `preload_facts`, or for
+    # cleaned_data with model instances or querysets. True to cache
+    # these too, keyed by pk, False to never cache.
+    cache_results = None
 
-    def __init__(self, cleaned_data=None, instance=None):
-        self._errors = {}
-        self._error_codes = []
-        self.cleaned_data = cleaned_data
+    # change to drop cached outcomes, e.g. when `clean` changes
+    rules_version = None
+
+    _reads_database = False
+    _rules_digest = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._reads_database = bool(cls.preload_facts) or any(
+            cls.rule_reads_database(rule) for rule in cls.rules)
+        cls._rules_digest = None
+
+    @classmethod
+    def rule_reads_database(cls, rule):
+        return rule.method_name.startswith('m2m') or any(
+            cls.rule_reads_database(r) for r in getattr(rule, 'rules', ()))
+
+    def __init__(self, cleaned_data=None, instance=None, collect_errors=None,
+                 incremental=None, context=None):
+        super().__init__(
+            cleaned_data=cleaned_data, collect_errors=collect_errors, context=context)
+        if incremental is not None:
+            self.incremental = incremental
         self.instance = instance
-        if cleaned_data is None:
-            raise ModelFormFieldValidatorError(
-                f'{repr(self)}. Expected a cleaned_data dictionary. Got None.')
         try:
             self.instance.id
         except AttributeError:
@@ -41,17 +71,10 @@ class BaseFormValidator:
         else:
             self.add_form = False
             self.change_form = True
-
-    def __repr__(self):
-        return f'{self.__class__.__name__}(cleaned_data={self.cleaned_data})'
-
-    def __str__(self):
-        return self.cleaned_data
-
-    def clean(self):
-        """Override with logic normally in ModelForm.clean().
-        """
-        pass
+        if self.instrumentation is not None:
+            # imported here, instrumentation imports django.db
+            from .instrumentation import instrument
+            instrument(self)
 
     def validate(self):
         """Call in ModelForm.clean.
@@ -67,14 +90,299 @@ class BaseFormValidator:
                 cleaned_data = form_validator.validate()
                 return cleaned_data
 
+        Declared `rules` are run before `clean`.
+
+        If `collect_errors` is True, `clean` runs to the end and a
+        single ValidationError with all errors is raised.
+
+        If `result_cache` is set, see `get_result_cache_key`.
+        """
+        key = None
+        if self.result_cache is not None:
+            key = self.get_result_cache_key()
+        if key is None:
+            self.run_validation()
+            return self.cleaned_data
+        result = self.result_cache.get(key)
+        if result is not None:
+            return self.replay_result(result)
+        try:
+            self.run_validation()
+        except ValidationError as e:
+            self.cache_result(key, self.result_of(e))
+            raise
+        self.cache_result(key, self.result_of())
+        return self.cleaned_data
+
+    def cache_result(self, key, result):
+        """Sets the result in `result_cache` unless facts were read
+        from the context, e.g. by `clean`, and not opted in with
+        `cache_results`.
+        """
+        if not self._read_facts or self.cache_results is True:
+            self.result_cache.set(key, result)
+
+    def run_validation(self):
+        """Runs rules and `clean` and raises as described
+        in `validate`.
+        """
+        if self.collect_errors:
+            self.clean_collected()
+            if self._violations:
+                raise self.get_validation_error()
+        else:
+            try:
+                self.clean_rules()
+                self.clean()
+            except ValidationError as e:
+                self.capture_error_message(e)
+                self.capture_error_code(e)
+                raise ValidationError(e)
+
+    def get_result_cache_key(self):
+        """Returns a key of the class, rules and cleaned_data or None
+        if the outcome should not be cached.
+
+        `clean` is not run for a cached outcome so should not
+        change cleaned_data.
+        """
+        # imported here, only needed if result_cache is set
+        from .result_cache import NotFingerprintable, fingerprint
+
+        cls = self.__class__
+        if self.cache_results is False or (self.incremental and self.change_form):
+            return None
+        if self._reads_database and self.cache_results is not True:
+            return None
+        if cls.__dict__.get('_rules_digest') is None:
+            cls._rules_digest = fingerprint(repr(cls.rules))[:16]
+        try:
+            digest = fingerprint(
+                self.cleaned_data, (self.collect_errors, self.change_form),
+                database=self.cache_results is True)
+        except NotFingerprintable:
+            return None
+        return (f'edc_form_validators:{cls.__module__}.{cls.__qualname__}:'
+                f'{self.rules_version}:{cls._rules_digest}:{digest}')
+
+    def result_of(self, e=None):
+        """Returns a cacheable outcome of (error_codes, errors,
+        violations, error) as left by a run that raised e, if any.
+
+        Messages are not rendered so a replayed outcome is
+        translated in the current language.
+        """
+        return (tuple(self._error_codes), tuple(self._errors.items()),
+                tuple(self._violations), e)
+
+    def replay_result(self, result):
+        """Returns cleaned_data or raises the ValidationError of
+        a cached outcome.
+
+        Restores `_error_codes`, `_errors` and `_violations` as
+        left by the run that was cached.
+        """
+        error_codes, errors, violations, e = result
+        self._error_codes.extend(error_codes)
+        self._errors.update(
+            (field, list(message) if isinstance(message, list) else message)
+            for field, message in errors)
+        self._violations.extend(violations)
+        if e is not None:
+            raise ValidationError(e)
+        return self.cleaned_data
+
+    async def avalidate(self):
+        """Same as `validate` but for async views.
+
+        Awaits `aprepare`, runs rules and `clean` and then awaits
+        `aclean`. Database lookups belong in `aprepare` or `aclean`,
+        not in `clean`.
+
+        If `result_cache` is set, outcomes are cached as in `validate`
+        but, if `aclean` is overridden, only with `cache_results` True.
+        """
+        key = None
+        if self.result_cache is not None and (
+                type(self).aclean is BaseFormValidator.aclean or self.cache_results is True):
+            if self.cache_results is True:
+                # may query the pks of model instances and querysets
+                key = await sync_to_async(self.get_result_cache_key)()
+            else:
+                key = self.get_result_cache_key()
+        if key is None:
+            await self.arun_validation()
+            return self.cleaned_data
+        result = await self.result_cache.aget(key)
+        if result is not None:
+            return self.replay_result(result)
+        try:
+            await self.arun_validation()
+        except ValidationError as e:
+            await self.acache_result(key, self.result_of(e))
+            raise
+        await self.acache_result(key, self.result_of())
+        return self.cleaned_data
+
+    async def acache_result(self, key, result):
+        """Same as `cache_result` but for async views.
+        """
+        if not self._read_facts or self.cache_results is True:
+            await self.result_cache.aset(key, result)
+
+    async def arun_validation(self):
+        """Awaits `aprepare`, runs rules and `clean`, awaits `aclean`
+        and raises as described in `validate`.
+        """
+        await self.aprepare()
+        if self.collect_errors:
+            self.clean_collected()
+            try:
+                await self.aclean()
+            except ValidationError as e:
+                self.capture_error_message(e)
+                self.capture_error_code(e)
+                self.collect_error(e)
+            if self._violations:
+                raise self.get_validation_error()
+        else:
+            try:
+                self.clean_rules()
+                self.clean()
+                await self.aclean()
+            except ValidationError as e:
+                self.capture_error_message(e)
+                self.capture_error_code(e)
+                raise ValidationError(e)
+
+    async def aprepare(self):
+        """Override to load, with the async ORM, what the rules
+        need from the database.
+        """
+        pass
+
+    async def aclean(self):
+        """Override with async logic normally in ModelForm.clean().
+        """
+        pass
+
+    @classmethod
+    def validate_many(cls, rows, context=None):
+        """Yields a ValidationResult for each row without raising.
+
+        Each row is either a cleaned_data dictionary or a model
+        instance. Rows are consumed one at a time so `rows` may be
+        a generator or an iterator over a queryset. The rows share
+        one context.
+        """
+        context = cls.get_batch_context(context, rows)
+        for index, row in enumerate(rows):
+            if isinstance(row, Mapping):
+                cleaned_data, instance = row, None
+            else:
+                cleaned_data, instance = cls.cleaned_data_from_instance(row), row
+            form_validator = cls(
+                cleaned_data=cleaned_data, instance=instance, collect_errors=True,
+                incremental=False, context=context)
+            form_validator.clean_collected()
+            yield ValidationResult(
+                index, form_validator._errors, form_validator._error_codes,
+                form_validator._violations)
+
+    @staticmethod
+    def cleaned_data_from_instance(instance):
+        """Returns a cleaned_data dictionary of the model instance's
+        field values, as a ModelForm would.
+        """
+        opts = instance._meta
+        cleaned_data = {f.name: getattr(instance, f.name) for f in opts.concrete_fields}
+        cleaned_data.update(
+            {f.name: getattr(instance, f.name).all() for f in opts.many_to_many})
+        return cleaned_data
+
+    def clean_collected(self):
+        """Runs rules and `clean` and collects errors without raising.
+
+        Expects `collect_errors` to be True.
         """
         try:
+            self.clean_rules()
             self.clean()
-        except forms.ValidationError as e:
+        except ValidationError as e:
             self.capture_error_message(e)
             self.capture_error_code(e)
-            raise forms.ValidationError(e)
-        return self.cleaned_data
+            self.collect_error(e)
+
+    def clean_rules(self):
+        """Runs the compiled plan of declared rules.
+        """
+        only = None
+        if self.incremental and self.change_form and self.instance.id is not None:
+            always, by_field = self._rules_by_field_read
+            only = set(always)
+            for field in self.changed_fields():
+                only.update(by_field.get(field, ()))
+        self.run_rules(self._rule_plan, self._rule_index, only=only)
+
+    def changed_fields(self):
+        """Returns the fields in cleaned_data whose value differs
+        from the instance's.
+
+        Foreign keys are compared by pk so the related object is
+        not queried. Many-to-many fields are always changed.
+        """
+        opts = getattr(self.instance, '_meta', None)
+        changed = []
+        for field, value in self.cleaned_data.items():
+            try:
+                model_field = opts.get_field(field)
+            except (AttributeError, FieldDoesNotExist):
+                model_field = None
+            if model_field is not None and model_field.concrete and model_field.is_relation \
+                    and not model_field.many_to_many:
+                old_value = getattr(self.instance, model_field.attname)
+                value = getattr(value, 'pk', value)
+            else:
+                try:
+                    old_value = getattr(self.instance, field)
+                except (AttributeError, ValueError):
+                    changed.append(field)
+                    continue
+            if value != old_value:
+                changed.append(field)
+        return changed
+
+    def get_validation_error(self):
+        """Returns a single ValidationError for all recorded
+        violations.
+        """
+        error_dict = {}
+        for field, message, code in self._violations:
+            error_dict.setdefault(field, []).append(
+                ValidationError(message, code=code))
+        return ValidationError(error_dict)
+
+    def collect_error(self, e):
+        """Records a Violation with the rendered message for each
+        error in the ValidationError.
+        """
+        try:
+            error_dict = e.error_dict
+        except AttributeError:
+            error_dict = {NON_FIELD_ERRORS: e.error_list}
+        for field, error_list in error_dict.items():
+            for error in error_list:
+                self._violations.append(
+                    Violation(field, self.render_error(error), error.code))
+
+    @staticmethod
+    def render_error(error):
+        """Returns the message of a single ValidationError as text.
+        """
+        message = error.message
+        if error.params:
+            message = message % error.params
+        return str(message)
 
     def capture_error_message(self, e):
         try:
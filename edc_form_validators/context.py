@@ -0,0 +1,127 @@
+"""Subject level facts shared by the form validators of a request
+or batch.
+
+A fact loader takes a list of keys, e.g. subject identifiers, and
+returns {key: value}. For example:
+
+    from edc_form_validators.context import register_fact
+
+    @register_fact('dob')
+    def dob(subject_identifiers):
+        return dict(RegisteredSubject.objects.filter(
+            subject_identifier__in=subject_identifiers).values_list(
+            'subject_identifier', 'dob'))
+
+Rules read facts with `form_validator.fact('dob')`. Each fact is
+loaded at most once per key per context.
+"""
+from collections.abc import Mapping
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock
+
+# {name: loader}
+facts = {}
+
+current_context = ContextVar('edc_form_validators_context', default=None)
+
+
+def register_fact(name):
+    """Decorator to register a fact loader by name.
+    """
+    def wrapper(loader):
+        facts[name] = loader
+        return loader
+    return wrapper
+
+
+class ValidationContext:
+    """A cache of {(name, key): value} filled by fact loaders.
+
+    If `loaders` is None, uses the registered `facts`.
+    """
+
+    def __init__(self, loaders=None):
+        self.loaders = facts if loaders is None else loaders
+        self._facts = {}
+        self._lock = Lock()
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}(loaders={list(self.loaders)})'
+
+    def __len__(self):
+        return len(self._facts)
+
+    def get_loader(self, name):
+        try:
+            return self.loaders[name]
+        except KeyError:
+            # imported here, core imports this module
+            from .core import InvalidModelFormFieldValidator
+            raise InvalidModelFormFieldValidator(
+                f'No loader for fact \'{name}\'. See register_fact.')
+
+    def get(self, name, key):
+        """Returns the value of the fact for key, loading it if
+        not yet loaded.
+        """
+        try:
+            return self._facts[(name, key)]
+        except KeyError:
+            pass
+        self.preload([key], names=[name])
+        return self._facts[(name, key)]
+
+    def preload(self, keys, names=None):
+        """Loads the named facts, or all facts, for the keys not
+        yet loaded, one loader call per fact.
+
+        A key missing from the loader's result is cached as None.
+        """
+        keys = set(keys)
+        for name in (self.loaders if names is None else names):
+            loader = self.get_loader(name)
+            with self._lock:
+                missing = [k for k in keys if (name, k) not in self._facts]
+            if not missing:
+                continue
+            values = loader(missing)
+            with self._lock:
+                for key in missing:
+                    self._facts[(name, key)] = values.get(key)
+
+    def preload_rows(self, rows, names, key='subject_identifier'):
+        """Loads the named facts for the keys of rows, cleaned_data
+        dictionaries or model instances.
+        """
+        keys = set()
+        for row in rows:
+            if isinstance(row, Mapping):
+                keys.add(row.get(key))
+            else:
+                keys.add(getattr(row, key, None))
+        keys.discard(None)
+        if keys:
+            self.preload(keys, names=names)
+
+    def set(self, name, key, value):
+        with self._lock:
+            self._facts[(name, key)] = value
+
+    def clear(self):
+        with self._lock:
+            self._facts.clear()
+
+
+@contextmanager
+def validation_context(context=None, loaders=None):
+    """Sets a ValidationContext as the current context for form
+    validators created in the block.
+    """
+    if context is None:
+        context = ValidationContext(loaders=loaders)
+    token = current_context.set(context)
+    try:
+        yield context
+    finally:
+        current_context.reset(token)
@@ -0,0 +1,421 @@
+"""Rule logic that does not import Django.
+
+Use the rule mixins with `CoreValidator` to check dictionaries in
+plain Python processes:
+
+    class CrfOneChecker(RequiredFieldValidator, ApplicableFieldValidator,
+                        CoreValidator):
+        rules = [RequiredIf(YES, field='f1', field_required='f2')]
+
+    violations = CrfOneChecker(cleaned_data=row).check()
+
+`BaseFormValidator` is the Django adapter.
+"""
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+from collections.abc import Mapping, Sequence
+
+from .context import ValidationContext, current_context
+
+APPLICABLE_ERROR = 'applicable'
+INVALID_ERROR = 'invalid'
+NOT_APPLICABLE_ERROR = 'not_applicable'
+NOT_REQUIRED_ERROR = 'not_required'
+REQUIRED_ERROR = 'required'
+
+
+def rule_method(func):
+    """Marks a form validator method as a rule. Rule methods are
+    timed if `instrumentation` is set.
+    """
+    func.is_rule_method = True
+    return func
+
+
+class Violation(namedtuple('Violation', ['field', 'message', 'code'])):
+    """A rule failure recorded, instead of raised, when
+    `collect_errors` is True.
+    """
+
+    __slots__ = ()
+
+
+class ValidationResult(namedtuple('ValidationResult',
+                                  ['index', 'errors', 'error_codes', 'violations'],
+                                  defaults=[()])):
+    """The outcome of validating one row in `validate_many`.
+
+    `violations` are the row's Violations in the order raised.
+    """
+
+    __slots__ = ()
+
+    @property
+    def is_valid(self):
+        return not self.errors
+
+
+class ErrorRecord(namedtuple('ErrorRecord', ['row', 'field', 'code', 'message'])):
+    """One failure in a BatchErrors.
+    """
+
+    __slots__ = ()
+
+
+class BatchErrors:
+    """The failures of a batch of rows stored as four arrays of
+    ints, one per column.
+
+    Fields, codes and messages are interned; each distinct string or
+    Message is stored once in `strings`. Rows must be appended
+    in order.
+    """
+
+    __slots__ = ('_rows', '_fields', '_codes', '_messages', 'strings', '_ids')
+
+    def __init__(self):
+        self._rows = array('I')
+        self._fields = array('I')
+        self._codes = array('I')
+        self._messages = array('I')
+        self.strings = []
+        self._ids = {}
+
+    def intern(self, value, key=None):
+        """Returns the id of the value in `strings`.
+
+        Values are looked up by key, if given.
+        """
+        key = value if key is None else key
+        try:
+            return self._ids[key]
+        except KeyError:
+            self._ids[key] = len(self.strings)
+            self.strings.append(value)
+            return self._ids[key]
+
+    def append(self, row, field, code, message):
+        """Appends a failure. A catalogue Message is stored
+        unrendered.
+        """
+        key = getattr(message, 'key', None)
+        if key is None and not isinstance(message, str):
+            message = ' '.join(getattr(message, 'messages', [str(message)]))
+        self._rows.append(row)
+        self._fields.append(self.intern(field))
+        self._codes.append(self.intern(code))
+        self._messages.append(self.intern(message, key=key))
+
+    def record(self, position):
+        strings = self.strings
+        return ErrorRecord(
+            self._rows[position], strings[self._fields[position]],
+            strings[self._codes[position]], strings[self._messages[position]])
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __iter__(self):
+        for position in range(len(self._rows)):
+            yield self.record(position)
+
+    def rows(self):
+        """Returns the indexes of the rows with errors.
+        """
+        return sorted(set(self._rows))
+
+    def for_row(self, row):
+        """Returns the ErrorRecords of a row.
+        """
+        return [self.record(position) for position in range(
+            bisect_left(self._rows, row), bisect_right(self._rows, row))]
+
+    def count_by_code(self):
+        counts = {}
+        for code_id in self._codes:
+            code = self.strings[code_id]
+            counts[code] = counts.get(code, 0) + 1
+        return counts
+
+
+class InvalidModelFormFieldValidator(Exception):
+
+    def __init__(self, message, code=None):
+        message = f'Invalid field validator. Got \'{message}\''
+        super().__init__(message)
+        self.code = code
+
+
+class ModelFormFieldValidatorError(Exception):
+
+    def __init__(self, message, code=None):
+        super().__init__(message)
+        self.code = code
+
+
+class RuleError(Exception):
+    """Raised by a CoreValidator rule with a message of
+    {field: message}.
+    """
+
+    def __init__(self, message, code=None):
+        super().__init__(message)
+        self.message = message
+        self.code = code
+
+
+class CoreValidator:
+
+    # raised by rules, called with (message, code=code)
+    error_class = RuleError
+
+    # if True, rules do not raise on the first error. All errors are
+    # collected and raised together when `validate` returns.
+    collect_errors = False
+
+    # declared rules, e.g. [RequiredIf(YES, field='f1', field_required='f2')].
+    # Compiled once per class into `_rule_plan`, indexed by the fields
+    # each rule requires in `_rule_index`, and run by `validate`
+    # before `clean`.
+    rules = []
+    _rule_plan = ()
+    _rule_index = ((), {})
+    _rules_by_field_read = ((), {})
+    _rule_method_names = ()
+
+    # a ValidationContext of subject level facts. If None, the
+    # current context, if any, is used. See context.py.
+    context = None
+
+    # names of the facts the rules read, e.g. ('dob', ). Loaded for
+    # all rows of a batch with one query per fact.
+    preload_facts = ()
+
+    # set by `check_batch`
+    _batch = None
+    _row = None
+
+    # set by `fact`
+    _read_facts = False
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._rule_plan, cls._rule_index = cls.compile_rules(cls.rules)
+        cls._rules_by_field_read = cls.index_rules_by_field_read(cls.rules)
+        cls._rule_method_names = tuple(
+            name for name in dir(cls)
+            if getattr(getattr(cls, name, None), 'is_rule_method', False))
+
+    @classmethod
+    def compile_rules(cls, rules):
+        """Returns a plan and an index for the rules.
+
+        The plan is a tuple of (function, args, kwargs). The index is
+        a tuple of (positions, {field: positions}) where the first
+        positions are always run and the others only if field is
+        in cleaned_data.
+        """
+        plan = []
+        always = []
+        by_field = {}
+        for position, rule in enumerate(rules):
+            try:
+                compile_rule = rule.compile
+            except AttributeError:
+                raise InvalidModelFormFieldValidator(
+                    f'{rule}. Expected a Rule. See {cls.__name__}.rules.')
+            plan.append(compile_rule(cls))
+            if rule.requires_fields:
+                by_field.setdefault(rule.requires_fields[0], []).append(position)
+            else:
+                always.append(position)
+        index = (tuple(always), {k: tuple(v) for k, v in by_field.items()})
+        return tuple(plan), index
+
+    @staticmethod
+    def index_rules_by_field_read(rules):
+        """Returns a tuple of (positions, {field: positions}) where the
+        first positions are rules that read no fields.
+        """
+        always = []
+        by_field = {}
+        for position, rule in enumerate(rules):
+            if not rule.fields:
+                always.append(position)
+            for field in rule.fields:
+                by_field.setdefault(field, []).append(position)
+        return tuple(always), {k: tuple(v) for k, v in by_field.items()}
+
+    def __init__(self, cleaned_data=None, collect_errors=None, context=None):
+        self._errors = {}
+        self._error_codes = []
+        self._violations = []
+        if collect_errors is not None:
+            self.collect_errors = collect_errors
+        self.context = current_context.get() if context is None else context
+        self.cleaned_data = cleaned_data
+        if cleaned_data is None:
+            raise ModelFormFieldValidatorError(
+                f'{repr(self)}. Expected a cleaned_data dictionary. Got None.')
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}(cleaned_data={self.cleaned_data})'
+
+    def __str__(self):
+        return self.cleaned_data
+
+    def clean(self):
+        """Override with logic normally in ModelForm.clean().
+        """
+        pass
+
+    def check(self):
+        """Runs rules and `clean` and returns a tuple of Violations
+        without raising.
+        """
+        self.collect_errors = True
+        try:
+            self.clean_rules()
+            self.clean()
+        except self.error_class as e:
+            self.collect_error(e)
+        return tuple(self._violations)
+
+    def fact(self, name, key=None):
+        """Returns the value of a fact from the context for key or,
+        if key is None, for the subject_identifier in cleaned_data.
+        """
+        self._read_facts = True
+        if self.context is None:
+            self.context = ValidationContext()
+        if key is None:
+            key = self.cleaned_data.get('subject_identifier')
+        return self.context.get(name, key)
+
+    @classmethod
+    def get_batch_context(cls, context=None, rows=None):
+        """Returns context, the current context or a new one to be
+        shared by the rows of a batch.
+
+        If rows is a sequence, `preload_facts` are loaded for all rows.
+        """
+        if context is None:
+            context = current_context.get()
+        if context is None:
+            context = ValidationContext()
+        if cls.preload_facts and isinstance(rows, Sequence):
+            context.preload_rows(rows, cls.preload_facts)
+        return context
+
+    @classmethod
+    def check_many(cls, rows, context=None):
+        """Yields a ValidationResult for each cleaned_data dictionary
+        in rows.
+
+        The rows share one context.
+        """
+        context = cls.get_batch_context(context, rows)
+        for index, row in enumerate(rows):
+            validator = cls(cleaned_data=row, collect_errors=True, context=context)
+            validator.check()
+            yield ValidationResult(
+                index, validator._errors, validator._error_codes, validator._violations)
+
+    @classmethod
+    def check_batch(cls, rows, context=None):
+        """Returns a BatchErrors of the failures of the cleaned_data
+        dictionaries in rows.
+
+        One validator is reset and reused for every row and failures
+        are written straight to the BatchErrors. The rows share
+        one context.
+        """
+        errors = BatchErrors()
+        context = cls.get_batch_context(context, rows)
+        validator = None
+        for index, row in enumerate(rows):
+            if validator is None:
+                validator = cls(cleaned_data=row, collect_errors=True, context=context)
+                validator._batch = errors
+            else:
+                validator.reset(row)
+            validator._row = index
+            validator.check()
+            # raised in `clean`
+            for field, message, code in validator._violations:
+                errors.append(index, field, code, message)
+        return errors
+
+    def reset(self, cleaned_data):
+        """Clears errors and sets cleaned_data to validate
+        another row.
+        """
+        self.cleaned_data = cleaned_data
+        self._errors.clear()
+        self._error_codes.clear()
+        self._violations.clear()
+
+    def clean_rules(self):
+        """Runs the compiled plan of declared rules.
+        """
+        self.run_rules(self._rule_plan, self._rule_index)
+
+    def run_rules(self, plan, index, only=None):
+        """Runs, in declared order, the rules in plan that do not
+        require a field or whose required field is in cleaned_data.
+
+        If `only` is not None, runs only rules at those positions.
+        """
+        always, by_field = index
+        positions = list(always)
+        for field in by_field.keys() & self.cleaned_data.keys():
+            positions.extend(by_field[field])
+        if only is not None:
+            positions = [p for p in positions if p in only]
+        positions.sort()
+        for position in positions:
+            func, args, kwargs = plan[position]
+            func(self, *args, **kwargs)
+
+    def _gate(self, *responses, field=None, plan=None, index=None):
+        """Runs a Gate's rules if the value of field is
+        in responses.
+        """
+        if self.cleaned_data.get(field) in responses:
+            self.run_rules(plan, index)
+        return False
+
+    def raise_validation_error(self, message, error_code):
+        """Updates _errors and _error_codes then raises
+        `error_class`.
+
+        If `collect_errors` is True, nothing is raised. A Violation
+        is recorded for each field in message and the last one,
+        or None if message is empty, is returned.
+
+        In `check_batch`, the error is written to the batch's
+        BatchErrors instead and error_code is returned.
+        """
+        if self._batch is not None:
+            for field, msg in message.items():
+                self._batch.append(self._row, field, error_code, msg)
+            return error_code
+        self._errors.update(message)
+        self._error_codes.append(error_code)
+        if not self.collect_errors:
+            raise self.error_class(message, code=error_code)
+        violation = None
+        for field, msg in message.items():
+            violation = Violation(field, msg, error_code)
+            self._violations.append(violation)
+        return violation
+
+    def collect_error(self, e):
+        """Records a Violation for each field in the error's message.
+        """
+        message = e.message if isinstance(e.message, Mapping) else {'__all__': e.message}
+        self._errors.update(message)
+        self._error_codes.append(e.code)
+        for field, msg in message.items():
+            self._violations.append(Violation(field, msg, e.code))
@@ -1,14 +1,23 @@
 from django import forms
 
+from .site import site_form_validators, NotRegistered
+
 
 class FormValidatorMixin(forms.ModelForm):
 
+    # if None, the class registered for the form's model is used
     form_validator_cls = None
 
     def clean(self):
         cleaned_data = super().clean()
+        form_validator_cls = self.form_validator_cls
+        if form_validator_cls is None:
+            try:
+                form_validator_cls = site_form_validators.get(self._meta.model._meta.label_lower)
+            except NotRegistered:
+                pass
         try:
-            form_validator = self.form_validator_cls(
+            form_validator = form_validator_cls(
                 cleaned_data=cleaned_data,
                 instance=self.instance)
         except TypeError:
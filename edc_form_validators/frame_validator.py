@@ -0,0 +1,140 @@
+import numpy as np
+import pandas as pd
+
+from edc_constants.constants import DWTA, NOT_APPLICABLE, OTHER
+
+from .base_form_validator import APPLICABLE_ERROR, NOT_APPLICABLE_ERROR
+from .base_form_validator import InvalidModelFormFieldValidator
+from .base_form_validator import NOT_REQUIRED_ERROR, REQUIRED_ERROR
+
+
+def blank(series):
+    """Returns a mask of values that are None, NaN or falsey.
+    """
+    return series.isna() | ~series.astype(bool)
+
+
+def required_if(frame, column, responses, field=None, field_required=None,
+                optional_if_dwta=None, optional_if_na=None, inverse=None, **kwargs):
+    if field not in frame:
+        return []
+    value = frame[field]
+    skip = np.zeros(len(frame), dtype=bool)
+    if DWTA in responses and optional_if_dwta:
+        skip |= value == DWTA
+    if NOT_APPLICABLE in responses and optional_if_na:
+        skip |= value == NOT_APPLICABLE
+    in_responses = value.isin(responses) & ~skip
+    required_blank = blank(column(field_required)) | (column(field_required) == NOT_APPLICABLE)
+    masks = [(field_required, in_responses & required_blank, REQUIRED_ERROR)]
+    if inverse:
+        not_in_responses = ~value.isin(responses) & ~skip
+        masks.append(
+            (field_required, not_in_responses & ~required_blank, NOT_REQUIRED_ERROR))
+    return masks
+
+
+def not_required_if(frame, column, responses, field=None, field_required=None,
+                    optional_if_dwta=None, inverse=None, **kwargs):
+    if field not in frame or field_required not in frame:
+        return []
+    value = frame[field]
+    skip = np.zeros(len(frame), dtype=bool)
+    if DWTA in responses and optional_if_dwta:
+        skip |= value == DWTA
+    in_responses = value.isin(responses) & ~skip
+    required_blank = blank(frame[field_required]) | (frame[field_required] == NOT_APPLICABLE)
+    masks = [(field_required, in_responses & ~required_blank, NOT_REQUIRED_ERROR)]
+    if inverse:
+        not_in_responses = ~value.isin(responses) & ~skip
+        masks.append(
+            (field_required, not_in_responses & required_blank, REQUIRED_ERROR))
+    return masks
+
+
+def applicable(frame, column, *responses, field=None, field_applicable=None):
+    if field not in frame or field_applicable not in frame:
+        return []
+    in_responses = frame[field].isin(responses)
+    is_na = frame[field_applicable] == NOT_APPLICABLE
+    return [
+        (field_applicable, in_responses & is_na, APPLICABLE_ERROR),
+        (field_applicable, ~in_responses & ~is_na, NOT_APPLICABLE_ERROR)]
+
+
+def not_applicable(frame, column, *responses, field=None, field_applicable=None):
+    if field not in frame or field_applicable not in frame:
+        return []
+    in_responses = frame[field].isin(responses)
+    is_na = frame[field_applicable] == NOT_APPLICABLE
+    return [
+        (field_applicable, in_responses & ~is_na, NOT_APPLICABLE_ERROR),
+        (field_applicable, ~in_responses & is_na, NOT_APPLICABLE_ERROR)]
+
+
+def validate_other_specify(frame, column, field, other_specify_field=None,
+                           other_stored_value=None, **kwargs):
+    value = column(field)
+    other = value == (other_stored_value or OTHER)
+    answered = ~blank(value)
+    other_blank = blank(column(other_specify_field))
+    return [
+        (other_specify_field, answered & other & other_blank, REQUIRED_ERROR),
+        (other_specify_field, answered & ~other & ~other_blank, NOT_REQUIRED_ERROR)]
+
+
+def require_together(frame, column, field=None, field_required=None, **kwargs):
+    value_none = column(field).isna()
+    required_none = column(field_required).isna()
+    return [
+        (field_required, ~value_none & required_none, REQUIRED_ERROR),
+        (field_required, value_none & ~required_none, NOT_REQUIRED_ERROR)]
+
+
+class FrameValidator:
+    """Evaluates declared rules over all rows of a pandas DataFrame
+    using boolean masks.
+
+    Returns a DataFrame of error codes with the frame's index and
+    a column per field in error. Equivalent to validating each row
+    with `collect_errors=True`; if more than one rule fails for
+    a field, the last rule's code is kept.
+
+    For example:
+
+        codes = FrameValidator(MyFormValidator).validate(frame)
+        codes[codes['f2'] == REQUIRED_ERROR]
+    """
+
+    masks = {
+        '_required_if': required_if,
+        '_not_required_if': not_required_if,
+        'applicable': applicable,
+        'not_applicable': not_applicable,
+        'validate_other_specify': validate_other_specify,
+        'require_together': require_together,
+    }
+
+    def __init__(self, form_validator_cls=None, rules=None):
+        self.rules = form_validator_cls.rules if rules is None else rules
+        for rule in self.rules:
+            if rule.method_name not in self.masks:
+                raise InvalidModelFormFieldValidator(
+                    f'{repr(rule)}. Rule cannot be evaluated over a DataFrame.')
+
+    def validate(self, frame):
+        empty = pd.Series(None, index=frame.index, dtype=object)
+
+        def column(name):
+            return frame[name] if name in frame else empty
+
+        codes = {}
+        for rule in self.rules:
+            get_masks = self.masks.get(rule.method_name)
+            for field, mask, code in get_masks(frame, column, *rule.args, **rule.kwargs):
+                mask = np.asarray(mask, dtype=bool)
+                if mask.any():
+                    if field not in codes:
+                        codes[field] = np.full(len(frame), None, dtype=object)
+                    codes[field][mask] = code
+        return pd.DataFrame(codes, index=frame.index, dtype=object)
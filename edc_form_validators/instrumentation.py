@@ -0,0 +1,178 @@
+import logging
+
+from collections import defaultdict, deque, namedtuple
+from functools import wraps
+from math import ceil
+from threading import Lock
+from time import perf_counter
+
+from django.db import connection
+from django.dispatch import Signal
+from django.core.exceptions import ValidationError
+
+VALID = 'valid'
+INVALID = 'invalid'
+ERROR = 'error'
+
+validation_timed = Signal()
+
+
+class Timing(namedtuple('Timing', ['validator', 'name', 'elapsed', 'queries',
+                                   'outcome', 'error_codes'])):
+    """One timed call of `validate` or a rule method.
+
+    `elapsed` is in seconds; `outcome` is one of valid, invalid
+    or error.
+    """
+
+    __slots__ = ()
+
+
+class QueryCounter:
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def timed(form_validator, name, func, rule=True):
+    """Returns func wrapped to send a Timing to the form
+    validator's instrumentation sink.
+
+    If `rule` is True, only the outermost rule call is timed, e.g.
+    `applicable_if` but not the `applicable` it calls.
+    """
+    sink = form_validator.instrumentation
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if rule and form_validator._in_timed_rule:
+            return func(*args, **kwargs)
+        error_codes = len(form_validator._error_codes)
+        queries = QueryCounter()
+        outcome = VALID
+        start = perf_counter()
+        if rule:
+            form_validator._in_timed_rule = True
+        try:
+            with connection.execute_wrapper(queries):
+                result = func(*args, **kwargs)
+        except ValidationError:
+            outcome = INVALID
+            raise
+        except Exception:
+            outcome = ERROR
+            raise
+        finally:
+            if rule:
+                form_validator._in_timed_rule = False
+            elapsed = perf_counter() - start
+            new_error_codes = form_validator._error_codes[error_codes:]
+            if new_error_codes and outcome == VALID:
+                outcome = INVALID
+            sink.record(Timing(
+                form_validator.__class__.__name__, name, elapsed,
+                queries.count, outcome, new_error_codes))
+        return result
+    return wrapper
+
+
+def timed_plan(form_validator, plan, rules):
+    """Returns the compiled plan of rules with each entry timed
+    as 'rules.<Rule class>'.
+
+    A Gate is not timed itself, the entries of its plan are.
+    """
+    entries = []
+    for (func, args, kwargs), rule in zip(plan, rules):
+        if getattr(rule, 'rules', None):
+            kwargs = dict(kwargs, plan=timed_plan(form_validator, kwargs['plan'], rule.rules))
+        else:
+            func = timed(form_validator, f'rules.{rule.__class__.__name__}', func)
+        entries.append((func, args, kwargs))
+    return tuple(entries)
+
+
+def instrument(form_validator):
+    """Replaces `validate`, the rule methods and the compiled
+    rule plan on the instance with timed wrappers.
+    """
+    form_validator._in_timed_rule = False
+    form_validator.validate = timed(
+        form_validator, 'validate', form_validator.validate, rule=False)
+    for name in form_validator._rule_method_names:
+        setattr(form_validator, name, timed(
+            form_validator, name, getattr(form_validator, name)))
+    form_validator._rule_plan = timed_plan(
+        form_validator, form_validator._rule_plan, form_validator.rules)
+
+
+class LoggingSink:
+    """Logs each Timing.
+    """
+
+    def __init__(self, logger=None, level=None):
+        self.logger = logger or logging.getLogger('edc_form_validators')
+        self.level = level or logging.DEBUG
+
+    def record(self, timing):
+        self.logger.log(
+            self.level, '%s.%s %s in %.3fms, %s queries %s',
+            timing.validator, timing.name, timing.outcome,
+            timing.elapsed * 1000, timing.queries, timing.error_codes)
+
+
+class SignalSink:
+    """Sends the `validation_timed` signal with each Timing.
+    """
+
+    def record(self, timing):
+        validation_timed.send(sender=self.__class__, timing=timing)
+
+
+class InMemoryAggregator:
+    """Keeps the last `maxlen` timings per validator and name and
+    reports percentiles.
+    """
+
+    def __init__(self, maxlen=None):
+        self.maxlen = maxlen or 10000
+        self.timings = defaultdict(lambda: deque(maxlen=self.maxlen))
+        self._lock = Lock()
+
+    def record(self, timing):
+        with self._lock:
+            self.timings[(timing.validator, timing.name)].append(timing)
+
+    def percentile(self, key, percent):
+        """Returns the elapsed seconds at percent, nearest rank.
+        """
+        with self._lock:
+            elapsed = sorted(t.elapsed for t in self.timings.get(key, []))
+        if not elapsed:
+            return None
+        return elapsed[max(0, ceil(percent / 100 * len(elapsed)) - 1)]
+
+    def summary(self):
+        """Returns {(validator, name): {count, queries, invalid, p50,
+        p90, p99, max}}.
+        """
+        summary = {}
+        for key in list(self.timings):
+            timings = list(self.timings[key])
+            summary[key] = dict(
+                count=len(timings),
+                queries=sum(t.queries for t in timings),
+                invalid=sum(1 for t in timings if t.outcome == INVALID),
+                p50=self.percentile(key, 50),
+                p90=self.percentile(key, 90),
+                p99=self.percentile(key, 99),
+                max=max(t.elapsed for t in timings))
+        return summary
+
+    def clear(self):
+        with self._lock:
+            self.timings.clear()
@@ -0,0 +1,98 @@
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+
+from django.conf import settings
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+
+class ListModelCache:
+    """A process-wide, bounded LRU cache of {pk: (short_name, name)}
+    per edc list model.
+
+    Entries are kept per concrete model, so a proxy model shares the
+    entry of the model it proxies. A model's entry is dropped when any
+    of its instances are saved or deleted in this process. Changes
+    made in another process are only seen once the entry is as old as
+    `timeout` seconds, if set, or is dropped.
+    """
+
+    def __init__(self, maxsize=None, timeout=None):
+        self.maxsize = maxsize or 128
+        self.timeout = timeout
+        # {concrete model: (loaded at, choices)}
+        self._choices = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, model):
+        """Returns a dictionary of {pk: (short_name, name)} for
+        all instances of the list model.
+        """
+        model = model._meta.concrete_model
+        choices = self._get(model)
+        if choices is None:
+            choices = self._put(model, {
+                pk: (short_name, name) for pk, short_name, name in
+                model._default_manager.values_list('pk', 'short_name', 'name')})
+        return choices
+
+    async def aget(self, model):
+        """Same as `get` but queries with the async ORM.
+        """
+        model = model._meta.concrete_model
+        choices = self._get(model)
+        if choices is None:
+            choices = self._put(model, {
+                pk: (short_name, name) async for pk, short_name, name in
+                model._default_manager.values_list('pk', 'short_name', 'name')})
+        return choices
+
+    def _get(self, model):
+        """Returns the choices of the concrete model or None if
+        not cached or expired.
+        """
+        with self._lock:
+            try:
+                self._choices.move_to_end(model)
+            except KeyError:
+                return None
+            loaded_at, choices = self._choices[model]
+            if self.timeout is not None and monotonic() - loaded_at >= self.timeout:
+                del self._choices[model]
+                return None
+            return choices
+
+    def _put(self, model, choices):
+        with self._lock:
+            self._choices[model] = (monotonic(), choices)
+            while len(self._choices) > self.maxsize:
+                self._choices.popitem(last=False)
+        return choices
+
+    def invalidate(self, model=None):
+        """Drops the model's entry or, if model is None, all entries.
+        """
+        with self._lock:
+            if model is None:
+                self._choices.clear()
+            else:
+                self._choices.pop(model._meta.concrete_model, None)
+
+    def __contains__(self, model):
+        return model._meta.concrete_model in self._choices
+
+    def __len__(self):
+        return len(self._choices)
+
+
+list_model_cache = ListModelCache(
+    maxsize=getattr(settings, 'EDC_FORM_VALIDATORS_LIST_MODEL_CACHE_SIZE', None),
+    timeout=getattr(settings, 'EDC_FORM_VALIDATORS_LIST_MODEL_CACHE_TIMEOUT', None))
+
+
+@receiver(post_save, weak=False, dispatch_uid='list_model_cache_on_post_save')
+@receiver(post_delete, weak=False, dispatch_uid='list_model_cache_on_post_delete')
+def invalidate_list_model_cache(sender, **kwargs):
+    if sender in list_model_cache:
+        list_model_cache.invalidate(sender)
@@ -0,0 +1,50 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ...revalidate import read_csv, read_jsonl, revalidate
+
+
+class Command(BaseCommand):
+
+    help = ('Re-validate a CSV or JSONL file or a model\'s instances with a '
+            'FormValidator class. Writes an error report per invalid row as JSON lines.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'form_validator',
+            help='Model label or class path of a registered FormValidator, or a dotted path')
+        source = parser.add_mutually_exclusive_group(required=True)
+        source.add_argument('--csv', help='Path to a CSV file with a header')
+        source.add_argument('--jsonl', help='Path to a JSON lines file')
+        source.add_argument('--model', help='Model label, e.g. my_app.crfone')
+        parser.add_argument(
+            '--output', help='Path to write the report. Default: stdout')
+        parser.add_argument('--workers', type=int, default=None)
+        parser.add_argument('--chunk-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        rows = None
+        if options['csv']:
+            rows = read_csv(options['csv'])
+        elif options['jsonl']:
+            rows = read_jsonl(options['jsonl'])
+        reports = revalidate(
+            options['form_validator'], rows=rows, model=options['model'],
+            chunk_size=options['chunk_size'], workers=options['workers'],
+            progress=self.progress)
+        output = open(options['output'], 'w') if options['output'] else self.stdout
+        invalid = 0
+        try:
+            for report in reports:
+                output.write(json.dumps(report, default=str) + '\n')
+                invalid += 1
+        except ImportError as e:
+            raise CommandError(e)
+        finally:
+            if options['output']:
+                output.close()
+        self.stderr.write(self.style.SUCCESS(f'Done. {invalid} invalid.'))
+
+    def progress(self, done):
+        self.stderr.write(f'Validated {done} ...')
@@ -0,0 +1,71 @@
+from django.apps import apps as django_apps
+from django.core.management.base import BaseCommand, CommandError
+
+from ...report import report_records, report_writers, write_records
+from ...revalidate import read_csv, read_jsonl
+from ...site import site_form_validators
+
+
+class Command(BaseCommand):
+
+    help = ('Stream a CSV or JSONL file or a model\'s instances through a FormValidator '
+            'class. Writes one record of key, field, code and message per failure.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'form_validator',
+            help='Model label or class path of a registered FormValidator, or a dotted path')
+        source = parser.add_mutually_exclusive_group(required=True)
+        source.add_argument('--csv', help='Path to a CSV file with a header')
+        source.add_argument('--jsonl', help='Path to a JSON lines file')
+        source.add_argument('--model', help='Model label, e.g. my_app.crfone')
+        parser.add_argument(
+            '--format', choices=list(report_writers), default='jsonl')
+        parser.add_argument(
+            '--output', help='Path to write the report. Default: stdout')
+        parser.add_argument(
+            '--code', action='append', dest='codes',
+            help='Report only this error code. May be repeated')
+        parser.add_argument('--chunk-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        try:
+            form_validator_cls = site_form_validators.get_or_import(options['form_validator'])
+        except ImportError as e:
+            raise CommandError(
+                f'Expected a registered FormValidator or a class path. '
+                f'Got \'{options["form_validator"]}\'. {e}')
+        rows, queryset = self.get_source(options)
+        records = report_records(
+            form_validator_cls, rows=rows, queryset=queryset,
+            chunk_size=options['chunk_size'], codes=options['codes'])
+        writer_cls = report_writers[options['format']]
+        binary = getattr(writer_cls, 'binary', False)
+        if binary and not options['output']:
+            raise CommandError(f'--output is required for format {options["format"]}.')
+        if options['output']:
+            output = open(options['output'], 'wb' if binary else 'w',
+                          newline=None if binary else '')
+        else:
+            output = self.stdout
+        try:
+            count = write_records(records, writer_cls(output))
+        except ImportError as e:
+            raise CommandError(e)
+        finally:
+            if options['output']:
+                output.close()
+        self.stderr.write(self.style.SUCCESS(f'Done. {count} errors.'))
+
+    def get_source(self, options):
+        """Returns a tuple of (rows, queryset), one of them None.
+        """
+        if options['csv']:
+            return read_csv(options['csv']), None
+        if options['jsonl']:
+            return read_jsonl(options['jsonl']), None
+        try:
+            model_cls = django_apps.get_model(options['model'])
+        except (LookupError, ValueError) as e:
+            raise CommandError(e)
+        return None, model_cls._default_manager.order_by('pk')
@@ -1,72 +1,160 @@
-from django.forms import ValidationError
 from edc_constants.constants import NOT_APPLICABLE
 
-from .base_form_validator import BaseFormValidator, NOT_APPLICABLE_ERROR, APPLICABLE_ERROR
+from .base_form_validator import BaseFormValidator, rule_method, NOT_APPLICABLE_ERROR, APPLICABLE_ERROR
 from .base_form_validator import NOT_REQUIRED_ERROR, REQUIRED_ERROR, INVALID_ERROR
+from .messages import Message, REQUIRED_MSG, NOT_REQUIRED_MSG, M2M_REQUIRED_MSG, M2M_NOT_REQUIRED_MSG
+from .messages import M2M_APPLICABLE_MSG, M2M_NOT_APPLICABLE_MSG
 
 
 class ManyToManyFieldValidator(BaseFormValidator):
 
+    # if True, selections of edc list models are looked up by pk in
+    # the process-wide `list_model_cache` instead of loading rows.
+    m2m_list_model_cache = False
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._m2m_objects = {}
+        self._m2m_selected = {}
+
+    def reset(self, cleaned_data):
+        super().reset(cleaned_data)
+        self._m2m_objects.clear()
+        self._m2m_selected.clear()
+
+    def m2m_objects(self, m2m_field):
+        """Returns a list of the selected objects of m2m_field.
+
+        Each m2m_field is queried once per instance.
+        """
+        try:
+            return self._m2m_objects[m2m_field]
+        except KeyError:
+            qs = self.cleaned_data.get(m2m_field)
+            objects = [] if qs is None else list(qs)
+            self._m2m_objects[m2m_field] = objects
+            return objects
+
+    def m2m_count(self, m2m_field):
+        if self.m2m_list_model_cache:
+            return len(self.m2m_selected(m2m_field))
+        return len(self.m2m_objects(m2m_field))
+
+    def m2m_selected(self, m2m_field):
+        """Returns a dictionary of {short_name: name} of the selected
+        objects of m2m_field.
+
+        Note: for edc list models, "short_name" is the stored value!
+        """
+        try:
+            return self._m2m_selected[m2m_field]
+        except KeyError:
+            if self.m2m_list_model_cache:
+                selected = self._m2m_selected_from_cache(m2m_field)
+            else:
+                selected = {obj.short_name: obj.name for obj in self.m2m_objects(m2m_field)}
+            self._m2m_selected[m2m_field] = selected
+            return selected
+
+    def _m2m_selected_from_cache(self, m2m_field):
+        """Returns {short_name: name} for the selected pks of
+        m2m_field using the list model cache.
+        """
+        from .list_model_cache import list_model_cache
+        qs = self.cleaned_data.get(m2m_field)
+        if qs is None:
+            return {}
+        pks = list(qs.values_list('pk', flat=True))
+        try:
+            return dict(list_model_cache.get(qs.model)[pk] for pk in pks)
+        except KeyError:
+            # added in another process since cached
+            list_model_cache.invalidate(qs.model)
+            return dict(list_model_cache.get(qs.model)[pk] for pk in pks)
+
+    async def aprepare(self):
+        await super().aprepare()
+        await self.aload_m2m()
+
+    async def aload_m2m(self):
+        """Loads the selections of each m2m field in cleaned_data
+        with the async ORM.
+
+        The m2m rules then read the loaded selections and do not
+        query the database.
+        """
+        from django.db.models import QuerySet
+        for m2m_field, qs in self.cleaned_data.items():
+            if not isinstance(qs, QuerySet):
+                continue
+            if self.m2m_list_model_cache:
+                if m2m_field not in self._m2m_selected:
+                    self._m2m_selected[m2m_field] = await self._am2m_selected_from_cache(qs)
+            elif m2m_field not in self._m2m_objects:
+                self._m2m_objects[m2m_field] = [obj async for obj in qs]
+
+    async def _am2m_selected_from_cache(self, qs):
+        from .list_model_cache import list_model_cache
+        pks = [pk async for pk in qs.values_list('pk', flat=True)]
+        choices = await list_model_cache.aget(qs.model)
+        try:
+            return dict(choices[pk] for pk in pks)
+        except KeyError:
+            # added in another process since cached
+            list_model_cache.invalidate(qs.model)
+            choices = await list_model_cache.aget(qs.model)
+            return dict(choices[pk] for pk in pks)
+
+    @rule_method
     def m2m_required(self, m2m_field=None):
         """Raises an exception or returns False.
 
         m2m_field is required.
         """
         message = None
-        if not self.cleaned_data.get(m2m_field):
-            message = {m2m_field: 'This field is required'}
+        if not self.m2m_count(m2m_field):
+            message = {m2m_field: M2M_REQUIRED_MSG}
             code = REQUIRED_ERROR
         if message:
-            self._errors.update(message)
-            self._error_codes.append(code)
-            raise ValidationError(message, code=code)
+            return self.raise_validation_error(message, code)
         return False
 
+    @rule_method
     def m2m_required_if(self, response=None, field=None, m2m_field=None):
         """Raises an exception or returns False.
 
         m2m_field is required if field  == response
         """
         message = None
-        if (self.cleaned_data.get(field) == response
-                and not self.cleaned_data.get(m2m_field)):
-            message = {m2m_field: 'This field is required'}
-            code = REQUIRED_ERROR
-        elif (self.cleaned_data.get(field) == response
-              and self.cleaned_data.get(m2m_field).count() == 0):
-            message = {m2m_field: 'This field is required'}
+        is_response = self.cleaned_data.get(field) == response
+        if is_response and not self.m2m_count(m2m_field):
+            message = {m2m_field: M2M_REQUIRED_MSG}
             code = REQUIRED_ERROR
-        elif (self.cleaned_data.get(field) != response
-              and self.cleaned_data.get(m2m_field)
-              and self.cleaned_data.get(m2m_field).count() != 0):
-            message = {m2m_field: 'This field is not required'}
+        elif not is_response and self.m2m_count(m2m_field):
+            message = {m2m_field: M2M_NOT_REQUIRED_MSG}
             code = NOT_REQUIRED_ERROR
         if message:
-            self._errors.update(message)
-            self._error_codes.append(code)
-            raise ValidationError(message, code=code)
+            return self.raise_validation_error(message, code)
         return False
 
+    @rule_method
     def m2m_single_selection_if(self, *single_selections, m2m_field=None):
         """Raises an exception of returns False.
 
         if a selected response from m2m_field is in single_selections
         and there is more than one selected value, raises.
         """
-        qs = self.cleaned_data.get(m2m_field)
-        if qs and qs.count() > 1:
-            selected = {obj.short_name: obj.name for obj in qs}
+        if self.m2m_count(m2m_field) > 1:
+            selected = self.m2m_selected(m2m_field)
             for selection in single_selections:
                 if selection in selected:
                     message = {
                         m2m_field:
-                        f'Invalid combination. \'{selected.get(selection)}\' may not be combined '
-                        f'with other selections'}
-                    self._errors.update(message)
-                    self._error_codes.append(INVALID_ERROR)
-                    raise ValidationError(message, code=INVALID_ERROR)
+                        Message('m2m', INVALID_ERROR, selection=selected.get(selection))}
+                    return self.raise_validation_error(message, INVALID_ERROR)
         return False
 
+    @rule_method
     def m2m_other_specify(self, *responses, m2m_field=None, field_other=None):
         """Raises an exception or returns False.
 
@@ -75,30 +163,25 @@ class ManyToManyFieldValidator(BaseFormValidator):
 
         Note: for edc list models, "short_name" is the stored value!
         """
-        qs = self.cleaned_data.get(m2m_field)
         found = False
-        if qs and qs.count() > 0:
-            selected = {obj.short_name: obj.name for obj in qs}
+        other_value = self.cleaned_data.get(field_other)
+        if self.m2m_count(m2m_field) > 0:
+            selected = self.m2m_selected(m2m_field)
             for response in responses:
                 if response in selected:
                     found = True
-            if found and not self.cleaned_data.get(field_other):
-                message = {field_other: 'This field is required.'}
-                self._errors.update(message)
-                self._error_codes.append(REQUIRED_ERROR)
-                raise ValidationError(message, code=REQUIRED_ERROR)
-            elif not found and self.cleaned_data.get(field_other):
-                message = {field_other: 'This field is not required.'}
-                self._errors.update(message)
-                self._error_codes.append(NOT_REQUIRED_ERROR)
-                raise ValidationError(message, code=NOT_REQUIRED_ERROR)
-        elif self.cleaned_data.get(field_other):
-            message = {field_other: 'This field is not required.'}
-            self._errors.update(message)
-            self._error_codes.append(NOT_REQUIRED_ERROR)
-            raise ValidationError(message, code=NOT_REQUIRED_ERROR)
+            if found and not other_value:
+                message = {field_other: REQUIRED_MSG}
+                return self.raise_validation_error(message, REQUIRED_ERROR)
+            elif not found and other_value:
+                message = {field_other: NOT_REQUIRED_MSG}
+                return self.raise_validation_error(message, NOT_REQUIRED_ERROR)
+        elif other_value:
+            message = {field_other: NOT_REQUIRED_MSG}
+            return self.raise_validation_error(message, NOT_REQUIRED_ERROR)
         return False
 
+    @rule_method
     def m2m_other_specify_applicable(
             self, *responses, m2m_field=None, field_other=None):
         """Raises an exception or returns False.
@@ -106,26 +189,20 @@ class ManyToManyFieldValidator(BaseFormValidator):
         field_other is applicable if a selected response from m2m_field
         is in responses
         """
-        qs = self.cleaned_data.get(m2m_field)
         found = False
-        if qs and qs.count() > 0:
-            selected = {obj.short_name: obj.name for obj in qs}
+        is_not_applicable = self.cleaned_data.get(field_other) == NOT_APPLICABLE
+        if self.m2m_count(m2m_field) > 0:
+            selected = self.m2m_selected(m2m_field)
             for response in responses:
                 if response in selected:
                     found = True
-            if found and self.cleaned_data.get(field_other) == NOT_APPLICABLE:
-                message = {field_other: 'This field is applicable.'}
-                self._errors.update(message)
-                self._error_codes.append(APPLICABLE_ERROR)
-                raise ValidationError(message, code=APPLICABLE_ERROR)
-            elif not found and self.cleaned_data.get(field_other) != NOT_APPLICABLE:
-                message = {field_other: 'This field is not applicable.'}
-                self._errors.update(message)
-                self._error_codes.append(NOT_APPLICABLE_ERROR)
-                raise ValidationError(message, code=NOT_APPLICABLE_ERROR)
-        elif self.cleaned_data.get(field_other) != NOT_APPLICABLE:
-            message = {field_other: 'This field is not applicable.'}
-            self._errors.update(message)
-            self._error_codes.append(NOT_APPLICABLE_ERROR)
-            raise ValidationError(message, code=NOT_APPLICABLE_ERROR)
+            if found and is_not_applicable:
+                message = {field_other: M2M_APPLICABLE_MSG}
+                return self.raise_validation_error(message, APPLICABLE_ERROR)
+            elif not found and not is_not_applicable:
+                message = {field_other: M2M_NOT_APPLICABLE_MSG}
+                return self.raise_validation_error(message, NOT_APPLICABLE_ERROR)
+        elif not is_not_applicable:
+            message = {field_other: M2M_NOT_APPLICABLE_MSG}
+            return self.raise_validation_error(message, NOT_APPLICABLE_ERROR)
         return False
@@ -0,0 +1,113 @@
+"""A catalogue of the default error messages keyed by (rule, code).
+
+Rules raise a `Message` instead of a str. A Message is rendered, and
+translated with django's gettext if settings are configured, only when
+converted to str, so batch and API paths can carry codes without
+rendering messages.
+"""
+from .core import APPLICABLE_ERROR, INVALID_ERROR, NOT_APPLICABLE_ERROR
+from .core import NOT_REQUIRED_ERROR, REQUIRED_ERROR
+
+
+def _(message):
+    """Marks message for makemessages. Translated when rendered.
+    """
+    return message
+
+
+catalogue = {
+    ('required', REQUIRED_ERROR): _('This field is required.'),
+    ('required', NOT_REQUIRED_ERROR): _('This field is not required.'),
+    ('applicable', APPLICABLE_ERROR): _('This field is applicable'),
+    ('applicable', NOT_APPLICABLE_ERROR): _('This field is not applicable'),
+    ('m2m', REQUIRED_ERROR): _('This field is required'),
+    ('m2m', NOT_REQUIRED_ERROR): _('This field is not required'),
+    ('m2m', INVALID_ERROR): _(
+        'Invalid combination. \'{selection}\' may not be combined with other selections'),
+    ('m2m_other', APPLICABLE_ERROR): _('This field is applicable.'),
+    ('m2m_other', NOT_APPLICABLE_ERROR): _('This field is not applicable.'),
+    ('yes_no', REQUIRED_ERROR): _('This field is required based on previous answer.'),
+    ('yes_no', NOT_REQUIRED_ERROR): _('This field is not required based on previous answer.'),
+    ('age', APPLICABLE_ERROR): _(
+        'Applicable. Age {phrase} {age}y at previous visit to be "not applicable". '
+        'Got {subject_age}y'),
+    ('age', NOT_APPLICABLE_ERROR): _(
+        'Not applicable. Age {phrase} {age}y at previous visit. Got {subject_age}y'),
+    ('dates', INVALID_ERROR): _('{field1} {phrase} {field2}.'),
+    ('phrase', 'gt'): _('must be greater than'),
+    ('phrase', 'gte'): _('must be greater than or equal to'),
+    ('phrase', 'lt'): _('must be less than'),
+    ('phrase', 'lte'): _('must be less than or equal to'),
+    ('phrase', 'ne'): _('may not equal'),
+    ('phrase', 'eq'): _('must equal'),
+}
+
+ref_template = _('ref: {ref}')
+
+
+def translate(text):
+    """Returns text translated with django's gettext or, if django
+    is not installed or configured, unchanged.
+    """
+    try:
+        from django.conf import settings
+        from django.utils.translation import gettext
+    except ImportError:
+        return text
+    return gettext(text) if settings.configured else text
+
+
+class Message:
+    """A message from the catalogue rendered when converted
+    to str.
+
+    Compares equal to other Messages with the same key and to its
+    rendered str.
+    """
+
+    __slots__ = ('rule', 'code', 'ref', 'params')
+
+    def __init__(self, rule, code, ref=None, **params):
+        self.rule = rule
+        self.code = code
+        self.ref = ref
+        self.params = params
+
+    @property
+    def key(self):
+        return (self.rule, self.code, self.ref, tuple(
+            (k, v.key if isinstance(v, Message) else v) for k, v in self.params.items()))
+
+    def __str__(self):
+        text = translate(catalogue.get((self.rule, self.code), ''))
+        if self.params:
+            text = text.format(**{k: str(v) if isinstance(v, Message) else v
+                                  for k, v in self.params.items()})
+        if self.ref:
+            text = f'{text} {translate(ref_template).format(ref=self.ref)}'
+        return text
+
+    def __repr__(self):
+        return f'Message({self.rule!r}, {self.code!r}, ref={self.ref!r}, **{self.params})'
+
+    def __eq__(self, other):
+        if isinstance(other, Message):
+            return self.key == other.key
+        if isinstance(other, str):
+            return str(self) == other
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(str(self))
+
+
+REQUIRED_MSG = Message('required', REQUIRED_ERROR)
+NOT_REQUIRED_MSG = Message('required', NOT_REQUIRED_ERROR)
+APPLICABLE_MSG = Message('applicable', APPLICABLE_ERROR)
+NOT_APPLICABLE_MSG = Message('applicable', NOT_APPLICABLE_ERROR)
+M2M_REQUIRED_MSG = Message('m2m', REQUIRED_ERROR)
+M2M_NOT_REQUIRED_MSG = Message('m2m', NOT_REQUIRED_ERROR)
+M2M_APPLICABLE_MSG = Message('m2m_other', APPLICABLE_ERROR)
+M2M_NOT_APPLICABLE_MSG = Message('m2m_other', NOT_APPLICABLE_ERROR)
+YES_NO_REQUIRED_MSG = Message('yes_no', REQUIRED_ERROR)
+YES_NO_NOT_REQUIRED_MSG = Message('yes_no', NOT_REQUIRED_ERROR)
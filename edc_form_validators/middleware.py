@@ -0,0 +1,33 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from .context import validation_context
+
+
+class ValidationContextMiddleware:
+    """Sets a new ValidationContext for each request so that the
+    form validators of the request share subject level facts.
+
+    Add 'edc_form_validators.middleware.ValidationContextMiddleware'
+    to settings.MIDDLEWARE.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        with validation_context() as context:
+            request.validation_context = context
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        with validation_context() as context:
+            request.validation_context = context
+            return await self.get_response(request)
@@ -0,0 +1,4 @@
+from django.conf import settings
+
+if getattr(settings, 'APP_NAME', None) == 'edc_form_validators':
+    from .tests import models
@@ -1,14 +1,15 @@
-from django.forms import ValidationError
 from edc_constants.constants import OTHER
 
-from .base_form_validator import BaseFormValidator, NOT_REQUIRED_ERROR, REQUIRED_ERROR
+from .core import CoreValidator, rule_method, NOT_REQUIRED_ERROR, REQUIRED_ERROR
+from .messages import Message
 
 
-class OtherSpecifyFieldValidator(BaseFormValidator):
+class OtherSpecifyFieldValidator(CoreValidator):
     """A modelform mixin that handles 'OTHER/Other specify'
     field pattern.
     """
 
+    @rule_method
     def validate_other_specify(self, field, other_specify_field=None,
                                required_msg=None, not_required_msg=None,
                                other_stored_value=None,
@@ -22,24 +23,16 @@ class OtherSpecifyFieldValidator(BaseFormValidator):
         if not other_specify_field:
             other_specify_field = f'{field}_other'
 
-        if (cleaned_data.get(field)
-                and cleaned_data.get(field) == other
-                and not cleaned_data.get(other_specify_field)):
-            ref = '' if not ref else f' ref: {ref}'
+        value = cleaned_data.get(field)
+        other_specify_value = cleaned_data.get(other_specify_field)
+        if value and value == other and not other_specify_value:
             message = {
                 other_specify_field:
-                required_msg or f'This field is required.{ref}'}
-            self._errors.update(message)
-            self._error_codes.append(REQUIRED_ERROR)
-            raise ValidationError(message, code=REQUIRED_ERROR)
-        elif (cleaned_data.get(field)
-                and cleaned_data.get(field) != other
-                and cleaned_data.get(other_specify_field)):
-            ref = '' if not ref else f' ref: {ref}'
+                required_msg or Message('required', REQUIRED_ERROR, ref=ref)}
+            return self.raise_validation_error(message, REQUIRED_ERROR)
+        elif value and value != other and other_specify_value:
             message = {
                 other_specify_field:
-                not_required_msg or f'This field is not required.{ref}'}
-            self._errors.update(message)
-            self._error_codes.append(NOT_REQUIRED_ERROR)
-            raise ValidationError(message, code=NOT_REQUIRED_ERROR)
+                not_required_msg or Message('required', NOT_REQUIRED_ERROR, ref=ref)}
+            return self.raise_validation_error(message, NOT_REQUIRED_ERROR)
         return False
@@ -0,0 +1,200 @@
+from django.db.models import Count, Q
+
+from edc_constants.constants import DWTA, NOT_APPLICABLE, OTHER
+
+from .core import APPLICABLE_ERROR, NOT_APPLICABLE_ERROR, NOT_REQUIRED_ERROR, REQUIRED_ERROR
+from .core import InvalidModelFormFieldValidator
+
+
+class Lookups:
+    """Builds the Q objects shared by the translations.
+
+    A value is blank if NULL or, where the model field allows empty
+    strings, ''. Unlike in python, 0 and False are not blank.
+    """
+
+    def __init__(self, model=None):
+        self.model = model
+
+    def blank(self, name):
+        q = Q(**{f'{name}__isnull': True})
+        if self.model is None or self.model._meta.get_field(name).empty_strings_allowed:
+            q |= Q(**{name: ''})
+        return q
+
+    def blank_or_na(self, name):
+        return self.blank(name) | Q(**{name: NOT_APPLICABLE})
+
+    @staticmethod
+    def is_in(name, responses):
+        values = [r for r in responses if r is not None]
+        q = Q(**{f'{name}__in': values})
+        if len(values) < len(responses):
+            q |= Q(**{f'{name}__isnull': True})
+        return q
+
+    @staticmethod
+    def skip(name, responses, optional_if_dwta=None, optional_if_na=None):
+        """Returns a Q of the rows a required rule skips or None.
+        """
+        skipped = [value for value, optional in [(DWTA, optional_if_dwta),
+                                                 (NOT_APPLICABLE, optional_if_na)]
+                   if optional and value in responses]
+        return Q(**{f'{name}__in': skipped}) if skipped else None
+
+
+def unless(q, skip):
+    return q if skip is None else q & ~skip
+
+
+def required_if(lookups, responses, field=None, field_required=None,
+                optional_if_dwta=None, optional_if_na=None, inverse=None, **kwargs):
+    skip = lookups.skip(field, responses, optional_if_dwta, optional_if_na)
+    in_responses = lookups.is_in(field, responses)
+    required_blank = lookups.blank_or_na(field_required)
+    conditions = [
+        (field_required, unless(in_responses & required_blank, skip), REQUIRED_ERROR)]
+    if inverse:
+        conditions.append(
+            (field_required, unless(~in_responses & ~required_blank, skip), NOT_REQUIRED_ERROR))
+    return conditions
+
+
+def required_if_not_none(lookups, field=None, field_required=None,
+                         optional_if_dwta=None, **kwargs):
+    condition = Q(**{f'{field}__isnull': False})
+    if optional_if_dwta:
+        condition &= ~Q(**{field: DWTA})
+    return [
+        (field_required, condition & lookups.blank(field_required), REQUIRED_ERROR),
+        (field_required, ~condition & ~lookups.blank_or_na(field_required),
+         NOT_REQUIRED_ERROR)]
+
+
+def not_required_if(lookups, responses, field=None, field_required=None,
+                    optional_if_dwta=None, inverse=None, **kwargs):
+    skip = lookups.skip(field, responses, optional_if_dwta)
+    in_responses = lookups.is_in(field, responses)
+    required_blank = lookups.blank_or_na(field_required)
+    conditions = [
+        (field_required, unless(in_responses & ~required_blank, skip), NOT_REQUIRED_ERROR)]
+    if inverse:
+        conditions.append(
+            (field_required, unless(~in_responses & required_blank, skip), REQUIRED_ERROR))
+    return conditions
+
+
+def applicable(lookups, *responses, field=None, field_applicable=None):
+    in_responses = lookups.is_in(field, responses)
+    is_na = Q(**{field_applicable: NOT_APPLICABLE})
+    return [
+        (field_applicable, in_responses & is_na, APPLICABLE_ERROR),
+        (field_applicable, ~in_responses & ~is_na, NOT_APPLICABLE_ERROR)]
+
+
+def not_applicable(lookups, *responses, field=None, field_applicable=None):
+    in_responses = lookups.is_in(field, responses)
+    is_na = Q(**{field_applicable: NOT_APPLICABLE})
+    return [
+        (field_applicable, in_responses & ~is_na, NOT_APPLICABLE_ERROR),
+        (field_applicable, ~in_responses & is_na, NOT_APPLICABLE_ERROR)]
+
+
+def not_applicable_only_if(lookups, *responses, field=None, field_applicable=None):
+    return [(field_applicable,
+             lookups.is_in(field, responses) & ~lookups.blank(field_applicable),
+             NOT_APPLICABLE_ERROR)]
+
+
+def validate_other_specify(lookups, field, other_specify_field=None,
+                           other_stored_value=None, **kwargs):
+    other = Q(**{field: other_stored_value or OTHER})
+    answered = ~lookups.blank(field)
+    other_blank = lookups.blank(other_specify_field)
+    return [
+        (other_specify_field, other & other_blank, REQUIRED_ERROR),
+        (other_specify_field, answered & ~other & ~other_blank, NOT_REQUIRED_ERROR)]
+
+
+def require_together(lookups, field=None, field_required=None, **kwargs):
+    value_null = Q(**{f'{field}__isnull': True})
+    required_null = Q(**{f'{field_required}__isnull': True})
+    return [
+        (field_required, ~value_null & required_null, REQUIRED_ERROR),
+        (field_required, value_null & ~required_null, NOT_REQUIRED_ERROR)]
+
+
+class QueryValidator:
+    """Translates declared rules into Q objects to find the rows
+    that fail them in the database.
+
+    For example:
+
+        query_validator = QueryValidator(CrfOneFormValidator, model=CrfOne)
+        CrfOne.objects.filter(query_validator.violates())
+        query_validator.counts(CrfOne.objects.all())  # {('f2', 'required'): 12}
+
+    Rows are matched as if validated with `collect_errors=True`, see
+    `Lookups` for what is blank. M2M rules cannot be translated.
+    """
+
+    translations = {
+        '_required_if': required_if,
+        '_not_required_if': not_required_if,
+        'required_if_not_none': required_if_not_none,
+        'applicable': applicable,
+        'not_applicable': not_applicable,
+        'not_applicable_only_if': not_applicable_only_if,
+        'validate_other_specify': validate_other_specify,
+        'require_together': require_together,
+    }
+
+    def __init__(self, form_validator_cls=None, rules=None, model=None):
+        self.rules = form_validator_cls.rules if rules is None else rules
+        self.lookups = Lookups(model=model)
+        self.conditions = []
+        for rule in self.rules:
+            self.conditions.extend(self.translate(rule))
+
+    def translate(self, rule):
+        """Returns a list of (field, Q, code) for the rule.
+        """
+        if rule.method_name == '_gate':
+            gate = self.lookups.is_in(rule.kwargs['field'], rule.args)
+            return [(field, gate & q, code)
+                    for nested in rule.rules for field, q, code in self.translate(nested)]
+        try:
+            translation = self.translations[rule.method_name]
+        except KeyError:
+            raise InvalidModelFormFieldValidator(
+                f'{repr(rule)}. Rule cannot be translated to a query.')
+        return translation(self.lookups, *rule.args, **rule.kwargs)
+
+    def violates(self):
+        """Returns a Q of the rows that fail any rule.
+        """
+        q = Q(pk__in=[])
+        for _, condition, _ in self.conditions:
+            q |= condition
+        return q
+
+    def counts(self, queryset):
+        """Returns {(field, code): number of rows that fail} in
+        one query.
+        """
+        conditions = {}
+        for field, condition, code in self.conditions:
+            key = (field, code)
+            conditions[key] = conditions[key] | condition if key in conditions else condition
+        keys = list(conditions)
+        values = queryset.aggregate(**{
+            f'c{i}': Count('pk', filter=conditions[key]) for i, key in enumerate(keys)})
+        return {key: values[f'c{i}'] for i, key in enumerate(keys)}
+
+
+def violates(rule, model=None):
+    """Returns a Q of the rows that fail the rule, e.g.
+
+        CrfOne.objects.filter(violates(RequiredIf(YES, field='f1', field_required='f2')))
+    """
+    return QueryValidator(rules=[rule], model=model).violates()
@@ -0,0 +1,157 @@
+"""A streaming data quality report of one record per failure.
+
+    from edc_form_validators.report import report_records, write_report
+
+    records = report_records(CrfOneFormValidator, queryset=CrfOne.objects.all())
+    write_report(records, 'crf_one.csv', 'csv')
+
+Rows are validated in chunks and records are written as they are
+found so memory does not grow with the number of rows.
+"""
+import csv
+import json
+
+from collections import namedtuple
+from collections.abc import Mapping
+
+from .revalidate import chunked
+
+REPORT_FIELDS = ['key', 'field', 'code', 'message']
+
+
+class ReportRecord(namedtuple('ReportRecord', REPORT_FIELDS)):
+    """One failure. `key` is the row's pk or position.
+    """
+
+    __slots__ = ()
+
+
+def report_records(form_validator_cls, rows=None, queryset=None, chunk_size=None,
+                   codes=None):
+    """Yields a ReportRecord for each failure in rows, cleaned_data
+    dictionaries, or in the model instances of queryset.
+
+    The queryset is read with `iterator`, i.e. a server-side cursor
+    where the database supports one, with its foreign keys selected
+    and many-to-many fields prefetched per chunk so that rows are not
+    queried one at a time. If `codes` is given, only failures with
+    those codes are reported.
+    """
+    chunk_size = chunk_size or 1000
+    if queryset is not None:
+        rows = related(queryset).iterator(chunk_size=chunk_size)
+    start = 0
+    for chunk in chunked(rows, chunk_size):
+        for result in form_validator_cls.validate_many(chunk):
+            row = chunk[result.index]
+            key = start + result.index if isinstance(row, Mapping) else row.pk
+            for field, message, code in result.violations:
+                if codes and code not in codes:
+                    continue
+                yield ReportRecord(key, field, code, str(message))
+        start += len(chunk)
+
+
+def related(queryset):
+    """Returns the queryset with the model's foreign keys selected
+    and many-to-many fields prefetched unless already set.
+    """
+    opts = queryset.model._meta
+    if queryset.query.select_related is False:
+        foreign_keys = [f.name for f in opts.concrete_fields if f.is_relation]
+        if foreign_keys:
+            queryset = queryset.select_related(*foreign_keys)
+    if not queryset._prefetch_related_lookups:
+        many_to_many = [f.name for f in opts.many_to_many]
+        if many_to_many:
+            queryset = queryset.prefetch_related(*many_to_many)
+    return queryset
+
+
+class JsonlReportWriter:
+
+    def __init__(self, f):
+        self.f = f
+
+    def write(self, record):
+        self.f.write(json.dumps(record._asdict(), default=str) + '\n')
+
+    def close(self):
+        pass
+
+
+class CsvReportWriter:
+
+    def __init__(self, f):
+        self.writer = csv.writer(f)
+        self.writer.writerow(REPORT_FIELDS)
+
+    def write(self, record):
+        self.writer.writerow(record)
+
+    def close(self):
+        pass
+
+
+class ParquetReportWriter:
+    """Writes a row group per `batch_size` records. Requires pyarrow.
+    """
+
+    binary = True
+
+    def __init__(self, f, batch_size=None):
+        # pyarrow is an optional dependency, see setup.py extras
+        import pyarrow
+        import pyarrow.parquet
+        self.pyarrow = pyarrow
+        self.schema = pyarrow.schema([(name, pyarrow.string()) for name in REPORT_FIELDS])
+        self.writer = pyarrow.parquet.ParquetWriter(f, self.schema)
+        self.batch_size = batch_size or 10000
+        self.batch = []
+
+    def write(self, record):
+        self.batch.append(record)
+        if len(self.batch) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self.batch:
+            columns = [[str(value) for value in column] for column in zip(*self.batch)]
+            self.writer.write_table(
+                self.pyarrow.Table.from_arrays(columns, schema=self.schema))
+            self.batch = []
+
+    def close(self):
+        self.flush()
+        self.writer.close()
+
+
+report_writers = {
+    'jsonl': JsonlReportWriter,
+    'csv': CsvReportWriter,
+    'parquet': ParquetReportWriter,
+}
+
+
+def write_report(records, path, format=None):
+    """Writes records to path as jsonl, csv or parquet and returns
+    the number written.
+    """
+    writer_cls = report_writers[format or 'jsonl']
+    binary = getattr(writer_cls, 'binary', False)
+    with open(path, 'wb' if binary else 'w', newline=None if binary else '') as f:
+        return write_records(records, writer_cls(f))
+
+
+def write_records(records, writer):
+    """Writes records with writer, closes the writer and returns the
+    number written.
+    """
+    count = 0
+    try:
+        for record in records:
+            writer.write(record)
+            count += 1
+    finally:
+        writer.close()
+    return count
@@ -1,12 +1,13 @@
-from django.forms import ValidationError
 from edc_constants.constants import DWTA, NOT_APPLICABLE
 
-from .base_form_validator import BaseFormValidator, InvalidModelFormFieldValidator
-from .base_form_validator import REQUIRED_ERROR, NOT_REQUIRED_ERROR
+from .core import CoreValidator, rule_method, InvalidModelFormFieldValidator
+from .core import REQUIRED_ERROR, NOT_REQUIRED_ERROR
+from .messages import REQUIRED_MSG, NOT_REQUIRED_MSG
 
 
-class RequiredFieldValidator(BaseFormValidator):
+class RequiredFieldValidator(CoreValidator):
 
+    @rule_method
     def required_if(self, *responses, field=None, field_required=None,
                     required_msg=None, not_required_msg=None,
                     optional_if_dwta=None, optional_if_na=None,
@@ -16,57 +17,61 @@ class RequiredFieldValidator(BaseFormValidator):
 
         if field in responses then field_required is required.
         """
-        inverse = True if inverse is None else inverse
         self._inspect_params(
             *responses, field=field, field_required=field_required)
-        if field in self.cleaned_data:
-            if (DWTA in responses and optional_if_dwta
-                    and self.cleaned_data.get(field) == DWTA):
+        return self._required_if(
+            responses, field=field, field_required=field_required,
+            required_message={
+                field_required: required_msg or REQUIRED_MSG},
+            not_required_message={
+                field_required: not_required_msg or NOT_REQUIRED_MSG},
+            optional_if_dwta=optional_if_dwta, optional_if_na=optional_if_na,
+            inverse=True if inverse is None else inverse)
+
+    def _required_if(self, responses, field=None, field_required=None,
+                     required_message=None, not_required_message=None,
+                     optional_if_dwta=None, optional_if_na=None, inverse=None):
+        """Same as `required_if` but params are not inspected and
+        messages are already built.
+        """
+        cleaned_data = self.cleaned_data
+        if field in cleaned_data:
+            value = cleaned_data[field]
+            required_value = cleaned_data.get(field_required)
+            if optional_if_dwta and value == DWTA and DWTA in responses:
                 pass
-            elif (NOT_APPLICABLE in responses and optional_if_na
-                    and self.cleaned_data.get(field) == NOT_APPLICABLE):
+            elif (optional_if_na and value == NOT_APPLICABLE
+                    and NOT_APPLICABLE in responses):
                 pass
-            elif (self.cleaned_data.get(field) in responses
-                    and (not self.cleaned_data.get(field_required)
-                         or self.cleaned_data.get(field_required) == NOT_APPLICABLE)):
-                message = {
-                    field_required: required_msg or 'This field is required.'}
-                self._errors.update(message)
-                self._error_codes.append(REQUIRED_ERROR)
-                raise ValidationError(message, code=REQUIRED_ERROR)
-            elif inverse and (self.cleaned_data.get(field) not in responses
-                              and (self.cleaned_data.get(field_required)
-                                   and self.cleaned_data.get(field_required) != NOT_APPLICABLE)):
-                message = {
-                    field_required: not_required_msg or 'This field is not required.'}
-                self._errors.update(message)
-                self._error_codes.append(NOT_REQUIRED_ERROR)
-                raise ValidationError(message, code=NOT_REQUIRED_ERROR)
+            elif value in responses:
+                if not required_value or required_value == NOT_APPLICABLE:
+                    return self.raise_validation_error(required_message, REQUIRED_ERROR)
+            elif inverse and required_value and required_value != NOT_APPLICABLE:
+                return self.raise_validation_error(not_required_message, NOT_REQUIRED_ERROR)
         return False
 
+    @rule_method
     def required_if_true(self, condition, field_required=None,
                          required_msg=None, not_required_msg=None,
                          code=None, inverse=None, **kwargs):
         inverse = True if inverse is None else inverse
         if not field_required:
             raise InvalidModelFormFieldValidator('The required field cannot be None.')
-        if self.cleaned_data and field_required in self.cleaned_data:
-            if (condition and (not self.cleaned_data.get(field_required)
-                               and (not self.cleaned_data.get(field_required) == 0)
-                               or self.cleaned_data.get(field_required) == NOT_APPLICABLE)):
+        cleaned_data = self.cleaned_data
+        if cleaned_data and field_required in cleaned_data:
+            required_value = cleaned_data[field_required]
+            if (condition and ((not required_value and not required_value == 0)
+                               or required_value == NOT_APPLICABLE)):
                 message = {
-                    field_required: required_msg or 'This field is required.'}
-                self._errors.update(message)
-                self._error_codes.append(REQUIRED_ERROR)
-                raise ValidationError(message, code=REQUIRED_ERROR)
-            elif inverse and (not condition and self.cleaned_data.get(field_required)
-                              and self.cleaned_data.get(field_required) != NOT_APPLICABLE):
+                    field_required: required_msg or REQUIRED_MSG}
+                return self.raise_validation_error(message, REQUIRED_ERROR)
+            elif inverse and (not condition and required_value
+                              and required_value != NOT_APPLICABLE):
                 message = {
-                    field_required: not_required_msg or 'This field is not required.'}
-                self._errors.update(message)
-                self._error_codes.append(NOT_REQUIRED_ERROR)
-                raise ValidationError(message, code=NOT_REQUIRED_ERROR)
+                    field_required: not_required_msg or NOT_REQUIRED_MSG}
+                return self.raise_validation_error(message, NOT_REQUIRED_ERROR)
 
+    @rule_method
     def required_if_not_none(self, field=None, field_required=None,
                              required_msg=None, not_required_msg=None,
                              optional_if_dwta=None, **kwargs):
@@ -76,24 +81,23 @@ class RequiredFieldValidator(BaseFormValidator):
         """
         if not field_required:
             raise InvalidModelFormFieldValidator('The required field cannot be None.')
-        if optional_if_dwta and self.cleaned_data.get(field) == DWTA:
+        value = self.cleaned_data.get(field)
+        required_value = self.cleaned_data.get(field_required)
+        if optional_if_dwta and value == DWTA:
             condition = None
         else:
-            condition = self.cleaned_data.get(field) is not None
-        if condition and not self.cleaned_data.get(field_required):
+            condition = value is not None
+        if condition and not required_value:
             message = {
-                field_required: required_msg or 'This field is required.'}
-            self._errors.update(message)
-            self._error_codes.append(REQUIRED_ERROR)
-            raise ValidationError(message, code=REQUIRED_ERROR)
-        elif (not condition and self.cleaned_data.get(field_required)
-              and self.cleaned_data.get(field_required) != NOT_APPLICABLE):
+                field_required: required_msg or REQUIRED_MSG}
+            return self.raise_validation_error(message, REQUIRED_ERROR)
+        elif (not condition and required_value
+              and required_value != NOT_APPLICABLE):
             message = {
-                field_required: not_required_msg or 'This field is not required.'}
-            self._errors.update(message)
-            self._error_codes.append(NOT_REQUIRED_ERROR)
-            raise ValidationError(message, code=NOT_REQUIRED_ERROR)
+                field_required: not_required_msg or NOT_REQUIRED_MSG}
+            return self.raise_validation_error(message, NOT_REQUIRED_ERROR)
 
+    @rule_method
     def not_required_if(self, *responses, field=None, field_required=None,
                         required_msg=None, not_required_msg=None,
                         optional_if_dwta=None, inverse=None, code=None, **kwargs):
@@ -101,48 +105,53 @@ class RequiredFieldValidator(BaseFormValidator):
 
         if field NOT in responses then field_required is required.
         """
-        inverse = True if inverse is None else inverse
         self._inspect_params(
             *responses, field=field, field_required=field_required)
-        if field in self.cleaned_data and field_required in self.cleaned_data:
-            if (DWTA in responses and optional_if_dwta
-                    and self.cleaned_data.get(field) == DWTA):
+        return self._not_required_if(
+            responses, field=field, field_required=field_required,
+            required_message={
+                field_required: required_msg or REQUIRED_MSG},
+            not_required_message={
+                field_required: not_required_msg or NOT_REQUIRED_MSG},
+            optional_if_dwta=optional_if_dwta,
+            inverse=True if inverse is None else inverse)
+
+    def _not_required_if(self, responses, field=None, field_required=None,
+                         required_message=None, not_required_message=None,
+                         optional_if_dwta=None, inverse=None):
+        """Same as `not_required_if` but params are not inspected and
+        messages are already built.
+        """
+        cleaned_data = self.cleaned_data
+        if field in cleaned_data and field_required in cleaned_data:
+            value = cleaned_data[field]
+            required_value = cleaned_data[field_required]
+            if optional_if_dwta and value == DWTA and DWTA in responses:
                 pass
-            elif (self.cleaned_data.get(field) in responses
-                    and (self.cleaned_data.get(field_required)
-                         and self.cleaned_data.get(field_required) != NOT_APPLICABLE)):
-                message = {
-                    field_required: not_required_msg or 'This field is not required.'}
-                self._errors.update(message)
-                self._error_codes.append(NOT_REQUIRED_ERROR)
-                raise ValidationError(message, code=NOT_REQUIRED_ERROR)
-            elif inverse and (self.cleaned_data.get(field) not in responses
-                              and (not self.cleaned_data.get(field_required)
-                                   or self.cleaned_data.get(field_required) == NOT_APPLICABLE)):
-                message = {
-                    field_required: required_msg or 'This field is required.'}
-                self._errors.update(message)
-                self._error_codes.append(REQUIRED_ERROR)
-                raise ValidationError(message, code=REQUIRED_ERROR)
+            elif value in responses:
+                if required_value and required_value != NOT_APPLICABLE:
+                    return self.raise_validation_error(not_required_message, NOT_REQUIRED_ERROR)
+            elif inverse and (not required_value or required_value == NOT_APPLICABLE):
+                return self.raise_validation_error(required_message, REQUIRED_ERROR)
         return False
 
+    @rule_method
     def require_together(self, field=None, field_required=None, required_msg=None):
         """Required b if a. Do not require b if not a.
         """
-        if (self.cleaned_data.get(field) is not None and self.cleaned_data.get(field_required) is None):
+        value = self.cleaned_data.get(field)
+        required_value = self.cleaned_data.get(field_required)
+        if value is not None and required_value is None:
             message = {
-                field_required: required_msg or 'This field is required.'}
-            self._errors.update(message)
-            self._error_codes.append(REQUIRED_ERROR)
-            raise ValidationError(message, code=REQUIRED_ERROR)
-        elif (self.cleaned_data.get(field) is None and self.cleaned_data.get(field_required) is not None):
+                field_required: required_msg or REQUIRED_MSG}
+            return self.raise_validation_error(message, REQUIRED_ERROR)
+        elif value is None and required_value is not None:
             message = {
-                field_required: required_msg or 'This field is not required.'}
-            self._errors.update(message)
-            self._error_codes.append(NOT_REQUIRED_ERROR)
-            raise ValidationError(message, code=NOT_REQUIRED_ERROR)
+                field_required: required_msg or NOT_REQUIRED_MSG}
+            return self.raise_validation_error(message, NOT_REQUIRED_ERROR)
 
-    def _inspect_params(self, *responses, field=None, field_required=None):
+    @staticmethod
+    def _inspect_params(*responses, field=None, field_required=None):
         """Inspects params and raises if any are None.
         """
         if not field:
@@ -0,0 +1,104 @@
+import hashlib
+import pickle
+
+from collections import OrderedDict
+from datetime import date, datetime, time
+from decimal import Decimal
+from io import BytesIO
+from threading import Lock
+from uuid import UUID
+
+
+class NotFingerprintable(Exception):
+    pass
+
+
+class ResultCache:
+    """A process-wide, bounded LRU cache of validation outcomes.
+
+    Has the `get`, `set`, `aget` and `aset` of django's cache API so
+    either may be set as a form validator's `result_cache`.
+    """
+
+    def __init__(self, maxsize=None):
+        self.maxsize = maxsize or 1024
+        self._results = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                self._results.move_to_end(key)
+            except KeyError:
+                return default
+            return self._results[key]
+
+    def set(self, key, value, timeout=None):
+        with self._lock:
+            self._results[key] = value
+            self._results.move_to_end(key)
+            while len(self._results) > self.maxsize:
+                self._results.popitem(last=False)
+
+    async def aget(self, key, default=None):
+        return self.get(key, default)
+
+    async def aset(self, key, value, timeout=None):
+        self.set(key, value, timeout)
+
+    def clear(self):
+        with self._lock:
+            self._results.clear()
+
+    def __len__(self):
+        return len(self._results)
+
+
+# types pickled the same for equal values
+SIMPLE_TYPES = {str, int, float, bool, type(None), Decimal, UUID, date, datetime, time}
+
+
+def canonical(value, database=False):
+    """Returns value, or for lists, model instances and querysets
+    a form of value of simple types.
+
+    Model instances and querysets are only accepted, by pk, if
+    `database` is True. Raises NotFingerprintable otherwise.
+    """
+    if type(value) in SIMPLE_TYPES:
+        return value
+    if isinstance(value, (list, tuple)):
+        return ('list', tuple(canonical(v, database) for v in value))
+    if database:
+        # imported here, see test_imports
+        from django.db.models import Model, QuerySet
+        if isinstance(value, Model):
+            return ('model', value._meta.label_lower, canonical(value.pk))
+        if isinstance(value, QuerySet):
+            return ('queryset', value.model._meta.label_lower,
+                    tuple(sorted(value.values_list('pk', flat=True))))
+    raise NotFingerprintable(type(value).__name__)
+
+
+def fingerprint(*parts, database=False):
+    """Returns a hex digest of the canonical form of parts, e.g.
+    fingerprint(cleaned_data).
+
+    Dictionaries are hashed in key order. Pickled without the memo
+    so equal values give equal bytes.
+    """
+    canonical_parts = []
+    for part in parts:
+        if isinstance(part, dict):
+            if all(type(v) in SIMPLE_TYPES for v in part.values()):
+                part = ('dict', sorted(part.items()))
+            else:
+                part = ('dict', sorted((k, canonical(v, database)) for k, v in part.items()))
+        else:
+            part = canonical(part, database)
+        canonical_parts.append(part)
+    f = BytesIO()
+    pickler = pickle.Pickler(f, protocol=4)
+    pickler.fast = True
+    pickler.dump(canonical_parts)
+    return hashlib.sha256(f.getvalue()).hexdigest()
@@ -0,0 +1,149 @@
+import csv
+import json
+import multiprocessing
+import os
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from django.apps import apps as django_apps
+from django.core.exceptions import ValidationError
+
+from .messages import Message
+from .site import site_form_validators
+
+
+def read_csv(path):
+    """Yields a dictionary per row of a CSV file with a header.
+
+    Empty values are read as None.
+    """
+    with open(path, newline='') as f:
+        for row in csv.DictReader(f):
+            yield {k: (None if v == '' else v) for k, v in row.items()}
+
+
+def read_jsonl(path):
+    """Yields a dictionary per line of a JSON lines file.
+    """
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def chunked(iterable, size):
+    """Yields lists of at most `size` items.
+    """
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def pk_ranges(queryset, size):
+    """Yields (first_pk, last_pk) ranges of at most `size` rows
+    ordered by pk.
+    """
+    pks = queryset.order_by('pk').values_list('pk', flat=True).iterator()
+    for chunk in chunked(pks, size):
+        yield chunk[0], chunk[-1]
+
+
+def error_report(result, key=None):
+    """Returns a JSON serializable dictionary for an invalid
+    ValidationResult.
+    """
+    errors = {}
+    for field, message in result.errors.items():
+        if isinstance(message, (str, Message)):
+            errors[field] = str(message)
+        else:
+            errors[field] = ValidationError(message).messages
+    return dict(
+        index=result.index if key is None else key,
+        errors=errors,
+        error_codes=result.error_codes)
+
+
+def validate_rows(form_validator_path, start, rows):
+    """Returns the number of rows and error reports for the invalid
+    rows of one chunk.
+    """
+    form_validator_cls = site_form_validators.get_or_import(form_validator_path)
+    return len(rows), [error_report(result, key=start + result.index)
+                       for result in form_validator_cls.validate_many(rows)
+                       if not result.is_valid]
+
+
+def validate_pk_range(form_validator_path, model, first_pk, last_pk):
+    """Returns the number of instances and error reports, keyed by pk,
+    for the invalid model instances in the pk range.
+    """
+    form_validator_cls = site_form_validators.get_or_import(form_validator_path)
+    instances = list(django_apps.get_model(model).objects.filter(
+        pk__gte=first_pk, pk__lte=last_pk).order_by('pk'))
+    return len(instances), [error_report(result, key=instances[result.index].pk)
+                            for result in form_validator_cls.validate_many(instances)
+                            if not result.is_valid]
+
+
+def init_worker():
+    if not django_apps.ready:
+        import django
+        django.setup()
+
+
+def revalidate(form_validator_path, rows=None, model=None, chunk_size=None,
+               workers=None, progress=None):
+    """Yields an error report for each invalid row or model instance.
+
+    Either `rows`, an iterable of cleaned_data dictionaries, or `model`,
+    a model label, e.g. 'my_app.crfone', is required. Chunks of
+    `chunk_size` rows are validated on a pool of `workers` processes
+    and reports are yielded in input order. Rows are keyed by position
+    and model instances by pk.
+
+    `progress`, if given, is called with the number of rows validated
+    so far after each chunk.
+    """
+    chunk_size = chunk_size or 1000
+    workers = workers or os.cpu_count()
+    if model:
+        tasks = ((validate_pk_range, form_validator_path, model, first_pk, last_pk)
+                 for first_pk, last_pk in pk_ranges(
+                     django_apps.get_model(model).objects.all(), chunk_size))
+    else:
+        tasks = ((validate_rows, form_validator_path, index * chunk_size, chunk)
+                 for index, chunk in enumerate(chunked(rows, chunk_size)))
+    if workers == 1:
+        results = (func(*args) for func, *args in tasks)
+    else:
+        results = run_in_pool(tasks, workers)
+    done = 0
+    for count, reports in results:
+        done += count
+        if progress:
+            progress(done)
+        yield from reports
+
+
+def run_in_pool(tasks, workers):
+    """Yields the results of tasks run on a process pool in the
+    order submitted, keeping a bounded number of tasks in flight.
+
+    Workers are spawned, not forked, so no DB connections are shared
+    with the parent process.
+    """
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                             mp_context=multiprocessing.get_context('spawn')) as executor:
+        pending = deque()
+        for func, *args in tasks:
+            pending.append(executor.submit(func, *args))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
@@ -0,0 +1,245 @@
+from .core import InvalidModelFormFieldValidator, NOT_REQUIRED_ERROR, REQUIRED_ERROR
+from .messages import Message, REQUIRED_MSG, NOT_REQUIRED_MSG
+from .required_field_validator import RequiredFieldValidator
+
+
+class Rule:
+    """A rule declared in `FormValidator.rules`.
+
+    Params are checked when the rule is declared. The rule is
+    compiled once per FormValidator class into a call to
+    `method_name` with the rule's args and kwargs.
+
+    `requires_fields` are the fields that must all be in cleaned_data
+    for the rule to raise. If the first is not, the rule is skipped.
+
+    `fields` are all the fields the rule reads.
+    """
+
+    method_name = None
+    requires_fields = ()
+    field_kwargs = ('field', 'field_required', 'field_applicable',
+                    'm2m_field', 'field_other', 'other_specify_field')
+
+    def __init__(self, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}(*{self.args}, **{self.kwargs})'
+
+    @property
+    def fields(self):
+        return tuple(self.kwargs[k] for k in self.field_kwargs if self.kwargs.get(k))
+
+    def compile(self, form_validator_cls):
+        """Returns a tuple of (function, args, kwargs) to be called
+        with the form validator instance as the first arg.
+        """
+        try:
+            func = getattr(form_validator_cls, self.method_name)
+        except AttributeError:
+            raise InvalidModelFormFieldValidator(
+                f'{repr(self)}. {form_validator_cls.__name__} has no '
+                f'method \'{self.method_name}\'')
+        return func, self.args, self.kwargs
+
+
+class RequiredIf(Rule):
+
+    method_name = '_required_if'
+
+    def __init__(self, *responses, field=None, field_required=None,
+                 required_msg=None, not_required_msg=None,
+                 optional_if_dwta=None, optional_if_na=None, inverse=None):
+        RequiredFieldValidator._inspect_params(
+            *responses, field=field, field_required=field_required)
+        super().__init__(
+            responses, field=field, field_required=field_required,
+            required_message={
+                field_required: required_msg or REQUIRED_MSG},
+            not_required_message={
+                field_required: not_required_msg or NOT_REQUIRED_MSG},
+            optional_if_dwta=optional_if_dwta, optional_if_na=optional_if_na,
+            inverse=True if inverse is None else inverse)
+        self.requires_fields = (field, )
+
+
+class NotRequiredIf(Rule):
+
+    method_name = '_not_required_if'
+
+    def __init__(self, *responses, field=None, field_required=None,
+                 required_msg=None, not_required_msg=None,
+                 optional_if_dwta=None, inverse=None):
+        RequiredFieldValidator._inspect_params(
+            *responses, field=field, field_required=field_required)
+        super().__init__(
+            responses, field=field, field_required=field_required,
+            required_message={
+                field_required: required_msg or REQUIRED_MSG},
+            not_required_message={
+                field_required: not_required_msg or NOT_REQUIRED_MSG},
+            optional_if_dwta=optional_if_dwta,
+            inverse=True if inverse is None else inverse)
+        self.requires_fields = (field, field_required)
+
+
+class RequiredIfNotNone(Rule):
+
+    method_name = 'required_if_not_none'
+
+    def __init__(self, field=None, field_required=None, required_msg=None,
+                 not_required_msg=None, optional_if_dwta=None):
+        if not field_required:
+            raise InvalidModelFormFieldValidator('The required field cannot be None.')
+        super().__init__(
+            field=field, field_required=field_required,
+            required_msg=required_msg, not_required_msg=not_required_msg,
+            optional_if_dwta=optional_if_dwta)
+
+
+class RequireTogether(Rule):
+
+    method_name = 'require_together'
+
+    def __init__(self, field=None, field_required=None, required_msg=None):
+        if not field or not field_required:
+            raise InvalidModelFormFieldValidator(
+                f'Expected field and field_required. Got {field}, {field_required}.')
+        super().__init__(
+            field=field, field_required=field_required, required_msg=required_msg)
+
+
+class ApplicableIf(Rule):
+
+    method_name = 'applicable'
+
+    def __init__(self, *responses, field=None, field_applicable=None):
+        RequiredFieldValidator._inspect_params(
+            *responses, field=field, field_required=field_applicable)
+        super().__init__(*responses, field=field, field_applicable=field_applicable)
+        self.requires_fields = (field, field_applicable)
+
+
+class NotApplicableIf(ApplicableIf):
+
+    method_name = 'not_applicable'
+
+
+class NotApplicableOnlyIf(ApplicableIf):
+
+    method_name = 'not_applicable_only_if'
+
+    def __init__(self, *responses, field=None, field_applicable=None):
+        super().__init__(*responses, field=field, field_applicable=field_applicable)
+        # a missing field may match a None response
+        self.requires_fields = ()
+
+
+class OtherSpecify(Rule):
+
+    method_name = 'validate_other_specify'
+
+    def __init__(self, field=None, other_specify_field=None,
+                 required_msg=None, not_required_msg=None,
+                 other_stored_value=None, ref=None):
+        if not field:
+            raise InvalidModelFormFieldValidator(f'{field} cannot be None.')
+        super().__init__(
+            field,
+            other_specify_field=other_specify_field or f'{field}_other',
+            required_msg=required_msg or Message('required', REQUIRED_ERROR, ref=ref),
+            not_required_msg=not_required_msg or Message(
+                'required', NOT_REQUIRED_ERROR, ref=ref),
+            other_stored_value=other_stored_value)
+        self.requires_fields = (field, )
+
+    @property
+    def fields(self):
+        return (self.args[0], self.kwargs['other_specify_field'])
+
+
+class M2MRequired(Rule):
+
+    method_name = 'm2m_required'
+
+    def __init__(self, m2m_field=None):
+        if not m2m_field:
+            raise InvalidModelFormFieldValidator(f'{m2m_field} cannot be None.')
+        super().__init__(m2m_field=m2m_field)
+
+
+class M2MRequiredIf(Rule):
+
+    method_name = 'm2m_required_if'
+
+    def __init__(self, response=None, field=None, m2m_field=None):
+        RequiredFieldValidator._inspect_params(
+            response, field=field, field_required=m2m_field)
+        super().__init__(response=response, field=field, m2m_field=m2m_field)
+
+
+class M2MSingleSelectionIf(Rule):
+
+    method_name = 'm2m_single_selection_if'
+
+    def __init__(self, *single_selections, m2m_field=None):
+        RequiredFieldValidator._inspect_params(
+            *single_selections, field=m2m_field, field_required=m2m_field)
+        super().__init__(*single_selections, m2m_field=m2m_field)
+        self.requires_fields = (m2m_field, )
+
+
+class M2MOtherSpecify(Rule):
+
+    method_name = 'm2m_other_specify'
+
+    def __init__(self, *responses, m2m_field=None, field_other=None):
+        RequiredFieldValidator._inspect_params(
+            *responses, field=m2m_field, field_required=field_other)
+        super().__init__(*responses, m2m_field=m2m_field, field_other=field_other)
+
+
+class M2MOtherSpecifyApplicable(M2MOtherSpecify):
+
+    method_name = 'm2m_other_specify_applicable'
+
+
+class Gate(Rule):
+    """Runs the nested rules only if the value of field is in
+    responses, otherwise skips them all.
+
+    For example:
+
+        Gate(YES, field='any_symptoms', rules=[
+            RequiredIf(YES, field='fever', field_required='fever_days'),
+            ...])
+    """
+
+    method_name = '_gate'
+
+    def __init__(self, *responses, field=None, rules=None):
+        RequiredFieldValidator._inspect_params(
+            *responses, field=field, field_required=field)
+        if not rules:
+            raise InvalidModelFormFieldValidator(
+                f'Expected one or more rules for gate on field \'{field}\'.')
+        super().__init__(*responses, field=field)
+        self.rules = rules
+        self.requires_fields = (field, )
+
+    def __repr__(self):
+        return f'{super().__repr__()[:-1]}, rules={self.rules})'
+
+    @property
+    def fields(self):
+        fields = [self.kwargs['field']]
+        for rule in self.rules:
+            fields.extend(rule.fields)
+        return tuple(fields)
+
+    def compile(self, form_validator_cls):
+        func, args, kwargs = super().compile(form_validator_cls)
+        plan, index = form_validator_cls.compile_rules(self.rules)
+        return func, args, dict(kwargs, plan=plan, index=index)
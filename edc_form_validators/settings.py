@@ -48,6 +48,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'edc_form_validators.middleware.ValidationContextMiddleware',
 ]
 
 ROOT_URLCONF = 'edc_form_validators.urls'
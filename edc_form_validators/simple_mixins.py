@@ -1,73 +1,156 @@
-from dateutil.relativedelta import relativedelta
-from django import forms
+import operator
+
+from functools import lru_cache
 
+from dateutil.relativedelta import relativedelta
 from edc_constants.constants import YES, NO, UNKNOWN, NOT_APPLICABLE
 
-comparison_phrase = {
-    'gt': 'must be greater than',
-    'gte': 'must be greater than or equal to',
-    'lt': 'must be less than',
-    'lte': 'must be less than or equal to',
-    'ne': 'may not equal', }
+from .context import ValidationContext, current_context
+from .core import rule_method, APPLICABLE_ERROR, INVALID_ERROR
+from .core import NOT_APPLICABLE_ERROR, NOT_REQUIRED_ERROR, REQUIRED_ERROR
+from .messages import Message, catalogue, YES_NO_REQUIRED_MSG, YES_NO_NOT_REQUIRED_MSG
+
+# op: comparison. An unknown op compares False.
+operators = {
+    'gt': operator.gt,
+    'gte': operator.ge,
+    'lt': operator.lt,
+    'lte': operator.le,
+    'ne': operator.ne,
+    'eq': operator.eq}
+
+comparison_phrase = {op: catalogue[('phrase', op)] for op in operators}
+
+# the default of args read from the context if not passed
+_from_context = object()
+
+
+def never(value1, value2):
+    return False
+
+
+def get_operator(op):
+    """Returns the comparison function for op.
+    """
+    return operators.get(op, never)
+
+
+def raise_validation_error(validator, message, error_code):
+    """Calls the validator's `raise_validation_error` or, for a class
+    that is not a CoreValidator, raises its `error_class`, if any,
+    or django's ValidationError.
+    """
+    try:
+        method = validator.raise_validation_error
+    except AttributeError:
+        error_class = getattr(validator, 'error_class', None)
+        if error_class is None:
+            # imported here, see test_imports
+            from django.core.exceptions import ValidationError as error_class
+        raise error_class(message, code=error_code)
+    return method(message, error_code)
+
+
+def get_fact(validator, name, key=None):
+    """Returns the validator's `fact` or, for a class that is not a
+    CoreValidator, the fact from the current context, if any.
+    """
+    try:
+        method = validator.fact
+    except AttributeError:
+        context = current_context.get()
+        if context is None:
+            context = ValidationContext()
+        if key is None:
+            key = validator.cleaned_data.get('subject_identifier')
+        return context.get(name, key)
+    return method(name, key)
+
+
+@lru_cache(maxsize=4096)
+def age_at(dob, reference_date):
+    """Returns the relativedelta of reference_date and dob, cached
+    per (dob, reference_date).
+    """
+    return relativedelta(reference_date, dob)
+
+
+def compare_many(values1, op, values2):
+    """Returns a list of True where value1 op value2 or either
+    value is blank, otherwise False.
+    """
+    compare = get_operator(op)
+    return [compare(value1, value2) if value1 and value2 else True
+            for value1, value2 in zip(values1, values2)]
+
+
+def applicable_by_age_many(op, dobs, reference_dates, age):
+    """Returns a list of True where the age in years at the
+    reference date op age, otherwise False.
+    """
+    compare = get_operator(op)
+    return [compare(age_at(dob, reference_date).years, age)
+            for dob, reference_date in zip(dobs, reference_dates)]
 
 
 class SimpleYesNoValidationMixin:
 
+    @rule_method
     def require_if_yes(self, yesno_field, required_field,
                        required_msg=None, not_required_msg=None):
-        if (self.cleaned_data.get(yesno_field) in [NO, UNKNOWN] and self.cleaned_data.get(required_field)):
-            raise forms.ValidationError({
-                required_field: [
-                    not_required_msg or 'This field is not required based on previous answer.']})
-        elif (self.cleaned_data.get(yesno_field) == YES and not self.cleaned_data.get(required_field)):
-            raise forms.ValidationError({
-                required_field: [
-                    required_msg or 'This field is required based on previous answer.']})
+        yesno = self.cleaned_data.get(yesno_field)
+        required_value = self.cleaned_data.get(required_field)
+        if yesno in [NO, UNKNOWN] and required_value:
+            message = {required_field: not_required_msg or YES_NO_NOT_REQUIRED_MSG}
+            return raise_validation_error(self, message, NOT_REQUIRED_ERROR)
+        elif yesno == YES and not required_value:
+            message = {required_field: required_msg or YES_NO_REQUIRED_MSG}
+            return raise_validation_error(self, message, REQUIRED_ERROR)
+        return False
 
 
 class SimpleApplicableByAgeValidatorMixin:
 
-    def validate_applicable_by_age(self, field, op, age, dob,
-                                   previous_visit_date, subject_identifier,
-                                   errmsg=None):
-        age_delta = relativedelta(previous_visit_date, dob)
+    @rule_method
+    def validate_applicable_by_age(self, field, op, age, dob=_from_context,
+                                   previous_visit_date=_from_context,
+                                   subject_identifier=None, errmsg=None):
+        """If dob or previous_visit_date are not passed, reads the
+        facts 'dob' and 'previous_visit_date' of the subject from
+        the context.
+
+        Skipped if either is None, e.g. at the first visit.
+        """
+        if dob is _from_context:
+            dob = get_fact(self, 'dob', subject_identifier)
+        if previous_visit_date is _from_context:
+            previous_visit_date = get_fact(self, 'previous_visit_date', subject_identifier)
+        if dob is None or previous_visit_date is None:
+            return False
+        age_delta = age_at(dob, previous_visit_date)
+        value = self.cleaned_data.get(field)
         applicable = True
-        if self.cleaned_data.get(field):
+        if value:
             applicable = self.get_applicable(op, age_delta, age)
-        if not applicable and self.cleaned_data.get(field) != NOT_APPLICABLE:
-            raise forms.ValidationError({
-                field: [errmsg or (
-                    'Not applicable. Age {phrase} {age}y at previous visit. '
-                    'Got {subject_age}y').format(
-                        phrase=comparison_phrase.get(op),
-                        age=age, subject_age=age_delta.years)]})
-        if applicable and self.cleaned_data.get(field) == NOT_APPLICABLE:
-            raise forms.ValidationError({
-                field: [errmsg or (
-                    'Applicable. Age {phrase} {age}y at previous visit to '
-                    'be "not applicable". Got {subject_age}y').format(
-                        phrase=comparison_phrase.get(op),
-                        age=age, subject_age=age_delta.years)]})
+        if not applicable and value != NOT_APPLICABLE:
+            message = {field: errmsg or Message(
+                'age', NOT_APPLICABLE_ERROR, phrase=Message('phrase', op),
+                age=age, subject_age=age_delta.years)}
+            return raise_validation_error(self, message, NOT_APPLICABLE_ERROR)
+        if applicable and value == NOT_APPLICABLE:
+            message = {field: errmsg or Message(
+                'age', APPLICABLE_ERROR, phrase=Message('phrase', op),
+                age=age, subject_age=age_delta.years)}
+            return raise_validation_error(self, message, APPLICABLE_ERROR)
+        return False
 
     def get_applicable(self, op, age_delta, age):
-        applicable = False
-        if op == 'gt' and age_delta.years > age:
-            applicable = True
-        elif op == 'gte' and age_delta.years >= age:
-            applicable = True
-        elif op == 'lt' and age_delta.years < age:
-            applicable = True
-        elif op == 'lte' and age_delta.years <= age:
-            applicable = True
-        elif op == 'ne' and age_delta.years != age:
-            applicable = True
-        elif op == 'eq' and age_delta.years == age:
-            applicable = True
-        return applicable
+        return get_operator(op)(age_delta.years, age)
 
 
 class SimpleDateFieldValidatorMixin:
 
+    @rule_method
     def validate_dates(self, field1=None, op=None, field2=None, errmsg=None,
                        verbose_name1=None, verbose_name2=None,
                        value1=None, value2=None):
@@ -76,26 +159,13 @@ class SimpleDateFieldValidatorMixin:
         date1 = self.cleaned_data.get(field1, value1)
         date2 = self.cleaned_data.get(field2, value2)
         if not self.compare_dates(date1, op, date2):
-            raise forms.ValidationError({
-                field1: [errmsg or '{field1} {phrase} {field2}.'.format(
-                    field1=verbose_name1 or field1 or date1,
-                    phrase=comparison_phrase.get(op),
-                    field2=verbose_name2 or field2 or date2)]})
+            message = {field1: errmsg or Message(
+                'dates', INVALID_ERROR, field1=verbose_name1 or field1 or date1,
+                phrase=Message('phrase', op), field2=verbose_name2 or field2 or date2)}
+            return raise_validation_error(self, message, INVALID_ERROR)
+        return False
 
     def compare_dates(self, date1, op, date2):
-        ret = True
         if date1 and date2:
-            ret = False
-            if op == 'gt' and date1 > date2:
-                ret = True
-            elif op == 'gte' and date1 >= date2:
-                ret = True
-            elif op == 'lt' and date1 < date2:
-                ret = True
-            elif op == 'lte' and date1 <= date2:
-                ret = True
-            elif op == 'ne' and date1 != date2:
-                ret = True
-            elif op == 'eq' and date1 == date2:
-                ret = True
-        return ret
+            return get_operator(op)(date1, date2)
+        return True
@@ -0,0 +1,120 @@
+import copy
+import sys
+
+from django.apps import apps as django_apps
+from django.utils.module_loading import import_string, module_has_submodule
+from importlib import import_module
+
+
+class AlreadyRegistered(Exception):
+    pass
+
+
+class NotRegistered(Exception):
+    pass
+
+
+class SiteFormValidators:
+    """A registry of FormValidator classes by class path and,
+    optionally, by model label.
+
+    Register in a `form_validators.py` module of any INSTALLED_APP:
+
+        @register('my_app.crfone')
+        class CrfOneFormValidator(FormValidator):
+            ...
+    """
+
+    def __init__(self):
+        self.registry = {}
+        self.models = {}
+        self.loaded = False
+
+    def register(self, form_validator_cls, model=None):
+        name = f'{form_validator_cls.__module__}.{form_validator_cls.__qualname__}'
+        if name in self.registry and self.registry[name] is not form_validator_cls:
+            raise AlreadyRegistered(f'Form validator already registered. Got {name}.')
+        self.registry[name] = form_validator_cls
+        if model:
+            model = model.lower()
+            if model in self.models and self.models[model] is not form_validator_cls:
+                raise AlreadyRegistered(
+                    f'A form validator is already registered for {model}. '
+                    f'Got {self.models[model].__name__}.')
+            self.models[model] = form_validator_cls
+
+    def get(self, name):
+        """Returns the FormValidator class registered for a model
+        label, e.g. 'my_app.crfone', or a class path.
+        """
+        try:
+            return self.models[name.lower()]
+        except KeyError:
+            try:
+                return self.registry[name]
+            except KeyError:
+                raise NotRegistered(f'Form validator not registered. Got \'{name}\'.')
+
+    def get_or_import(self, name):
+        """Returns the registered FormValidator class or imports
+        it by class path.
+
+        Do not call with untrusted input.
+        """
+        try:
+            return self.get(name)
+        except NotRegistered:
+            return import_string(name)
+
+    def warm(self):
+        """Loads the list model cache for the m2m fields of each
+        model with a registered FormValidator that uses it.
+
+        Rule plans are compiled when each class is created.
+        """
+        from .list_model_cache import list_model_cache
+        for model, form_validator_cls in self.models.items():
+            if getattr(form_validator_cls, 'm2m_list_model_cache', False):
+                for field in django_apps.get_model(model)._meta.many_to_many:
+                    list_model_cache.get(field.related_model)
+
+    def autodiscover(self, module_name=None, apps=None, verbose=None):
+        """Autodiscovers classes in the form_validators.py file of
+        any INSTALLED_APP.
+        """
+        self.loaded = True
+        module_name = module_name or 'form_validators'
+        verbose = True if verbose is None else verbose
+        if verbose:
+            sys.stdout.write(f' * checking site for module \'{module_name}\' ...\n')
+        for app in apps or [c.name for c in django_apps.get_app_configs()]:
+            try:
+                mod = import_module(app)
+                try:
+                    before_import_registry = copy.copy(self.registry)
+                    before_import_models = copy.copy(self.models)
+                    import_module(f'{app}.{module_name}')
+                    if verbose:
+                        sys.stdout.write(f'   - registered form validators from \'{app}\'\n')
+                except Exception as e:
+                    if f'No module named \'{app}.{module_name}\'' not in str(e):
+                        raise
+                    self.registry = before_import_registry
+                    self.models = before_import_models
+                    if module_has_submodule(mod, module_name):
+                        raise
+            except ModuleNotFoundError:
+                pass
+
+
+site_form_validators = SiteFormValidators()
+
+
+def register(model=None):
+    """Registers the decorated FormValidator class with
+    `site_form_validators`.
+    """
+    def wrapper(form_validator_cls):
+        site_form_validators.register(form_validator_cls, model=model)
+        return form_validator_cls
+    return wrapper
@@ -0,0 +1,13 @@
+from edc_constants.constants import YES
+
+from ..form_validator import FormValidator
+from ..rules import RequiredIf, OtherSpecify
+from ..site import register
+
+
+@register('edc_form_validators.testmodel')
+class TestModelFormValidator(FormValidator):
+
+    rules = [
+        RequiredIf(YES, field='f1', field_required='f2'),
+        OtherSpecify(field='f5')]
@@ -9,3 +9,24 @@ class TestModel(models.Model):
     f4 = models.CharField(max_length=10, null=True, blank=False)
     f5 = models.CharField(max_length=10)
     f5_other = models.CharField(max_length=10, null=True)
+
+
+class TestListModel(models.Model):
+
+    short_name = models.CharField(max_length=25, unique=True)
+    name = models.CharField(max_length=50)
+
+
+class TestListModelProxy(TestListModel):
+
+    class Meta:
+        proxy = True
+
+
+class TestM2MModel(models.Model):
+
+    f1 = models.CharField(max_length=10, null=True)
+    fk = models.ForeignKey(
+        TestListModel, null=True, on_delete=models.PROTECT, related_name='+')
+    m2m = models.ManyToManyField(TestListModel)
+    m2m_other = models.CharField(max_length=10, null=True)
@@ -0,0 +1,125 @@
+from datetime import date
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase
+
+from edc_constants.constants import NOT_APPLICABLE
+
+from ..context import ValidationContext, current_context, validation_context
+from ..core import CoreValidator, InvalidModelFormFieldValidator, NOT_APPLICABLE_ERROR
+from ..form_validator import FormValidator
+from ..middleware import ValidationContextMiddleware
+from ..simple_mixins import SimpleApplicableByAgeValidatorMixin
+
+
+class Loader:
+
+    def __init__(self, values):
+        self.values = values
+        self.calls = []
+
+    def __call__(self, keys):
+        self.calls.append(sorted(keys))
+        return {k: self.values[k] for k in keys if k in self.values}
+
+
+class AgeFormValidator(SimpleApplicableByAgeValidatorMixin, FormValidator):
+
+    preload_facts = ('dob', 'previous_visit_date')
+
+    def clean(self):
+        self.validate_applicable_by_age('f1', 'gte', 18)
+
+
+class TestContext(SimpleTestCase):
+
+    def setUp(self):
+        self.dob = Loader({'1': date(2000, 1, 1), '2': date(2010, 1, 1)})
+        self.previous_visit_date = Loader({'1': date(2020, 1, 1), '2': date(2020, 1, 1)})
+        self.loaders = dict(dob=self.dob, previous_visit_date=self.previous_visit_date)
+
+    def test_get_loads_once(self):
+        context = ValidationContext(loaders=self.loaders)
+        for _ in range(3):
+            self.assertEqual(context.get('dob', '1'), date(2000, 1, 1))
+        self.assertIsNone(context.get('dob', '3'))
+        self.assertIsNone(context.get('dob', '3'))
+        self.assertEqual(self.dob.calls, [['1'], ['3']])
+
+    def test_preload(self):
+        context = ValidationContext(loaders=self.loaders)
+        context.preload(['1', '2'])
+        context.get('dob', '2')
+        context.preload(['1', '2', '3'], names=['dob'])
+        self.assertEqual(self.dob.calls, [['1', '2'], ['3']])
+        self.assertEqual(self.previous_visit_date.calls, [['1', '2']])
+
+    def test_unknown_fact(self):
+        context = ValidationContext(loaders={})
+        self.assertRaises(InvalidModelFormFieldValidator, context.get, 'dob', '1')
+
+    def test_shared_by_form_validators(self):
+        with validation_context(loaders=self.loaders) as context:
+            for _ in range(15):
+                form_validator = AgeFormValidator(
+                    cleaned_data=dict(subject_identifier='1', f1='blah'))
+                self.assertIs(form_validator.context, context)
+                form_validator.validate()
+        self.assertIsNone(current_context.get())
+        self.assertEqual(self.dob.calls, [['1']])
+
+    def test_rule_reads_facts(self):
+        context = ValidationContext(loaders=self.loaders)
+        form_validator = AgeFormValidator(
+            cleaned_data=dict(subject_identifier='2', f1='blah'),
+            collect_errors=True, context=context)
+        form_validator.clean_collected()
+        self.assertEqual(form_validator._error_codes, [NOT_APPLICABLE_ERROR])
+
+    def test_first_visit_skipped(self):
+        context = ValidationContext(loaders=dict(
+            dob=self.dob, previous_visit_date=Loader({})))
+        form_validator = AgeFormValidator(
+            cleaned_data=dict(subject_identifier='2', f1='blah'), context=context)
+        form_validator.validate()
+
+    def test_none_passed_skipped_without_loaders(self):
+        context = ValidationContext(loaders={})
+        form_validator = AgeFormValidator(cleaned_data=dict(f1='blah'), context=context)
+        self.assertFalse(form_validator.validate_applicable_by_age(
+            'f1', 'gt', 5, date(2000, 1, 1), None, 'S1'))
+        self.assertFalse(form_validator.validate_applicable_by_age(
+            'f1', 'gt', 5, None, date(2020, 1, 1), 'S1'))
+        self.assertEqual(len(context), 0)
+
+    def test_batch_preloads(self):
+        context = ValidationContext(loaders=self.loaders)
+        rows = [dict(subject_identifier=k, f1=NOT_APPLICABLE) for k in ['1', '2', '1']]
+        results = list(AgeFormValidator.validate_many(rows, context=context))
+        self.assertEqual([r.is_valid for r in results], [False, True, False])
+        self.assertEqual(self.dob.calls, [['1', '2']])
+
+    def test_core_validator(self):
+        class Checker(SimpleApplicableByAgeValidatorMixin, CoreValidator):
+            def clean(self):
+                self.validate_applicable_by_age('f1', 'gte', 18)
+
+        with validation_context(loaders=self.loaders):
+            errors = Checker.check_batch(
+                [dict(subject_identifier=k, f1='blah') for k in ['1', '2', '2']])
+        self.assertEqual(errors.rows(), [1, 2])
+        self.assertEqual(self.dob.calls, [['1'], ['2']])
+
+    def test_middleware(self):
+        contexts = []
+
+        def view(request):
+            contexts.append(current_context.get())
+            return HttpResponse()
+
+        middleware = ValidationContextMiddleware(view)
+        request = RequestFactory().get('/')
+        middleware(request)
+        middleware(RequestFactory().get('/'))
+        self.assertIs(contexts[0], request.validation_context)
+        self.assertIsNot(contexts[0], contexts[1])
+        self.assertIsNone(current_context.get())
@@ -0,0 +1,117 @@
+import os
+import subprocess
+import sys
+
+from datetime import date
+from django.test import SimpleTestCase
+
+from edc_constants.constants import YES, NO, NOT_APPLICABLE, OTHER
+
+from ..applicable_field_validator import ApplicableFieldValidator
+from ..core import CoreValidator, RuleError, Violation, BatchErrors, ErrorRecord
+from ..core import REQUIRED_ERROR, NOT_REQUIRED_ERROR, INVALID_ERROR, APPLICABLE_ERROR
+from ..other_specify_field_validator import OtherSpecifyFieldValidator
+from ..required_field_validator import RequiredFieldValidator
+from ..rules import RequiredIf, OtherSpecify
+from ..simple_mixins import SimpleYesNoValidationMixin, SimpleDateFieldValidatorMixin
+
+
+class Checker(RequiredFieldValidator, OtherSpecifyFieldValidator,
+              ApplicableFieldValidator, SimpleYesNoValidationMixin,
+              SimpleDateFieldValidatorMixin, CoreValidator):
+
+    rules = [
+        RequiredIf(YES, field='f1', field_required='f2'),
+        OtherSpecify(field='f4')]
+
+    def clean(self):
+        self.applicable(YES, field='f1', field_applicable='f3')
+        self.validate_dates(field1='d1', op='gt', field2='d2')
+
+
+class TestCore(SimpleTestCase):
+
+    def test_check_ok(self):
+        self.assertEqual(Checker(cleaned_data=dict(f1=YES, f2='blah', f3='blah')).check(), ())
+
+    def test_check(self):
+        violations = Checker(cleaned_data=dict(
+            f1=YES, f2=None, f3=NOT_APPLICABLE, f4='blah', f4_other='blah',
+            d1=date(2020, 1, 1), d2=date(2020, 1, 2))).check()
+        self.assertEqual(
+            [v.code for v in violations],
+            [REQUIRED_ERROR, NOT_REQUIRED_ERROR, APPLICABLE_ERROR, INVALID_ERROR])
+        self.assertEqual(violations[0], Violation('f2', 'This field is required.', REQUIRED_ERROR))
+
+    def test_raises_rule_error(self):
+        checker = Checker(cleaned_data=dict(f1=YES))
+        with self.assertRaises(RuleError) as cm:
+            checker.required_if(YES, field='f1', field_required='f2')
+        self.assertEqual(cm.exception.message, {'f2': 'This field is required.'})
+        self.assertEqual(cm.exception.code, REQUIRED_ERROR)
+
+    def test_simple_mixin_uses_hook(self):
+        checker = Checker(cleaned_data=dict(f1=NO, f2='blah'), collect_errors=True)
+        checker.require_if_yes('f1', 'f2')
+        self.assertEqual(checker._error_codes, [NOT_REQUIRED_ERROR])
+
+    def test_collect_empty_message(self):
+        checker = Checker(cleaned_data={}, collect_errors=True)
+        self.assertIsNone(checker.raise_validation_error({}, INVALID_ERROR))
+        self.assertEqual(checker._violations, [])
+
+    def test_rule_error_raised_in_clean_is_collected(self):
+
+        class Checker2(Checker):
+            def clean(self):
+                raise RuleError({'f1': 'Bad.'}, code=INVALID_ERROR)
+
+        self.assertEqual(
+            Checker2(cleaned_data={}).check(), (Violation('f1', 'Bad.', INVALID_ERROR), ))
+
+    def test_check_many(self):
+        results = list(Checker.check_many([dict(f1=NO), dict(f1=YES), dict(f4=OTHER)]))
+        self.assertEqual([r.is_valid for r in results], [True, False, False])
+
+    def test_check_batch(self):
+        rows = [dict(f1=NO), dict(f1=YES), dict(f4=OTHER), dict(f1=YES, f4=OTHER)]
+        errors = Checker.check_batch(rows)
+        self.assertEqual(len(errors), 4)
+        self.assertEqual(errors.rows(), [1, 2, 3])
+        self.assertEqual(
+            errors.for_row(3),
+            [ErrorRecord(3, 'f2', REQUIRED_ERROR, 'This field is required.'),
+             ErrorRecord(3, 'f4_other', REQUIRED_ERROR, 'This field is required.')])
+        self.assertEqual(errors.for_row(0), [])
+        self.assertEqual(errors.count_by_code(), {REQUIRED_ERROR: 4})
+        self.assertEqual(errors.strings, ['f2', REQUIRED_ERROR, 'This field is required.', 'f4_other'])
+
+    def test_check_batch_same_as_check_many(self):
+        rows = [dict(f1=YES, f3=NOT_APPLICABLE), dict(f1=NO, f2='blah', f4='blah', f4_other='x'),
+                dict(f1=YES, f2='blah', f3='blah', d1=date(2020, 1, 1), d2=date(2020, 1, 2))]
+        records = list(Checker.check_batch(rows))
+        for result in Checker.check_many(rows):
+            self.assertEqual(
+                result.error_codes, [r.code for r in records if r.row == result.index])
+
+    def test_batch_errors(self):
+        errors = BatchErrors()
+        errors.append(0, 'f1', REQUIRED_ERROR, 'Required.')
+        errors.append(2, 'f1', REQUIRED_ERROR, 'Required.')
+        self.assertEqual(len(errors.strings), 3)
+        self.assertEqual(list(errors)[1], ErrorRecord(2, 'f1', REQUIRED_ERROR, 'Required.'))
+
+    def test_without_django(self):
+        statement = (
+            'import sys\n'
+            'from edc_constants.constants import YES\n'
+            'from edc_form_validators.core import CoreValidator\n'
+            'from edc_form_validators.required_field_validator import RequiredFieldValidator\n'
+            'from edc_form_validators.simple_mixins import SimpleDateFieldValidatorMixin\n'
+            'from edc_form_validators.rules import RequiredIf\n'
+            'class Checker(RequiredFieldValidator, CoreValidator):\n'
+            '    rules = [RequiredIf(YES, field="f1", field_required="f2")]\n'
+            'assert len(Checker(cleaned_data=dict(f1=YES)).check()) == 1\n'
+            'assert not [m for m in sys.modules if m.startswith("django")], sys.modules\n')
+        env = {k: v for k, v in os.environ.items() if k != 'DJANGO_SETTINGS_MODULE'}
+        subprocess.run([sys.executable, '-c', statement], check=True, env=env)
@@ -0,0 +1,61 @@
+import random
+
+from django.test import TestCase
+from unittest import skipUnless
+
+from edc_constants.constants import YES, NO, DWTA, NOT_APPLICABLE, OTHER
+
+from ..base_form_validator import InvalidModelFormFieldValidator, REQUIRED_ERROR
+from ..form_validator import FormValidator
+from ..rules import RequiredIf, NotRequiredIf, ApplicableIf, NotApplicableIf
+from ..rules import OtherSpecify, RequireTogether, M2MRequired
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+else:
+    from ..frame_validator import FrameValidator
+
+
+class MyFormValidator(FormValidator):
+
+    rules = [
+        RequiredIf(YES, DWTA, field='f1', field_required='f2', optional_if_dwta=True),
+        NotRequiredIf(NO, field='f1', field_required='f3'),
+        ApplicableIf(YES, field='f4', field_applicable='f5'),
+        NotApplicableIf(NO, field='f6', field_applicable='f7'),
+        OtherSpecify(field='f8'),
+        RequireTogether(field='f9', field_required='f10')]
+
+
+@skipUnless(pd, 'pandas is not installed')
+class TestFrameValidator(TestCase):
+
+    def test_required_if(self):
+        frame = pd.DataFrame([
+            dict(f1=YES, f2='blah'),
+            dict(f1=YES, f2=None),
+            dict(f1=NO, f2=None)])
+        codes = FrameValidator(rules=MyFormValidator.rules[:1]).validate(frame)
+        self.assertEqual(list(codes['f2']), [None, REQUIRED_ERROR, None])
+
+    def test_unsupported_rule_raises(self):
+        self.assertRaises(
+            InvalidModelFormFieldValidator,
+            FrameValidator, rules=[M2MRequired(m2m_field='f1')])
+
+    def test_same_as_validate_many(self):
+        random.seed(1)
+        values = [YES, NO, DWTA, NOT_APPLICABLE, OTHER, 'blah', None]
+        fields = [f'f{i}' for i in range(1, 11)] + ['f8_other']
+        rows = [{field: random.choice(values) for field in fields}
+                for _ in range(500)]
+        codes = FrameValidator(MyFormValidator).validate(pd.DataFrame(rows))
+        for result in MyFormValidator.validate_many(rows):
+            expected = {}
+            for field, code in zip(result.errors, result.error_codes):
+                expected[field] = code
+            got = {field: code for field, code in codes.iloc[result.index].items()
+                   if code is not None}
+            self.assertEqual(got, expected, msg=rows[result.index])
@@ -0,0 +1,25 @@
+import os
+import subprocess
+import sys
+
+from django.test import SimpleTestCase
+
+import edc_form_validators
+
+
+class TestImports(SimpleTestCase):
+
+    def test_rules_do_not_import_django_forms(self):
+        statement = (
+            'import sys\n'
+            'from edc_form_validators import FormValidator, RequiredIf\n'
+            'assert \'django.forms\' not in sys.modules\n'
+            'assert \'django.db.models\' not in sys.modules\n')
+        subprocess.run([sys.executable, '-c', statement], check=True, env=dict(
+            os.environ, DJANGO_SETTINGS_MODULE='edc_form_validators.settings'))
+
+    def test_public_api(self):
+        for name in edc_form_validators.__all__:
+            self.assertTrue(getattr(edc_form_validators, name))
+        self.assertIn('FormValidatorMixin', dir(edc_form_validators))
+        self.assertRaises(AttributeError, getattr, edc_form_validators, 'Blah')
@@ -0,0 +1,100 @@
+from django import forms
+from django.test import TestCase
+
+from edc_constants.constants import YES, NO, NOT_APPLICABLE
+
+from ..base_form_validator import REQUIRED_ERROR
+from ..form_validator import FormValidator
+from ..instrumentation import InMemoryAggregator, SignalSink, validation_timed
+from ..instrumentation import VALID, INVALID
+from ..rules import Gate, RequiredIf
+from .models import TestListModel
+
+
+class TestInstrumentation(TestCase):
+
+    def setUp(self):
+        self.sink = InMemoryAggregator()
+
+        class MyFormValidator(FormValidator):
+            instrumentation = self.sink
+            rules = [RequiredIf(YES, field='f1', field_required='f2')]
+
+            def clean(self):
+                self.applicable_if(YES, field='f1', field_applicable='f3')
+                self.m2m_required_if(YES, field='f1', m2m_field='m2m')
+
+        self.form_validator_cls = MyFormValidator
+
+    def test_not_instrumented_by_default(self):
+        form_validator = FormValidator(cleaned_data={})
+        self.assertNotIn('required_if', form_validator.__dict__)
+
+    def test_records_rules_and_validate(self):
+        TestListModel.objects.create(short_name='one', name='One')
+        form_validator = self.form_validator_cls(cleaned_data=dict(
+            f1=YES, f2='blah', f3='blah', m2m=TestListModel.objects.all()))
+        form_validator.validate()
+        summary = self.sink.summary()
+        self.assertEqual(
+            sorted(name for _, name in summary),
+            ['applicable_if', 'm2m_required_if', 'rules.RequiredIf', 'validate'])
+        key = ('MyFormValidator', 'm2m_required_if')
+        self.assertEqual(summary[key]['queries'], 1)
+        self.assertEqual(summary[('MyFormValidator', 'validate')]['count'], 1)
+        self.assertIsNotNone(self.sink.percentile(key, 99))
+
+    def test_records_outcome(self):
+        form_validator = self.form_validator_cls(cleaned_data=dict(f1=YES, f2=None))
+        self.assertRaises(forms.ValidationError, form_validator.validate)
+        timings = self.sink.timings[('MyFormValidator', 'rules.RequiredIf')]
+        self.assertEqual(timings[0].outcome, INVALID)
+        self.assertEqual(timings[0].error_codes, [REQUIRED_ERROR])
+        form_validator = self.form_validator_cls(
+            cleaned_data=dict(f1=NO, f2=None), collect_errors=True)
+        form_validator.validate()
+        self.assertEqual(timings[1].outcome, VALID)
+
+    def test_nested_rule_call_timed_once(self):
+        form_validator = self.form_validator_cls(
+            cleaned_data=dict(f1=YES, f2='blah', f3=NOT_APPLICABLE))
+        self.assertRaises(forms.ValidationError, form_validator.validate)
+        timings = self.sink.timings[('MyFormValidator', 'applicable_if')]
+        self.assertEqual([t.outcome for t in timings], [INVALID])
+        self.assertNotIn(('MyFormValidator', 'applicable'), self.sink.timings)
+
+    def test_declared_rules_named_apart(self):
+        form_validator = self.form_validator_cls(cleaned_data=dict(f1=NO, f2=None))
+
+        def clean():
+            form_validator.required_if(YES, field='f1', field_required='f2')
+
+        form_validator.clean = clean
+        form_validator.validate()
+        self.assertEqual(len(self.sink.timings[('MyFormValidator', 'rules.RequiredIf')]), 1)
+        self.assertEqual(len(self.sink.timings[('MyFormValidator', 'required_if')]), 1)
+
+    def test_gate_rules_timed(self):
+
+        class GateFormValidator(FormValidator):
+            instrumentation = self.sink
+            rules = [Gate(YES, field='f1', rules=[
+                RequiredIf(YES, field='f3', field_required='f4')])]
+
+        form_validator = GateFormValidator(cleaned_data=dict(f1=YES, f3=YES, f4=None))
+        self.assertRaises(forms.ValidationError, form_validator.validate)
+        timings = self.sink.timings[('GateFormValidator', 'rules.RequiredIf')]
+        self.assertEqual(timings[0].error_codes, [REQUIRED_ERROR])
+        self.assertNotIn(('GateFormValidator', 'rules.Gate'), self.sink.timings)
+
+    def test_signal_sink(self):
+        received = []
+
+        def receiver(sender, timing, **kwargs):
+            received.append(timing)
+
+        validation_timed.connect(receiver)
+        self.addCleanup(validation_timed.disconnect, receiver)
+        self.form_validator_cls.instrumentation = SignalSink()
+        self.form_validator_cls(cleaned_data=dict(f1=NO)).validate()
+        self.assertEqual(received[-1].name, 'validate')
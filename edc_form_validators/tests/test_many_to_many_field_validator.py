@@ -0,0 +1,214 @@
+from django import forms
+from django.test import TestCase
+
+from edc_constants.constants import YES, NO, OTHER, NOT_APPLICABLE
+
+from ..base_form_validator import REQUIRED_ERROR, NOT_REQUIRED_ERROR, INVALID_ERROR
+from ..form_validator import FormValidator
+from ..list_model_cache import ListModelCache, list_model_cache
+from .models import TestListModel, TestListModelProxy, TestM2MModel, TestModel
+
+
+class TestManyToManyFieldValidator(TestCase):
+
+    def setUp(self):
+        for short_name in ['one', 'two', 'none', OTHER]:
+            TestListModel.objects.create(short_name=short_name, name=short_name.title())
+
+    def selected(self, *short_names):
+        return TestListModel.objects.filter(short_name__in=short_names)
+
+    def test_m2m_required(self):
+        form_validator = FormValidator(cleaned_data=dict(m2m=self.selected()))
+        self.assertRaises(
+            forms.ValidationError, form_validator.m2m_required, m2m_field='m2m')
+        form_validator = FormValidator(cleaned_data=dict(m2m=self.selected('one')))
+        self.assertFalse(form_validator.m2m_required(m2m_field='m2m'))
+
+    def test_m2m_required_if(self):
+        form_validator = FormValidator(
+            cleaned_data=dict(f1=YES, m2m=self.selected()), collect_errors=True)
+        form_validator.m2m_required_if(YES, field='f1', m2m_field='m2m')
+        self.assertEqual(form_validator._error_codes, [REQUIRED_ERROR])
+        form_validator = FormValidator(
+            cleaned_data=dict(f1=NO, m2m=self.selected('one')), collect_errors=True)
+        form_validator.m2m_required_if(YES, field='f1', m2m_field='m2m')
+        form_validator2 = FormValidator(
+            cleaned_data=dict(f1=YES, m2m=self.selected('one')), collect_errors=True)
+        form_validator2.m2m_required_if(YES, field='f1', m2m_field='m2m')
+        self.assertEqual(form_validator._error_codes, [NOT_REQUIRED_ERROR])
+        self.assertEqual(form_validator2._error_codes, [])
+
+    def test_m2m_single_selection_if(self):
+        form_validator = FormValidator(cleaned_data=dict(m2m=self.selected('one', 'none')))
+        with self.assertRaises(forms.ValidationError) as cm:
+            form_validator.m2m_single_selection_if('none', m2m_field='m2m')
+        self.assertEqual(form_validator._error_codes, [INVALID_ERROR])
+        self.assertIn('None', str(cm.exception))
+
+    def test_m2m_other_specify(self):
+        form_validator = FormValidator(
+            cleaned_data=dict(m2m=self.selected('one', OTHER), m2m_other=None))
+        self.assertRaises(
+            forms.ValidationError, form_validator.m2m_other_specify,
+            OTHER, m2m_field='m2m', field_other='m2m_other')
+        self.assertEqual(form_validator._error_codes, [REQUIRED_ERROR])
+
+    def test_one_query_per_m2m_field(self):
+        form_validator = FormValidator(
+            cleaned_data=dict(f1=YES, m2m=self.selected('one', 'two'),
+                              m2m_other=NOT_APPLICABLE))
+        with self.assertNumQueries(1):
+            form_validator.m2m_required(m2m_field='m2m')
+            form_validator.m2m_required_if(YES, field='f1', m2m_field='m2m')
+            form_validator.m2m_single_selection_if('none', m2m_field='m2m')
+            form_validator.m2m_other_specify(
+                OTHER, m2m_field='m2m', field_other='other')
+            form_validator.m2m_other_specify_applicable(
+                OTHER, m2m_field='m2m', field_other='m2m_other')
+
+
+class MyFormValidator(FormValidator):
+
+    m2m_list_model_cache = True
+
+
+class TestListModelCache(TestCase):
+
+    def setUp(self):
+        list_model_cache.invalidate()
+        for short_name in ['one', 'two', 'none', OTHER]:
+            TestListModel.objects.create(short_name=short_name, name=short_name.title())
+
+    def selected(self, *short_names):
+        return TestListModel.objects.filter(short_name__in=short_names)
+
+    def test_selected_from_cache(self):
+        form_validator = MyFormValidator(cleaned_data=dict(m2m=self.selected('one', 'two')))
+        self.assertEqual(form_validator.m2m_selected('m2m'), {'one': 'One', 'two': 'Two'})
+        self.assertIn(TestListModel, list_model_cache)
+        form_validator = MyFormValidator(cleaned_data=dict(m2m=self.selected('one', 'none')))
+        with self.assertNumQueries(1):
+            self.assertEqual(form_validator.m2m_count('m2m'), 2)
+            self.assertRaises(
+                forms.ValidationError, form_validator.m2m_single_selection_if,
+                'none', m2m_field='m2m')
+
+    def test_invalidated_on_save(self):
+        list_model_cache.get(TestListModel)
+        self.assertIn(TestListModel, list_model_cache)
+        TestListModel.objects.create(short_name='three', name='Three')
+        self.assertNotIn(TestListModel, list_model_cache)
+        list_model_cache.get(TestListModel)
+        TestListModel.objects.get(short_name='three').delete()
+        self.assertNotIn(TestListModel, list_model_cache)
+
+    def test_missing_pk_reloads(self):
+        list_model_cache.get(TestListModel)
+        TestListModel.objects.bulk_create([TestListModel(short_name='three', name='Three')])
+        form_validator = MyFormValidator(cleaned_data=dict(m2m=self.selected('three')))
+        self.assertEqual(form_validator.m2m_selected('m2m'), {'three': 'Three'})
+
+    def test_proxy_invalidated_on_save_of_concrete_model(self):
+        form_validator = MyFormValidator(cleaned_data=dict(
+            m2m=TestListModelProxy.objects.filter(short_name='one')))
+        self.assertEqual(form_validator.m2m_selected('m2m'), {'one': 'One'})
+        obj = TestListModel.objects.get(short_name='one')
+        obj.name = 'Uno'
+        obj.save()
+        self.assertNotIn(TestListModelProxy, list_model_cache)
+        form_validator = MyFormValidator(cleaned_data=dict(
+            m2m=TestListModelProxy.objects.filter(short_name='one')))
+        self.assertEqual(form_validator.m2m_selected('m2m'), {'one': 'Uno'})
+
+    def test_timeout(self):
+        cache = ListModelCache(timeout=0)
+        cache.get(TestListModel)
+        TestListModel.objects.filter(short_name='one').update(name='Uno')
+        self.assertEqual(dict(cache.get(TestListModel).values())['one'], 'Uno')
+
+    def test_lru(self):
+        cache = ListModelCache(maxsize=1)
+        cache.get(TestListModel)
+        cache.get(TestListModelProxy)
+        self.assertEqual(len(cache), 1)
+        cache._put(TestModel, {})
+        self.assertNotIn(TestListModel, cache)
+        self.assertIn(TestModel, cache)
+        self.assertEqual(len(cache), 1)
+
+
+class M2MFormValidator(FormValidator):
+
+    def clean(self):
+        self.m2m_required_if(YES, field='f1', m2m_field='m2m')
+        self.m2m_single_selection_if('none', m2m_field='m2m')
+        self.m2m_other_specify(OTHER, m2m_field='m2m', field_other='m2m_other')
+
+
+class TestAsyncValidate(TestCase):
+
+    def setUp(self):
+        list_model_cache.invalidate()
+        for short_name in ['one', 'two', 'none', OTHER]:
+            TestListModel.objects.create(short_name=short_name, name=short_name.title())
+
+    def selected(self, *short_names):
+        return TestListModel.objects.filter(short_name__in=short_names)
+
+    async def test_avalidate_ok(self):
+        # a sync query in the event loop would raise SynchronousOnlyOperation
+        form_validator = M2MFormValidator(
+            cleaned_data=dict(f1=YES, m2m=self.selected('one', OTHER), m2m_other='blah'))
+        cleaned_data = await form_validator.avalidate()
+        self.assertEqual(cleaned_data['m2m_other'], 'blah')
+
+    async def test_avalidate_raises(self):
+        form_validator = M2MFormValidator(
+            cleaned_data=dict(f1=YES, m2m=self.selected('one', 'none')))
+        with self.assertRaises(forms.ValidationError):
+            await form_validator.avalidate()
+        self.assertEqual(form_validator._error_codes, [INVALID_ERROR])
+
+    async def test_avalidate_collected(self):
+        form_validator = M2MFormValidator(
+            cleaned_data=dict(f1=NO, m2m=self.selected('one', OTHER)),
+            collect_errors=True)
+        with self.assertRaises(forms.ValidationError):
+            await form_validator.avalidate()
+        self.assertEqual(form_validator._error_codes, [NOT_REQUIRED_ERROR, REQUIRED_ERROR])
+
+    async def test_avalidate_with_list_model_cache(self):
+
+        class M2MFormValidator2(M2MFormValidator):
+            m2m_list_model_cache = True
+
+        form_validator = M2MFormValidator2(
+            cleaned_data=dict(f1=YES, m2m=self.selected('one', 'none')))
+        with self.assertRaises(forms.ValidationError):
+            await form_validator.avalidate()
+        self.assertIn(TestListModel, list_model_cache)
+
+    async def test_avalidate_incremental_fk_not_queried(self):
+        obj = await TestM2MModel.objects.aget(
+            pk=(await TestM2MModel.objects.acreate(fk=await self.selected('one').aget())).pk)
+        form_validator = M2MFormValidator(
+            cleaned_data=dict(f1=YES, fk=await self.selected('two').aget(),
+                              m2m=self.selected('one')),
+            instance=obj, incremental=True)
+        self.assertEqual(form_validator.changed_fields(), ['f1', 'fk', 'm2m'])
+        await form_validator.avalidate()
+
+    async def test_aclean(self):
+
+        class M2MFormValidator2(M2MFormValidator):
+            async def aclean(self):
+                if not await TestListModel.objects.filter(short_name='three').aexists():
+                    self.raise_validation_error({'f1': 'Missing three.'}, REQUIRED_ERROR)
+
+        form_validator = M2MFormValidator2(
+            cleaned_data=dict(f1=YES, m2m=self.selected('one')))
+        with self.assertRaises(forms.ValidationError):
+            await form_validator.avalidate()
+        self.assertIn('f1', form_validator._errors)
+        self.assertEqual(form_validator._error_codes, [REQUIRED_ERROR])
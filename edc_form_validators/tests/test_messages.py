@@ -0,0 +1,58 @@
+from django.forms import ValidationError
+from django.test import SimpleTestCase
+from unittest.mock import patch
+
+from edc_constants.constants import YES, OTHER
+
+from ..core import REQUIRED_ERROR, NOT_REQUIRED_ERROR, INVALID_ERROR
+from ..form_validator import FormValidator
+from ..messages import Message, REQUIRED_MSG, catalogue
+from ..rules import RequiredIf, OtherSpecify
+
+
+class MyFormValidator(FormValidator):
+
+    rules = [
+        RequiredIf(YES, field='f1', field_required='f2'),
+        OtherSpecify(field='f4', ref='Q4')]
+
+
+class TestMessages(SimpleTestCase):
+
+    def test_rendered(self):
+        self.assertEqual(str(REQUIRED_MSG), 'This field is required.')
+        self.assertEqual(
+            str(Message('required', NOT_REQUIRED_ERROR, ref='Q4')),
+            'This field is not required. ref: Q4')
+        self.assertEqual(
+            str(Message('dates', INVALID_ERROR, field1='d1', phrase=Message('phrase', 'gt'),
+                        field2='d2')),
+            'd1 must be greater than d2.')
+
+    def test_equality(self):
+        self.assertEqual(REQUIRED_MSG, Message('required', REQUIRED_ERROR))
+        self.assertEqual(REQUIRED_MSG, 'This field is required.')
+        self.assertNotEqual(REQUIRED_MSG, Message('required', REQUIRED_ERROR, ref='Q1'))
+        self.assertEqual(hash(REQUIRED_MSG), hash('This field is required.'))
+
+    def test_rendered_only_when_shown(self):
+        form_validator = MyFormValidator(cleaned_data=dict(f1=YES), collect_errors=True)
+        with patch('edc_form_validators.messages.translate') as translate:
+            form_validator.clean_collected()
+            errors = MyFormValidator.check_batch([dict(f1=YES), dict(f4=OTHER)])
+            translate.assert_not_called()
+        self.assertIsInstance(form_validator._violations[0].message, Message)
+        # f2, required, f4_other and two messages
+        self.assertEqual(len(errors.strings), 5)
+
+    def test_translated_when_rendered(self):
+        with patch.dict(catalogue, {('required', REQUIRED_ERROR): 'Tshimologo.'}):
+            self.assertEqual(str(REQUIRED_MSG), 'Tshimologo.')
+        with patch('edc_form_validators.messages.translate', side_effect=str.upper):
+            self.assertEqual(str(REQUIRED_MSG), 'THIS FIELD IS REQUIRED.')
+
+    def test_validation_error(self):
+        form_validator = MyFormValidator(cleaned_data=dict(f1=YES))
+        with self.assertRaises(ValidationError) as cm:
+            form_validator.validate()
+        self.assertEqual(cm.exception.message_dict, {'f2': ['This field is required.']})
@@ -5,6 +5,8 @@ from edc_constants.constants import YES, NO, DWTA, NOT_APPLICABLE
 
 from ..form_validator import FormValidator
 from ..base_form_validator import ModelFormFieldValidatorError, InvalidModelFormFieldValidator
+from ..base_form_validator import APPLICABLE_ERROR, NOT_REQUIRED_ERROR, REQUIRED_ERROR
+from ..base_form_validator import Violation
 from ..form_validator_mixin import FormValidatorMixin
 from .models import TestModel
 
@@ -401,3 +403,79 @@ class TestRequiredIfNotNoneFieldValidator(TestCase):
                 optional_if_dwta=True)
         except forms.ValidationError as e:
             self.fail(f'forms.ValidationError unexpectedly raised. Got {e}')
+
+
+class TestCollectErrors(TestCase):
+
+    def setUp(self):
+
+        class MyFormValidator(FormValidator):
+            def clean(self):
+                self.required_if(
+                    YES, field='field_one', field_required='field_two')
+                self.applicable_if(
+                    YES, field='field_one', field_applicable='field_three')
+                self.validate_other_specify(field='field_four')
+
+        self.form_validator_cls = MyFormValidator
+        self.cleaned_data = dict(
+            field_one=YES, field_two=None, field_three=NOT_APPLICABLE,
+            field_four='blah', field_four_other='blah')
+
+    def test_raises_on_first_by_default(self):
+        form_validator = self.form_validator_cls(
+            cleaned_data=self.cleaned_data)
+        self.assertRaises(forms.ValidationError, form_validator.validate)
+        self.assertEqual(list(form_validator._errors), ['field_two'])
+        self.assertEqual(form_validator._error_codes, [REQUIRED_ERROR])
+
+    def test_collects_all(self):
+        form_validator = self.form_validator_cls(
+            cleaned_data=self.cleaned_data, collect_errors=True)
+        with self.assertRaises(forms.ValidationError) as cm:
+            form_validator.validate()
+        self.assertEqual(
+            list(form_validator._errors),
+            ['field_two', 'field_three', 'field_four_other'])
+        self.assertEqual(
+            form_validator._error_codes,
+            [REQUIRED_ERROR, APPLICABLE_ERROR, NOT_REQUIRED_ERROR])
+        self.assertEqual(
+            sorted(cm.exception.error_dict),
+            ['field_four_other', 'field_three', 'field_two'])
+        self.assertEqual(
+            cm.exception.error_dict.get('field_two')[0].code, REQUIRED_ERROR)
+
+    def test_collects_error_raised_in_clean(self):
+
+        class MyFormValidator(self.form_validator_cls):
+            collect_errors = True
+
+            def clean(self):
+                super().clean()
+                raise forms.ValidationError('Something is wrong.')
+
+        form_validator = MyFormValidator(cleaned_data=self.cleaned_data)
+        with self.assertRaises(forms.ValidationError) as cm:
+            form_validator.validate()
+        self.assertIn('field_two', cm.exception.error_dict)
+        self.assertIn('__all__', cm.exception.error_dict)
+
+    def test_collects_nothing_if_valid(self):
+        form_validator = self.form_validator_cls(
+            cleaned_data=dict(field_one=NO, field_three=NOT_APPLICABLE),
+            collect_errors=True)
+        self.assertEqual(form_validator.validate(), form_validator.cleaned_data)
+
+    def test_rule_returns_violation(self):
+        form_validator = FormValidator(
+            cleaned_data=dict(field_one=YES, field_three='blah'),
+            collect_errors=True)
+        self.assertEqual(
+            form_validator.required_if(
+                YES, field='field_one', field_required='field_two'),
+            Violation('field_two', 'This field is required.', REQUIRED_ERROR))
+        self.assertFalse(
+            form_validator.required_if(
+                YES, field='field_one', field_required='field_three'))
+        self.assertEqual(len(form_validator._violations), 1)
@@ -0,0 +1,75 @@
+from itertools import product
+
+from django.test import TestCase
+
+from edc_constants.constants import DWTA, NO, NOT_APPLICABLE, OTHER, YES
+
+from ..core import InvalidModelFormFieldValidator
+from ..form_validator import FormValidator
+from ..query_validator import QueryValidator, violates
+from ..rules import ApplicableIf, Gate, M2MRequired, NotApplicableIf, NotApplicableOnlyIf
+from ..rules import NotRequiredIf, OtherSpecify, RequiredIf, RequiredIfNotNone, RequireTogether
+from .models import TestModel
+
+
+class MyFormValidator(FormValidator):
+
+    rules = [
+        RequiredIf(YES, DWTA, field='f1', field_required='f2', optional_if_dwta=True),
+        NotRequiredIf(NO, field='f1', field_required='f3'),
+        ApplicableIf(YES, field='f2', field_applicable='f4'),
+        NotApplicableIf(NO, field='f3', field_applicable='f5'),
+        NotApplicableOnlyIf(None, field='f3', field_applicable='f1'),
+        OtherSpecify(field='f5'),
+        RequiredIfNotNone(field='f4', field_required='f3', optional_if_dwta=True),
+        RequireTogether(field='f3', field_required='f5_other'),
+        Gate(YES, field='f1', rules=[ApplicableIf(NO, field='f4', field_applicable='f2')])]
+
+
+class TestQueryValidator(TestCase):
+
+    def setUp(self):
+        values = [YES, NO, DWTA, NOT_APPLICABLE, OTHER, '']
+        nullable_values = values + [None]
+        for f1, f2, f3, f4, f5, f5_other in product(
+                values[:4], values, nullable_values, nullable_values[:3] + [None],
+                [YES, OTHER, ''], ['blah', None]):
+            TestModel(f1=f1, f2=f2, f3=f3, f4=f4, f5=f5, f5_other=f5_other).save()
+
+    def python_failures(self):
+        failures = set()
+        instances = list(TestModel.objects.order_by('pk'))
+        for result in MyFormValidator.validate_many(instances):
+            for field, _, code in result.violations:
+                failures.add((instances[result.index].pk, field, code))
+        return failures
+
+    def test_same_as_python(self):
+        query_validator = QueryValidator(MyFormValidator, model=TestModel)
+        failures = set()
+        for field, condition, code in query_validator.conditions:
+            for pk in TestModel.objects.filter(condition).values_list('pk', flat=True):
+                failures.add((pk, field, code))
+        self.assertEqual(failures, self.python_failures())
+        invalid = {pk for pk, _, _ in failures}
+        self.assertEqual(
+            set(TestModel.objects.filter(query_validator.violates()).values_list(
+                'pk', flat=True)), invalid)
+
+    def test_counts(self):
+        counts = QueryValidator(MyFormValidator, model=TestModel).counts(TestModel.objects.all())
+        expected = {}
+        for _, field, code in self.python_failures():
+            expected[(field, code)] = expected.get((field, code), 0) + 1
+        self.assertEqual({k: v for k, v in counts.items() if v}, expected)
+
+    def test_violates(self):
+        TestModel.objects.all().delete()
+        obj = TestModel.objects.create(f1=YES, f2='')
+        TestModel.objects.create(f1=YES, f2='blah')
+        rule = RequiredIf(YES, field='f1', field_required='f2')
+        self.assertEqual(list(TestModel.objects.filter(violates(rule))), [obj])
+
+    def test_m2m_not_translated(self):
+        self.assertRaises(
+            InvalidModelFormFieldValidator, QueryValidator, rules=[M2MRequired(m2m_field='m2m')])
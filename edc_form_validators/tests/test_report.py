@@ -0,0 +1,121 @@
+import csv
+import json
+import os
+import tempfile
+
+from django.core.management import call_command
+from django.core.exceptions import ValidationError
+from django.core.management.base import CommandError
+from django.test import TestCase
+from io import StringIO
+from unittest import skipUnless
+
+from edc_constants.constants import YES, NO, OTHER
+
+from ..form_validator import FormValidator
+from ..report import ReportRecord, report_records, write_report
+from ..rules import M2MRequired
+from .form_validators import TestModelFormValidator
+from .models import TestListModel, TestM2MModel, TestModel
+
+try:
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+
+class TestReport(TestCase):
+
+    def setUp(self):
+        self.rows = [
+            dict(f1=YES, f2=None),
+            dict(f1=NO, f2='blah', f5=OTHER),
+            dict(f1=YES, f2='blah')]
+
+    def test_report_records(self):
+        records = list(report_records(TestModelFormValidator, rows=iter(self.rows), chunk_size=2))
+        self.assertEqual(records, [
+            ReportRecord(0, 'f2', 'required', 'This field is required.'),
+            ReportRecord(1, 'f2', 'not_required', 'This field is not required.'),
+            ReportRecord(1, 'f5_other', 'required', 'This field is required.')])
+
+    def test_error_raised_in_clean(self):
+
+        class MyFormValidator(TestModelFormValidator):
+            def clean(self):
+                if self.cleaned_data.get('f3') == 'bad':
+                    raise ValidationError({'f3': ValidationError(
+                        'bad %(value)s', code='invalid', params={'value': 'f3'})})
+
+        records = list(report_records(MyFormValidator, rows=[dict(f1=NO, f3='bad')]))
+        self.assertEqual(records, [ReportRecord(0, 'f3', 'invalid', 'bad f3')])
+
+    def test_codes(self):
+        records = list(report_records(
+            TestModelFormValidator, rows=self.rows, codes=['not_required']))
+        self.assertEqual([(r.key, r.field) for r in records], [(1, 'f2')])
+
+    def test_queryset_keyed_by_pk(self):
+        TestModel.objects.create(f1=NO, f2='')
+        obj = TestModel.objects.create(f1=YES, f2='')
+        records = list(report_records(
+            TestModelFormValidator, queryset=TestModel.objects.order_by('pk'), chunk_size=1))
+        self.assertEqual([(r.key, r.code) for r in records], [(obj.pk, 'required')])
+
+    def test_queryset_related_not_queried_per_row(self):
+        one = TestListModel.objects.create(short_name='one', name='One')
+
+        class M2MFormValidator(FormValidator):
+            rules = [M2MRequired(m2m_field='m2m')]
+
+            def clean(self):
+                self.required_if_not_none(field='fk', field_required='f1')
+
+        for _ in range(10):
+            TestM2MModel.objects.create(fk=one).m2m.add(one)
+        TestM2MModel.objects.create(fk=one)
+        with self.assertNumQueries(2):
+            records = list(report_records(
+                M2MFormValidator, queryset=TestM2MModel.objects.order_by('pk')))
+        self.assertEqual(sorted(r.code for r in records), ['required'] * 12)
+
+    def test_write_csv(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'report.csv')
+            count = write_report(
+                report_records(TestModelFormValidator, rows=self.rows), path, 'csv')
+            with open(path, newline='') as f:
+                rows = list(csv.DictReader(f))
+        self.assertEqual(count, 3)
+        self.assertEqual(rows[0], dict(
+            key='0', field='f2', code='required', message='This field is required.'))
+
+    @skipUnless(pyarrow, 'pyarrow is not installed')
+    def test_write_parquet(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'report.parquet')
+            write_report(report_records(TestModelFormValidator, rows=self.rows), path, 'parquet')
+            table = pyarrow.parquet.read_table(path)
+        self.assertEqual(table.column('field').to_pylist(), ['f2', 'f2', 'f5_other'])
+
+    def test_command(self):
+        TestModel.objects.create(f1=YES, f2='')
+        out = StringIO()
+        call_command(
+            'validation_report', 'edc_form_validators.testmodel',
+            model='edc_form_validators.testmodel', stdout=out, stderr=StringIO())
+        records = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual([r['code'] for r in records], ['required'])
+
+    def test_command_unknown_names(self):
+        for name, model in [('edc_form_validators.blah', 'edc_form_validators.testmodel'),
+                            ('edc_form_validators.testmodel', 'edc_form_validators.blah')]:
+            with self.subTest(name=name, model=model):
+                self.assertRaises(
+                    CommandError, call_command, 'validation_report', name,
+                    model=model, stdout=StringIO(), stderr=StringIO())
+
+    def test_command_parquet_requires_output(self):
+        self.assertRaises(
+            CommandError, call_command, 'validation_report', 'edc_form_validators.testmodel',
+            model='edc_form_validators.testmodel', format='parquet', stderr=StringIO())
@@ -0,0 +1,196 @@
+from datetime import date
+from django.core.cache.backends.locmem import LocMemCache
+from django.forms import ValidationError
+from django.test import TestCase
+
+from edc_constants.constants import YES, NO
+
+from ..context import ValidationContext
+from ..core import REQUIRED_ERROR, NOT_REQUIRED_ERROR
+from ..form_validator import FormValidator
+from ..messages import Message
+from ..result_cache import ResultCache, fingerprint
+from ..rules import Gate, M2MRequired, RequiredIf
+from ..simple_mixins import SimpleApplicableByAgeValidatorMixin
+from .models import TestListModel, TestModel
+
+
+class MyFormValidator(FormValidator):
+
+    result_cache = ResultCache()
+    rules = [RequiredIf(YES, field='f1', field_required='f2')]
+    calls = 0
+
+    def clean(self):
+        MyFormValidator.calls += 1
+        self.required_if(NO, field='f3', field_required='f4')
+
+
+class TestResultCache(TestCase):
+
+    def setUp(self):
+        MyFormValidator.result_cache.clear()
+        MyFormValidator.calls = 0
+
+    def validate(self, cleaned_data, form_validator_cls=None, **kwargs):
+        form_validator = (form_validator_cls or MyFormValidator)(
+            cleaned_data=cleaned_data, **kwargs)
+        try:
+            form_validator.validate()
+        except ValidationError as e:
+            return form_validator, e.message_dict
+        return form_validator, None
+
+    def test_valid_replayed(self):
+        for _ in range(3):
+            _, errors = self.validate(dict(f1=YES, f2='blah'))
+            self.assertIsNone(errors)
+        self.assertEqual(MyFormValidator.calls, 1)
+        self.assertEqual(len(MyFormValidator.result_cache), 1)
+
+    def test_invalid_replayed(self):
+        outcomes = [self.validate(dict(f1=YES, f2=None)) for _ in range(2)]
+        self.assertEqual(outcomes[0][1], {'f2': ['This field is required.']})
+        self.assertEqual(outcomes[1][1], outcomes[0][1])
+        self.assertEqual(outcomes[1][0]._error_codes, [REQUIRED_ERROR])
+        self.assertEqual(MyFormValidator.calls, 0)
+
+    def test_collected_replayed(self):
+        cleaned_data = dict(f1=YES, f2=None, f3=YES, f4='blah')
+        first, errors = self.validate(cleaned_data, collect_errors=True)
+        second, replayed = self.validate(dict(cleaned_data), collect_errors=True)
+        self.assertEqual(MyFormValidator.calls, 1)
+        self.assertEqual(replayed, errors)
+        self.assertEqual(
+            [v.code for v in second._violations], [REQUIRED_ERROR, NOT_REQUIRED_ERROR])
+        self.assertEqual(second._violations, first._violations)
+        self.assertEqual(second._errors, first._errors)
+        self.assertEqual(second._error_codes, first._error_codes)
+        self.assertIsInstance(second._violations[0].message, Message)
+        # raise mode is keyed separately
+        first, errors = self.validate(cleaned_data)
+        second, replayed = self.validate(cleaned_data)
+        self.assertEqual(len(MyFormValidator.result_cache), 2)
+        self.assertEqual(errors, {'f2': ['This field is required.']})
+        self.assertEqual(replayed, errors)
+        self.assertEqual(second._errors, first._errors)
+        self.assertEqual(second._error_codes, first._error_codes)
+
+    def test_error_raised_in_clean_replayed(self):
+
+        class MyFormValidator2(MyFormValidator):
+            def clean(self):
+                MyFormValidator.calls += 1
+                raise ValidationError({'f3': ValidationError(
+                    'bad %(value)s', code='invalid', params={'value': 'f3'})})
+
+        first, errors = self.validate(dict(f3='x'), MyFormValidator2, collect_errors=True)
+        second, replayed = self.validate(dict(f3='x'), MyFormValidator2, collect_errors=True)
+        self.assertEqual(MyFormValidator.calls, 1)
+        self.assertEqual(replayed, errors)
+        self.assertEqual(second._violations, first._violations)
+        self.assertEqual(second._errors, first._errors)
+
+    def test_changed_data_or_version_not_replayed(self):
+        self.validate(dict(f1=YES, f2='blah', f3=YES))
+        self.validate(dict(f1=YES, f2='blah', f3=NO))
+
+        class MyFormValidator2(MyFormValidator):
+            rules_version = 2
+
+        self.validate(dict(f1=YES, f2='blah', f3=YES), MyFormValidator2)
+        self.assertEqual(MyFormValidator.calls, 3)
+
+    def test_gate_rules_keyed(self):
+        """Asserts a changed nested rule is not replayed from a
+        cache shared with the class before the change.
+        """
+        def form_validator_cls(response):
+            class GateFormValidator(MyFormValidator):
+                rules = [Gate(YES, field='f1', rules=[
+                    RequiredIf(response, field='f3', field_required='f4')])]
+            return GateFormValidator
+
+        _, errors = self.validate(dict(f1=YES, f3=YES), form_validator_cls(YES))
+        self.assertEqual(errors, {'f4': ['This field is required.']})
+        _, errors = self.validate(dict(f1=YES, f3=YES), form_validator_cls(NO))
+        self.assertIsNone(errors)
+
+    def test_fingerprint(self):
+        self.assertEqual(fingerprint(dict(a=1, b='1')), fingerprint(dict(b='1', a=1)))
+        self.assertNotEqual(fingerprint(dict(a=1)), fingerprint(dict(a='1')))
+
+    def test_database_not_cached_unless_opted_in(self):
+        obj = TestModel.objects.create(f1=YES, f2='blah')
+        self.validate(dict(f1=YES, f2='blah', fk=obj))
+        self.validate(dict(f1=YES, f2='blah', fk=obj))
+        self.assertEqual(MyFormValidator.calls, 2)
+
+        class M2MFormValidator(MyFormValidator):
+            rules = [M2MRequired(m2m_field='m2m')]
+
+        TestListModel.objects.create(short_name='one', name='One')
+        for _ in range(2):
+            self.validate(dict(m2m=TestListModel.objects.all()), M2MFormValidator)
+        self.assertEqual(MyFormValidator.calls, 4)
+
+        class OptInFormValidator(M2MFormValidator):
+            cache_results = True
+
+        for _ in range(2):
+            self.validate(dict(m2m=TestListModel.objects.all(), fk=obj), OptInFormValidator)
+        self.assertEqual(MyFormValidator.calls, 5)
+
+    def test_facts_read_in_clean_not_cached(self):
+
+        class AgeFormValidator(SimpleApplicableByAgeValidatorMixin, MyFormValidator):
+            def clean(self):
+                MyFormValidator.calls += 1
+                self.validate_applicable_by_age('f3', 'gte', 18)
+
+        context = ValidationContext(loaders=dict(
+            dob=lambda keys: {k: date(2000, 1, 1) for k in keys},
+            previous_visit_date=lambda keys: {k: date(2020, 1, 1) for k in keys}))
+        for _ in range(2):
+            self.validate(dict(subject_identifier='1', f3=YES), AgeFormValidator,
+                          context=context)
+        self.assertEqual(MyFormValidator.calls, 2)
+        self.assertEqual(len(MyFormValidator.result_cache), 0)
+
+    async def test_avalidate_replayed(self):
+        for _ in range(2):
+            form_validator = MyFormValidator(cleaned_data=dict(f1=YES, f2=None, f3=NO))
+            with self.assertRaises(ValidationError):
+                await form_validator.avalidate()
+            self.assertEqual(form_validator._error_codes, [REQUIRED_ERROR])
+        for _ in range(2):
+            await MyFormValidator(cleaned_data=dict(f1=YES, f2='blah', f3=YES)).avalidate()
+        self.assertEqual(MyFormValidator.calls, 1)
+        self.assertEqual(len(MyFormValidator.result_cache), 2)
+
+    async def test_avalidate_with_aclean_not_cached(self):
+
+        class MyFormValidator2(MyFormValidator):
+            async def aclean(self):
+                MyFormValidator.calls += 1
+
+        for _ in range(2):
+            await MyFormValidator2(cleaned_data=dict(f1=NO)).avalidate()
+        self.assertEqual(MyFormValidator.calls, 4)
+
+    def test_django_cache(self):
+
+        class MyFormValidator2(MyFormValidator):
+            result_cache = LocMemCache('edc_form_validators', {})
+
+        for _ in range(2):
+            _, errors = self.validate(dict(f1=YES, f2=None), MyFormValidator2)
+        self.assertEqual(errors, {'f2': ['This field is required.']})
+        self.assertEqual(MyFormValidator.calls, 0)
+
+    def test_lru(self):
+        cache = ResultCache(maxsize=2)
+        for key in ['a', 'b', 'a', 'c']:
+            cache.set(key, key)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 'a')
@@ -0,0 +1,62 @@
+import json
+import os
+import tempfile
+
+from django.core.management import call_command
+from django.test import TestCase
+from io import StringIO
+
+from edc_constants.constants import YES, NO
+
+from ..revalidate import revalidate, read_csv
+from .models import TestModel
+
+form_validator_path = 'edc_form_validators.tests.form_validators.TestModelFormValidator'
+
+
+class TestRevalidate(TestCase):
+
+    def setUp(self):
+        self.rows = []
+        for i in range(25):
+            if i % 5 == 0:
+                self.rows.append(dict(f1=YES, f2=None))
+            else:
+                self.rows.append(dict(f1=YES, f2='blah'))
+
+    def test_rows_inline(self):
+        progress = []
+        reports = list(revalidate(
+            form_validator_path, rows=self.rows, chunk_size=10, workers=1,
+            progress=progress.append))
+        self.assertEqual([r['index'] for r in reports], [0, 5, 10, 15, 20])
+        self.assertEqual(reports[0]['errors'], {'f2': 'This field is required.'})
+        self.assertEqual(progress, [10, 20, 25])
+
+    def test_rows_in_pool(self):
+        reports = list(revalidate(
+            form_validator_path, rows=iter(self.rows), chunk_size=3, workers=2))
+        self.assertEqual([r['index'] for r in reports], [0, 5, 10, 15, 20])
+
+    def test_model(self):
+        obj1 = TestModel.objects.create(f1=YES, f2='')
+        TestModel.objects.create(f1=NO, f2='')
+        obj3 = TestModel.objects.create(f1=YES, f2='')
+        reports = list(revalidate(
+            form_validator_path, model='edc_form_validators.testmodel',
+            chunk_size=2, workers=1))
+        self.assertEqual([r['index'] for r in reports], [obj1.pk, obj3.pk])
+
+    def test_command_csv(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'rows.csv')
+            with open(path, 'w') as f:
+                f.write('f1,f2\nYes,\nYes,blah\n')
+            self.assertEqual(list(read_csv(path))[0], {'f1': YES, 'f2': None})
+            out = StringIO()
+            call_command(
+                'revalidate', form_validator_path, csv=path, workers=1,
+                stdout=out, stderr=StringIO())
+        reports = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(len(reports), 1)
+        self.assertEqual(reports[0]['error_codes'], ['required'])
@@ -0,0 +1,206 @@
+from django import forms
+from django.test import TestCase
+
+from edc_constants.constants import YES, NO, NOT_APPLICABLE, OTHER
+
+from ..base_form_validator import BaseFormValidator, InvalidModelFormFieldValidator
+from ..base_form_validator import REQUIRED_ERROR, NOT_REQUIRED_ERROR, APPLICABLE_ERROR
+from ..form_validator import FormValidator
+from ..rules import RequiredIf, NotRequiredIf, ApplicableIf, OtherSpecify, M2MRequired
+from ..rules import Gate
+from .models import TestModel
+
+
+class MyFormValidator(FormValidator):
+
+    rules = [
+        RequiredIf(YES, field='f1', field_required='f2'),
+        ApplicableIf(YES, field='f1', field_applicable='f3'),
+        OtherSpecify(field='f4', ref='Q4')]
+
+
+class TestRules(TestCase):
+
+    def test_params_checked_when_declared(self):
+        self.assertRaises(
+            InvalidModelFormFieldValidator,
+            RequiredIf, field='f1', field_required='f2')
+        self.assertRaises(
+            InvalidModelFormFieldValidator,
+            RequiredIf, YES, field_required='f2')
+        self.assertRaises(
+            InvalidModelFormFieldValidator,
+            NotRequiredIf, YES, field='f1')
+
+    def test_compiled_once_per_class(self):
+        self.assertEqual(len(MyFormValidator._rule_plan), 3)
+        plan = MyFormValidator._rule_plan
+        MyFormValidator(cleaned_data=dict(f1=NO)).validate()
+        self.assertIs(MyFormValidator._rule_plan, plan)
+
+    def test_not_a_rule_raises(self):
+        with self.assertRaises(InvalidModelFormFieldValidator):
+            class BadFormValidator(FormValidator):
+                rules = ['f1']
+
+    def test_rule_method_missing_raises(self):
+        with self.assertRaises(InvalidModelFormFieldValidator):
+            class BadFormValidator(BaseFormValidator):
+                rules = [M2MRequired(m2m_field='f1')]
+
+    def test_rules_ok(self):
+        form_validator = MyFormValidator(
+            cleaned_data=dict(f1=YES, f2='blah', f3='blah', f4=OTHER, f4_other='blah'))
+        try:
+            form_validator.validate()
+        except forms.ValidationError as e:
+            self.fail(f'ValidationError unexpectedly raised. Got {e}')
+
+    def test_rules_raise(self):
+        form_validator = MyFormValidator(cleaned_data=dict(f1=YES, f2=None))
+        self.assertRaises(forms.ValidationError, form_validator.validate)
+        self.assertIn('f2', form_validator._errors)
+        self.assertEqual(form_validator._error_codes, [REQUIRED_ERROR])
+
+    def test_rules_same_as_imperative(self):
+
+        class MyImperativeFormValidator(FormValidator):
+            def clean(self):
+                self.required_if(YES, field='f1', field_required='f2')
+                self.applicable_if(YES, field='f1', field_applicable='f3')
+                self.validate_other_specify(field='f4', ref='Q4')
+
+        for cleaned_data in [
+                dict(f1=YES, f2=None),
+                dict(f1=NO, f2='blah'),
+                dict(f1=YES, f2='blah', f3=NOT_APPLICABLE),
+                dict(f1=NO, f2=None, f3='blah'),
+                dict(f1=NO, f4=OTHER),
+                dict(f1=NO, f4='blah', f4_other='blah')]:
+            with self.subTest(cleaned_data=cleaned_data):
+                form_validator1 = MyFormValidator(
+                    cleaned_data=cleaned_data, collect_errors=True)
+                form_validator2 = MyImperativeFormValidator(
+                    cleaned_data=cleaned_data, collect_errors=True)
+                for form_validator in [form_validator1, form_validator2]:
+                    try:
+                        form_validator.validate()
+                    except forms.ValidationError:
+                        pass
+                self.assertEqual(form_validator1._errors, form_validator2._errors)
+                self.assertEqual(
+                    form_validator1._error_codes, form_validator2._error_codes)
+
+    def test_rules_collected(self):
+        form_validator = MyFormValidator(
+            cleaned_data=dict(f1=YES, f2=None, f3=NOT_APPLICABLE,
+                              f4='blah', f4_other='blah'),
+            collect_errors=True)
+        self.assertRaises(forms.ValidationError, form_validator.validate)
+        self.assertEqual(
+            form_validator._error_codes,
+            [REQUIRED_ERROR, APPLICABLE_ERROR, NOT_REQUIRED_ERROR])
+        self.assertEqual(
+            form_validator._errors.get('f4_other'),
+            'This field is not required. ref: Q4')
+
+    def test_rules_run_before_clean(self):
+
+        class MyFormValidator2(MyFormValidator):
+            def clean(self):
+                self.required_if(NO, field='f1', field_required='f5')
+
+        form_validator = MyFormValidator2(
+            cleaned_data=dict(f1=NO, f2='blah', f5=None), collect_errors=True)
+        self.assertRaises(forms.ValidationError, form_validator.validate)
+        self.assertEqual(list(form_validator._errors), ['f2', 'f5'])
+        self.assertEqual(
+            form_validator._error_codes, [NOT_REQUIRED_ERROR, REQUIRED_ERROR])
+
+    def test_rules_indexed_by_required_field(self):
+        always, by_field = MyFormValidator._rule_index
+        self.assertEqual(always, ())
+        self.assertEqual(by_field, {'f1': (0, 1), 'f4': (2, )})
+
+    def test_rules_skipped_if_field_not_in_cleaned_data(self):
+        calls = []
+
+        class MyFormValidator2(MyFormValidator):
+            def applicable(self, *args, **kwargs):
+                calls.append(kwargs.get('field'))
+                return super().applicable(*args, **kwargs)
+
+        MyFormValidator2(cleaned_data=dict(f4='blah')).validate()
+        self.assertEqual(calls, [])
+        MyFormValidator2(cleaned_data=dict(f1=YES, f2='blah', f3='blah')).validate()
+        self.assertEqual(calls, ['f1'])
+
+    def test_gate(self):
+
+        class MyFormValidator2(FormValidator):
+            rules = [
+                Gate(YES, field='f1', rules=[
+                    RequiredIf(YES, field='f2', field_required='f3'),
+                    NotRequiredIf(YES, field='f2', field_required='f4')])]
+
+        self.assertEqual(len(MyFormValidator2._rule_plan), 1)
+        form_validator = MyFormValidator2(
+            cleaned_data=dict(f1=NO, f2=YES, f3=None, f4='blah'))
+        form_validator.validate()
+        form_validator = MyFormValidator2(
+            cleaned_data=dict(f1=YES, f2=YES, f3=None, f4='blah'),
+            collect_errors=True)
+        self.assertRaises(forms.ValidationError, form_validator.validate)
+        self.assertEqual(
+            form_validator._error_codes, [REQUIRED_ERROR, NOT_REQUIRED_ERROR])
+
+    def test_gate_without_rules_raises(self):
+        self.assertRaises(
+            InvalidModelFormFieldValidator, Gate, YES, field='f1', rules=[])
+
+
+class TestIncremental(TestCase):
+
+    def setUp(self):
+        self.instance = TestModel.objects.create(
+            f1=YES, f2='blah', f3='blah', f4=NO)
+
+    def test_rule_fields(self):
+        self.assertEqual(
+            RequiredIf(YES, field='f1', field_required='f2').fields, ('f1', 'f2'))
+        self.assertEqual(OtherSpecify(field='f4').fields, ('f4', 'f4_other'))
+        self.assertEqual(
+            Gate(YES, field='f1', rules=[OtherSpecify(field='f4')]).fields,
+            ('f1', 'f4', 'f4_other'))
+
+    def test_changed_fields(self):
+        form_validator = MyFormValidator(
+            cleaned_data=dict(f1=YES, f2='blah', f3=NOT_APPLICABLE, f4=NO),
+            instance=self.instance)
+        self.assertEqual(form_validator.changed_fields(), ['f3'])
+
+    def test_only_rules_reading_changed_fields_run(self):
+        calls = []
+
+        class MyFormValidator2(MyFormValidator):
+            incremental = True
+
+            def _required_if(self, *args, **kwargs):
+                calls.append('required_if')
+                return super()._required_if(*args, **kwargs)
+
+            def applicable(self, *args, **kwargs):
+                calls.append('applicable')
+                return super().applicable(*args, **kwargs)
+
+        cleaned_data = dict(f1=YES, f2='blah', f3=NOT_APPLICABLE, f4=NO)
+        form_validator = MyFormValidator2(
+            cleaned_data=cleaned_data, instance=self.instance)
+        self.assertRaises(forms.ValidationError, form_validator.validate)
+        self.assertEqual(calls, ['applicable'])
+
+    def test_all_rules_run_on_add_form(self):
+        form_validator = MyFormValidator(
+            cleaned_data=dict(f1=YES, f2=None), instance=TestModel(f1=YES),
+            incremental=True)
+        self.assertRaises(forms.ValidationError, form_validator.validate)
@@ -0,0 +1,86 @@
+from datetime import date
+from django.core.exceptions import ValidationError
+from django.test import SimpleTestCase
+
+from edc_constants.constants import NOT_APPLICABLE, YES
+
+from ..context import validation_context
+
+from ..core import CoreValidator, RuleError, APPLICABLE_ERROR, NOT_APPLICABLE_ERROR
+from ..simple_mixins import SimpleApplicableByAgeValidatorMixin, SimpleDateFieldValidatorMixin
+from ..simple_mixins import SimpleYesNoValidationMixin
+from ..simple_mixins import age_at, applicable_by_age_many, compare_many
+from ..simple_mixins import comparison_phrase, operators
+
+
+class Checker(SimpleApplicableByAgeValidatorMixin, SimpleDateFieldValidatorMixin,
+              CoreValidator):
+    pass
+
+
+class PlainForm(SimpleApplicableByAgeValidatorMixin, SimpleYesNoValidationMixin):
+    """A host that is not a CoreValidator.
+    """
+
+    def __init__(self, cleaned_data):
+        self.cleaned_data = cleaned_data
+
+
+class TestSimpleMixins(SimpleTestCase):
+
+    def test_host_not_a_core_validator(self):
+        form = PlainForm(cleaned_data=dict(f1=YES, f2=None))
+        with self.assertRaises(ValidationError) as cm:
+            form.require_if_yes('f1', 'f2')
+        self.assertEqual(cm.exception.message_dict, {
+            'f2': ['This field is required based on previous answer.']})
+        loaders = dict(dob=lambda keys: {'1': date(2010, 1, 1)},
+                       previous_visit_date=lambda keys: {'1': date(2020, 1, 1)})
+        form = PlainForm(cleaned_data=dict(subject_identifier='1', f3='blah'))
+        with validation_context(loaders=loaders):
+            self.assertRaises(
+                ValidationError, form.validate_applicable_by_age, 'f3', 'gte', 18)
+
+    def test_compare_dates(self):
+        checker = Checker(cleaned_data={})
+        d1, d2 = date(2020, 1, 2), date(2020, 1, 1)
+        for op, expected in [('gt', True), ('gte', True), ('lt', False),
+                             ('lte', False), ('ne', True), ('eq', False)]:
+            with self.subTest(op=op):
+                self.assertEqual(checker.compare_dates(d1, op, d2), expected)
+        self.assertTrue(checker.compare_dates(None, 'lt', d2))
+        self.assertFalse(checker.compare_dates(d1, 'bad', d2))
+
+    def test_validate_dates_eq(self):
+        checker = Checker(cleaned_data=dict(d1=date(2020, 1, 2), d2=date(2020, 1, 1)))
+        with self.assertRaises(RuleError) as cm:
+            checker.validate_dates(field1='d1', op='eq', field2='d2')
+        self.assertEqual(str(cm.exception.message['d1']), 'd1 must equal d2.')
+
+    def test_validate_applicable_by_age(self):
+        dob, visit_date = date(2000, 6, 1), date(2020, 5, 31)
+        checker = Checker(cleaned_data=dict(f1='blah'))
+        with self.assertRaises(RuleError) as cm:
+            checker.validate_applicable_by_age('f1', 'gte', 20, dob, visit_date, '123')
+        self.assertEqual(cm.exception.code, NOT_APPLICABLE_ERROR)
+        checker = Checker(cleaned_data=dict(f1=NOT_APPLICABLE))
+        with self.assertRaises(RuleError) as cm:
+            checker.validate_applicable_by_age('f1', 'lt', 20, dob, visit_date, '123')
+        self.assertEqual(cm.exception.code, APPLICABLE_ERROR)
+
+    def test_age_cached(self):
+        age_at.cache_clear()
+        for _ in range(3):
+            self.assertEqual(age_at(date(2000, 6, 1), date(2020, 6, 1)).years, 20)
+        self.assertEqual(age_at.cache_info().hits, 2)
+
+    def test_many(self):
+        dates1 = [date(2020, 1, 2), date(2020, 1, 1), None]
+        dates2 = [date(2020, 1, 1)] * 3
+        self.assertEqual(compare_many(dates1, 'gt', dates2), [True, False, True])
+        dobs = [date(2000, 6, 1), date(2010, 6, 1)]
+        self.assertEqual(
+            applicable_by_age_many('gte', dobs, [date(2020, 6, 1)] * 2, 18), [True, False])
+
+    def test_operators_match_phrases(self):
+        self.assertEqual(set(comparison_phrase), set(operators))
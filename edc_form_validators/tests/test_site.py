@@ -0,0 +1,80 @@
+from contextlib import redirect_stdout
+from django import forms
+from django.apps import apps as django_apps
+from django.test import TestCase
+from io import StringIO
+
+from edc_constants.constants import YES, OTHER
+
+from ..form_validator import FormValidator
+from ..form_validator_mixin import FormValidatorMixin
+from ..list_model_cache import list_model_cache
+from ..site import SiteFormValidators, AlreadyRegistered, NotRegistered
+from .form_validators import TestModelFormValidator
+from .models import TestModel, TestListModel
+
+
+class MyFormValidator(FormValidator):
+    m2m_list_model_cache = True
+
+
+class TestSite(TestCase):
+
+    def setUp(self):
+        self.site = SiteFormValidators()
+
+    def test_register_and_get(self):
+        self.site.register(MyFormValidator, model='edc_form_validators.TestM2MModel')
+        self.assertIs(self.site.get('edc_form_validators.testm2mmodel'), MyFormValidator)
+        self.assertIs(
+            self.site.get(f'{MyFormValidator.__module__}.MyFormValidator'), MyFormValidator)
+        self.assertRaises(NotRegistered, self.site.get, 'edc_form_validators.testmodel')
+
+    def test_already_registered(self):
+        self.site.register(MyFormValidator, model='edc_form_validators.testmodel')
+        self.site.register(MyFormValidator, model='edc_form_validators.testmodel')
+        self.assertRaises(
+            AlreadyRegistered, self.site.register, TestModelFormValidator,
+            model='edc_form_validators.testmodel')
+
+    def test_get_or_import(self):
+        self.assertIs(
+            self.site.get_or_import(
+                'edc_form_validators.tests.form_validators.TestModelFormValidator'),
+            TestModelFormValidator)
+
+    def test_autodiscover(self):
+        self.site.autodiscover(module_name='tests.form_validators', verbose=False)
+        self.assertTrue(self.site.loaded)
+        self.assertNotIn('edc_form_validators.testmodel', self.site.models)
+        self.site.autodiscover(module_name='blah', verbose=False)
+
+    def test_autodiscover_imports_by_app_name(self):
+        out = StringIO()
+        with redirect_stdout(out):
+            self.site.autodiscover(module_name='checks')
+        self.assertIn('from \'django.contrib.contenttypes\'', out.getvalue())
+
+    def test_ready_writes_nothing_to_stdout(self):
+        out = StringIO()
+        with redirect_stdout(out):
+            django_apps.get_app_config('edc_form_validators').ready()
+        self.assertEqual(out.getvalue(), '')
+
+    def test_warm(self):
+        list_model_cache.invalidate()
+        self.site.register(MyFormValidator, model='edc_form_validators.testm2mmodel')
+        TestListModel.objects.create(short_name=OTHER, name='Other')
+        self.site.warm()
+        self.assertIn(TestListModel, list_model_cache)
+
+    def test_form_uses_registered_form_validator(self):
+
+        class TestModelForm(FormValidatorMixin, forms.ModelForm):
+            class Meta:
+                model = TestModel
+                fields = '__all__'
+
+        form = TestModelForm(data=dict(f1=YES, f2=None))
+        self.assertFalse(form.is_valid())
+        self.assertIn('f2', form.errors)
@@ -0,0 +1,54 @@
+from django import forms
+from django.test import TestCase
+
+from edc_constants.constants import YES, NO
+
+from ..base_form_validator import REQUIRED_ERROR, NOT_REQUIRED_ERROR
+from ..form_validator import FormValidator
+from ..rules import RequiredIf, OtherSpecify
+from .models import TestModel
+
+
+class MyFormValidator(FormValidator):
+
+    rules = [
+        RequiredIf(YES, field='f1', field_required='f2'),
+        OtherSpecify(field='f5')]
+
+
+class TestValidateMany(TestCase):
+
+    def test_yields_result_per_row(self):
+        rows = [
+            dict(f1=YES, f2='blah'),
+            dict(f1=YES, f2=None),
+            dict(f1=NO, f2='blah', f5='blah', f5_other='blah')]
+        results = list(MyFormValidator.validate_many(rows))
+        self.assertEqual([r.index for r in results], [0, 1, 2])
+        self.assertEqual([r.is_valid for r in results], [True, False, False])
+        self.assertEqual(results[1].errors, {'f2': 'This field is required.'})
+        self.assertEqual(results[1].error_codes, [REQUIRED_ERROR])
+        self.assertEqual(
+            results[2].error_codes, [NOT_REQUIRED_ERROR, NOT_REQUIRED_ERROR])
+
+    def test_streams_rows(self):
+        rows = (dict(f1=YES, f2=None) for _ in range(1000))
+        results = MyFormValidator.validate_many(rows)
+        self.assertFalse(next(results).is_valid)
+        self.assertEqual(next(results).index, 1)
+
+    def test_error_raised_in_clean_captured(self):
+
+        class MyFormValidator2(MyFormValidator):
+            def clean(self):
+                raise forms.ValidationError({'f3': 'Bad'}, code='bad')
+
+        result = next(MyFormValidator2.validate_many([dict(f1=YES, f2=None)]))
+        self.assertEqual(list(result.errors), ['f2', 'f3'])
+
+    def test_model_instances(self):
+        TestModel.objects.create(f1=YES, f2='')
+        TestModel.objects.create(f1=YES, f2='blah')
+        results = list(MyFormValidator.validate_many(
+            TestModel.objects.order_by('id').iterator()))
+        self.assertEqual([r.is_valid for r in results], [False, True])
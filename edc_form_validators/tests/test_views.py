@@ -0,0 +1,95 @@
+import json
+
+from django.contrib.auth.models import User
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from edc_constants.constants import YES, NO, OTHER
+
+from ..form_validator import FormValidator
+from ..rules import M2MOtherSpecify
+from ..site import site_form_validators
+from .form_validators import TestModelFormValidator  # noqa
+
+form_validator_path = 'edc_form_validators.tests.form_validators.TestModelFormValidator'
+
+
+class M2MFormValidator(FormValidator):
+    rules = [M2MOtherSpecify(OTHER, m2m_field='m2m', field_other='m2m_other')]
+
+
+site_form_validators.register(M2MFormValidator)
+
+
+class TestValidateView(TestCase):
+
+    def setUp(self):
+        self.client.force_login(User.objects.create(username='erik'))
+
+    def post(self, payload):
+        return self.client.post(
+            reverse('validate'), data=json.dumps(payload), content_type='application/json')
+
+    def test_by_model_label(self):
+        response = self.post(dict(
+            form_validator='edc_form_validators.testmodel', cleaned_data=dict(f1=YES, f2=None)))
+        self.assertEqual(response.json()['count'], 1)
+        self.assertEqual(len(response.json()['invalid']), 1)
+
+    def test_one(self):
+        response = self.post(dict(
+            form_validator=form_validator_path, cleaned_data=dict(f1=YES, f2=None)))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {
+            'count': 1,
+            'invalid': [{'index': 0, 'errors': {'f2': 'This field is required.'},
+                         'error_codes': ['required']}]})
+
+    def test_batch(self):
+        rows = [dict(f1=YES, f2='blah'), dict(f1=NO, f2='blah'), dict(f1=YES, f2=None)]
+        response = self.post(dict(form_validator=form_validator_path, rows=rows))
+        self.assertEqual(response.json()['count'], 3)
+        self.assertEqual([r['index'] for r in response.json()['invalid']], [1, 2])
+
+    @override_settings(EDC_FORM_VALIDATORS_MAX_BATCH=2)
+    def test_batch_too_large(self):
+        response = self.post(dict(form_validator=form_validator_path, rows=[{}, {}, {}]))
+        self.assertEqual(response.status_code, 400)
+
+    def test_bad_payloads(self):
+        for payload in [dict(form_validator='blah.Blah', rows=[]),
+                        dict(form_validator='os.path.join', rows=[]),
+                        dict(form_validator=1, rows=[]),
+                        dict(form_validator=None, rows=[]),
+                        dict(rows=[]),
+                        [],
+                        dict(form_validator=form_validator_path),
+                        dict(form_validator=form_validator_path, rows=[1])]:
+            with self.subTest(payload=payload):
+                self.assertEqual(self.post(payload).status_code, 400)
+        response = self.client.post(
+            reverse('validate'), data='{', content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_row_that_raises_reported(self):
+        rows = [dict(m2m=['one']), dict(f1=YES)]
+        with self.assertLogs('edc_form_validators', 'ERROR'):
+            response = self.post(dict(
+                form_validator=f'{__name__}.M2MFormValidator', rows=rows))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['invalid'], [{
+            'index': 0, 'errors': {'__all__': 'Could not validate this row. Got AttributeError.'},
+            'error_codes': ['invalid']}])
+
+    def test_csrf_checked(self):
+        client = Client(enforce_csrf_checks=True)
+        client.force_login(User.objects.get(username='erik'))
+        response = client.post(
+            reverse('validate'), data=json.dumps(dict(form_validator=form_validator_path, rows=[])),
+            content_type='application/json')
+        self.assertEqual(response.status_code, 403)
+
+    def test_not_authenticated(self):
+        self.client.logout()
+        response = self.post(dict(form_validator=form_validator_path, rows=[]))
+        self.assertEqual(response.status_code, 403)
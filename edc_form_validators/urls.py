@@ -16,6 +16,9 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path
 
+from .views import validate
+
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('validate/', validate, name='validate'),
 ]
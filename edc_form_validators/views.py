@@ -0,0 +1,76 @@
+import json
+import logging
+
+from django.conf import settings
+from django.http import JsonResponse
+from django.views.decorators.http import require_POST
+
+from .core import INVALID_ERROR
+from .revalidate import error_report
+from .site import site_form_validators, NotRegistered
+
+logger = logging.getLogger('edc_form_validators')
+
+
+@require_POST
+def validate(request):
+    """Validates one or many cleaned_data payloads with a
+    registered FormValidator class.
+
+    Expects a JSON body of either
+        {"form_validator": "my_app.crfone",
+         "cleaned_data": {...}}
+    or, for a batch,
+        {"form_validator": "...", "rows": [{...}, {...}]}
+
+    Responds with the number of rows and an error report for each
+    invalid row:
+        {"count": 2, "invalid": [{"index": 1, "errors": {...}, "error_codes": [...]}]}
+
+    `form_validator` is a model label or class path registered
+    with `site_form_validators`. The request must pass django's
+    CSRF check, e.g. with an X-CSRFToken header.
+
+    A row that raises, e.g. a list of names given for an M2M
+    field, is reported as invalid with code 'invalid'.
+    """
+    if not request.user.is_authenticated:
+        return JsonResponse({'error': 'Not authenticated.'}, status=403)
+    max_rows = getattr(settings, 'EDC_FORM_VALIDATORS_MAX_BATCH', 1000)
+    try:
+        payload = json.loads(request.body)
+        if not isinstance(payload, dict) or not isinstance(payload.get('form_validator'), str):
+            raise ValueError('Expected an object with form_validator as a string.')
+        form_validator_cls = site_form_validators.get(payload['form_validator'])
+        if 'rows' in payload:
+            rows = payload['rows']
+        else:
+            rows = [payload['cleaned_data']]
+        if not isinstance(rows, list) or not all(isinstance(r, dict) for r in rows):
+            raise ValueError('Expected cleaned_data to be an object or rows a list of objects.')
+        if len(rows) > max_rows:
+            raise ValueError(f'Too many rows. Got {len(rows)}, max is {max_rows}.')
+    except (ValueError, KeyError, TypeError, NotRegistered) as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    return JsonResponse({'count': len(rows), 'invalid': invalid_rows(form_validator_cls, rows)})
+
+
+def invalid_rows(form_validator_cls, rows):
+    """Returns an error report for each invalid row, including
+    rows that raise.
+    """
+    context = form_validator_cls.get_batch_context(rows=rows)
+    invalid = []
+    for index, row in enumerate(rows):
+        try:
+            result, = form_validator_cls.validate_many([row], context=context)
+        except Exception as e:
+            logger.exception(f'Could not validate row {index} with {form_validator_cls.__name__}.')
+            invalid.append(dict(
+                index=index,
+                errors={'__all__': f'Could not validate this row. Got {e.__class__.__name__}.'},
+                error_codes=[INVALID_ERROR]))
+        else:
+            if not result.is_valid:
+                invalid.append(error_report(result, key=index))
+    return invalid
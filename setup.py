@@ -23,7 +23,7 @@ setup(
     long_description=README,
     zip_safe=False,
     keywords='django modelform form validation edc',
-    #  install_requires=['pandas'],
+    extras_require={'pandas': ['pandas'], 'parquet': ['pyarrow']},
     classifiers=[
         'Environment :: Web Environment',
         'Framework :: Django',